@@ -0,0 +1,130 @@
+"""
+Import-time benchmark for the public entry points.
+
+Every entry point is imported in a fresh interpreter (cold start), several
+times, and we report the median of:
+  - startup_ms: whole process, interpreter start to exit
+  - import_ms:  just the `from module import name` statement
+  - rss_mb:     peak resident memory of the process
+  - heavy:      which heavy libraries ended up imported
+
+Core entry points (everything except plotting) must start within --budget-ms;
+the script exits 1 if one doesn't, so it can run in CI.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--budget-ms 100] [--json out.json]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+
+# (module, attribute, core?)
+ENTRY_POINTS: List[Tuple[str, str, bool]] = [
+    ("movie_library", "load_db", True),
+    ("movie_library", "remove_duplicate_data", True),
+    ("movie_oop_core", "TMDBCSVCorpus", True),
+    ("movie_oop_core", "ReviewPipeline", True),
+    ("movieclass_table_dataset", "ReviewTable", True),
+    ("review_loader", "load_movie_reviews", True),
+    ("Movie_Review_System", "MovieReviewSystem", True),
+    ("Data_Clean", "DataClean", True),
+    ("Dataset", "Dataset", True),
+    ("review_stream", "StreamPipeline", False),
+    ("columnar_io", "read_columnar", False),
+    ("Movie_Visualizer", "MovieVisualizer", False),
+]
+
+HEAVY = ("numpy", "pandas", "matplotlib", "seaborn", "pyarrow", "asyncio")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from {module} import {name}
+t1 = time.perf_counter()
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+except ImportError:
+    rss = None
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "rss_mb": rss,
+                   "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _run(code: str) -> Tuple[float, Optional[Dict[str, Any]], str]:
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    wall = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        return wall, None, proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"
+    lines = proc.stdout.strip().splitlines()
+    return wall, json.loads(lines[-1]) if lines else None, ""
+
+
+def measure(module: str, name: str, repeat: int) -> Dict[str, Any]:
+    code = _PROBE.format(module=module, name=name, heavy=HEAVY)
+    _run(code)  # warm the bytecode cache so we time imports, not compilation
+    walls, imports, rss = [], [], []
+    result: Dict[str, Any] = {"entry": f"{module}.{name}"}
+    for _ in range(repeat):
+        wall, data, error = _run(code)
+        if data is None:
+            result["error"] = error
+            return result
+        walls.append(wall)
+        imports.append(data["import_ms"])
+        if data["rss_mb"] is not None:
+            rss.append(data["rss_mb"])
+        result["heavy"] = data["heavy"]
+    result["startup_ms"] = statistics.median(walls)
+    result["import_ms"] = statistics.median(imports)
+    result["rss_mb"] = statistics.median(rss) if rss else None
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="cold-start budget for core entry points")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    baseline, _, _ = _run("pass")
+    results = [dict(measure(m, n, args.repeat), core=core) for m, n, core in ENTRY_POINTS]
+
+    print(f"python -c pass: {baseline:.1f} ms")
+    print(f"{'entry point':45} {'startup ms':>10} {'import ms':>10} {'rss MB':>8}  heavy")
+    over = []
+    for r in results:
+        if "error" in r:
+            print(f"{r['entry']:45} {'-':>10} {'-':>10} {'-':>8}  error: {r['error']}")
+            continue
+        rss = f"{r['rss_mb']:.1f}" if r["rss_mb"] is not None else "-"
+        print(f"{r['entry']:45} {r['startup_ms']:10.1f} {r['import_ms']:10.1f} {rss:>8}  {','.join(r['heavy'])}")
+        if r["core"] and r["startup_ms"] > args.budget_ms:
+            over.append(r["entry"])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version, "baseline_ms": baseline, "budget_ms": args.budget_ms,
+                       "results": results}, f, indent=2)
+    if over:
+        print(f"over the {args.budget_ms:g} ms budget: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Scaling benchmarks on synthetic TMDB data.
+
+For each dataset size (3k, 100k, 1m rows; see synth_tmdb.py) this times and
+memory-profiles the core operations:
+
+    load_db, fetch_tmdb_movie_reviews, remove_duplicate_data,
+    normalize_tmdb_reviews, export_reviews_to_csv,
+    DataClean.clean_reviews / average_rating / summarize_plot,
+    pandas.read_csv + every MovieVisualizer aggregation
+
+Each operation reports wall time, CPU time and peak traced memory (best of
+--repeat runs for time; memory from a separate traced run so tracemalloc's
+overhead does not skew the timings). Results go to JSON for tracking
+regressions between commits.
+
+remove_duplicate_data is quadratic, so its input is capped at
+--quadratic-cap reviews; the actual input size is recorded as n_input.
+
+Usage:
+    python benchmarks/bench_scaling.py --sizes 3k,100k --json benchmarks/results/scaling.json
+    python benchmarks/bench_scaling.py --sizes 1m --only load_db,normalize_tmdb_reviews
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+sys.path.insert(0, HERE)
+
+from synth_tmdb import SIZES, ensure_synthetic_csv  # noqa: E402
+
+Case = Tuple[str, int, Callable[[], Any]]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    best_wall = best_cpu = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        w0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        best_wall = min(best_wall, time.perf_counter() - w0)
+        best_cpu = min(best_cpu, time.process_time() - c0)
+    return best_wall, best_cpu
+
+
+def _peak_mb(fn: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def build_cases(path: str, tmp: str, quadratic_cap: int) -> List[Case]:
+    """(name, input size, thunk) for every benchmarked operation on one dataset."""
+    from Data_Clean import DataClean
+    from movie_library import remove_duplicate_data
+    from movie_oop_core import export_reviews_to_csv, fetch_tmdb_movie_reviews, load_db, normalize_tmdb_reviews
+
+    rows = load_db(path)
+    reviews = [
+        {"author": "TMDB users", "content": r.get("overview") or "",
+         "author_details": {"rating": float(r["vote_average"]) if r.get("vote_average") else None}}
+        for r in rows
+    ]
+    normalized = normalize_tmdb_reviews(reviews)
+    step = max(1, len(rows) // 20)
+    titles = [rows[i]["title"] for i in range(0, len(rows), step)][:20]
+    contents = [r[1] for r in normalized]
+    ratings = [r[2] for r in normalized]
+    capped = contents[:quadratic_cap]
+    out_csv = os.path.join(tmp, "reviews.csv")
+
+    def clean() -> None:
+        DataClean({"reviews": contents}).clean_reviews()
+
+    def average() -> None:
+        DataClean({"ratings": ratings}).average_rating()
+
+    def summarize() -> None:
+        cleaner = DataClean({"reviews": [], "plot": ""})
+        for text in contents:
+            cleaner.PlotSummarizer.summarize(text, max_length=100)
+
+    cases: List[Case] = [
+        ("load_db", len(rows), lambda: load_db(path)),
+        ("fetch_tmdb_movie_reviews", len(titles), lambda: [fetch_tmdb_movie_reviews(t, rows) for t in titles]),
+        ("remove_duplicate_data", len(capped), lambda: remove_duplicate_data(capped)),
+        ("normalize_tmdb_reviews", len(reviews), lambda: normalize_tmdb_reviews(reviews)),
+        ("export_reviews_to_csv", len(normalized), lambda: export_reviews_to_csv(normalized, out_csv)),
+        ("DataClean.clean_reviews", len(contents), clean),
+        ("DataClean.average_rating", len(ratings), average),
+        ("PlotSummarizer.summarize", len(contents), summarize),
+    ]
+    cases.extend(_visualizer_cases(path))
+    return cases
+
+
+def _visualizer_cases(path: str) -> List[Case]:
+    try:
+        import pandas as pd
+    except ImportError:
+        return []
+    from Dataset import Dataset
+    from Movie_Visualizer import MovieVisualizer
+
+    df = pd.read_csv(path)
+    viz = MovieVisualizer(Dataset(df))
+    n = len(df)
+    return [
+        ("pandas.read_csv", n, lambda: pd.read_csv(path)),
+        ("MovieVisualizer.top_movies", n, lambda: viz.top_movies(10)),
+        ("MovieVisualizer.top_movies[weighted]", n, lambda: viz.top_movies(10, rank_by="weighted")),
+        ("MovieVisualizer.genre_popularity", n, viz.genre_popularity),
+        ("MovieVisualizer.rating_distribution", n, viz.rating_distribution),
+        ("MovieVisualizer.release_counts", n, viz.release_counts),
+        ("MovieVisualizer.percentile_frame", n,
+         lambda: MovieVisualizer(Dataset(df)).percentile_frame(column="runtime")),
+    ]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(sizes: List[str], data_dir: str, repeat: int, memory: bool, quadratic_cap: int,
+        only: Optional[List[str]] = None, seed: int = 0) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            t0 = time.perf_counter()
+            path = ensure_synthetic_csv(data_dir, size, seed)
+            print(f"[{size}] data ready in {time.perf_counter() - t0:.1f}s: {path}", flush=True)
+            for name, n_input, fn in build_cases(path, tmp, quadratic_cap):
+                if only and name not in only:
+                    continue
+                wall, cpu = _time(fn, repeat)
+                peak = _peak_mb(fn) if memory else None
+                results.append({"size": size, "rows": SIZES.get(size, size), "op": name, "n_input": n_input,
+                                "wall_s": wall, "cpu_s": cpu, "peak_mb": peak})
+                mem = f"{peak:9.1f} MB" if peak is not None else ""
+                print(f"[{size}] {name:40} n={n_input:<9} {wall:9.4f}s {cpu:9.4f}s cpu {mem}", flush=True)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "seed": seed,
+            "quadratic_cap": quadratic_cap,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="3k,100k", help="comma list of 3k,100k,1m or row counts")
+    parser.add_argument("--data-dir", default=os.path.join(HERE, "data"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--quadratic-cap", type=int, default=20_000)
+    parser.add_argument("--only", help="comma list of operation names")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=os.path.join(HERE, "results", "scaling.json"))
+    args = parser.parse_args(argv)
+
+    report = run(
+        [s.strip() for s in args.sizes.split(",") if s.strip()],
+        args.data_dir, args.repeat, not args.no_memory, args.quadratic_cap,
+        [o.strip() for o in args.only.split(",")] if args.only else None, args.seed,
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Deterministic synthetic TMDB CSV generator.
+
+Writes files with the same 24 columns, column order and quoting as
+TMDB_movie_dataset_v13.csv (strings quoted, numbers bare, doubled quotes
+inside text). Distributions are shaped like the real data: log-normal vote
+counts and revenue, ratings around 6.6, 1-3 genres drawn with realistic
+frequencies, mostly 2010-2025 releases, and some overviews that contain
+quotes and line breaks so parsers have to handle quoted multiline fields.
+The same (rows, seed) always produces byte-identical output.
+
+Usage:
+    python benchmarks/synth_tmdb.py --rows 100000 --out benchmarks/data/tmdb_100k.csv
+    python benchmarks/synth_tmdb.py --size 1m --out benchmarks/data/tmdb_1m.csv
+
+Functions: generate_rows, write_synthetic_csv, ensure_synthetic_csv
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+COLUMNS = [
+    "id", "title", "vote_average", "vote_count", "status", "release_date", "revenue", "runtime",
+    "adult", "backdrop_path", "budget", "homepage", "imdb_id", "original_language", "original_title",
+    "overview", "popularity", "poster_path", "tagline", "genres", "production_companies",
+    "production_countries", "spoken_languages", "keywords",
+]
+
+SIZES = {"3k": 3_000, "100k": 100_000, "1m": 1_000_000}
+
+# (genre, relative frequency) roughly as in the real file
+GENRES = [
+    ("Drama", 30), ("Comedy", 20), ("Thriller", 15), ("Action", 15), ("Horror", 10), ("Romance", 9),
+    ("Adventure", 8), ("Crime", 8), ("Science Fiction", 6), ("Fantasy", 6), ("Family", 6),
+    ("Mystery", 5), ("Animation", 5), ("History", 3), ("Documentary", 3), ("Music", 2),
+    ("War", 2), ("Western", 1), ("TV Movie", 1),
+]
+LANGUAGES = [("en", 70), ("fr", 5), ("es", 5), ("ja", 4), ("ko", 3), ("de", 3), ("it", 3), ("hi", 3), ("zh", 2), ("ru", 2)]
+LANGUAGE_NAMES = {"en": "English", "fr": "French", "es": "Spanish", "ja": "Japanese", "ko": "Korean",
+                  "de": "German", "it": "Italian", "hi": "Hindi", "zh": "Mandarin", "ru": "Russian"}
+COUNTRIES = ["United States of America", "United Kingdom", "France", "Canada", "Germany", "Japan",
+             "South Korea", "India", "Spain", "Italy", "Australia", "China"]
+COMPANIES = ["Warner Bros. Pictures", "Universal Pictures", "Paramount Pictures", "Columbia Pictures",
+             "Lionsgate", "A24", "Blumhouse Productions", "Legendary Pictures", "StudioCanal",
+             "Toho", "CJ Entertainment", "Netflix", "Focus Features", "Working Title Films"]
+KEYWORDS = ["based on novel or book", "murder", "revenge", "friendship", "love", "heist", "dystopia",
+            "time travel", "superhero", "biography", "survival", "small town", "family", "dream",
+            "space", "coming of age", "sequel", "magic", "war", "serial killer", "robot", "zombie"]
+ADJECTIVES = ["Silent", "Last", "Broken", "Hidden", "Golden", "Dark", "Lost", "Eternal", "Crimson",
+              "Final", "Wild", "Secret", "Burning", "Frozen", "Little", "Electric"]
+NOUNS = ["Night", "River", "Kingdom", "Promise", "City", "Garden", "Storm", "Empire", "Road", "Heart",
+         "Signal", "Harbor", "Frontier", "Dream", "Machine", "Summer"]
+SUBJECTS = ["A retired detective", "Two estranged sisters", "A young pilot", "An ambitious chef",
+            "A group of explorers", "A small-town teacher", "A reluctant hero", "A grieving father"]
+VERBS = ["must confront", "sets out to uncover", "is forced to protect", "races against time to stop",
+         "falls for", "tries to escape"]
+OBJECTS = ["a conspiracy that reaches the highest office", "the family's darkest secret",
+           "a rival from the past", "an ancient curse", "a stranger with no memory",
+           "the end of the world as they know it"]
+TAGLINES = ["Some secrets never stay buried.", "The journey begins.", "Nothing will ever be the same.",
+            "Based on a true story.", ""]
+
+
+
+class _Weighted:
+    """Weighted choice with cumulative weights computed once."""
+
+    def __init__(self, pairs: List[Any]):
+        values, weights = zip(*pairs)
+        self.values = list(values)
+        self.cum = list(itertools.accumulate(weights))
+
+    def __call__(self, rng: random.Random) -> Any:
+        return rng.choices(self.values, cum_weights=self.cum)[0]
+
+
+_GENRE = _Weighted(GENRES)
+_LANGUAGE = _Weighted(LANGUAGES)
+_GENRE_COUNT = _Weighted([(1, 35), (2, 40), (3, 25)])
+
+
+def _path(rng: random.Random) -> str:
+    return f"/{rng.getrandbits(108):027x}.jpg"
+
+
+def _overview(rng: random.Random) -> str:
+    sentences = [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}."
+                 for _ in range(rng.randint(1, 4))]
+    if rng.random() < 0.1:
+        sentences.insert(1, f'They call it "{rng.choice(ADJECTIVES).lower()} {rng.choice(NOUNS).lower()}".')
+    sep = "\n" if rng.random() < 0.05 else " "  # some overviews span lines
+    return sep.join(sentences)
+
+
+def generate_rows(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield n synthetic TMDB rows (dicts with the 24 columns), deterministic for a seed."""
+    rng = random.Random(seed)
+    for i in range(n):
+        title = f"The {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        if rng.random() < 0.9:  # ~10% of titles repeat (remakes, common names)
+            title += f" {i}"
+        votes = 0 if rng.random() < 0.03 else int(math.exp(rng.gauss(6.8, 1.6)))
+        rating = 0.0 if votes == 0 else round(min(10.0, max(0.5, rng.gauss(6.6, 0.9))), 3)
+        year = rng.randint(2010, 2025) if rng.random() < 0.92 else rng.randint(1950, 2009)
+        date = "" if rng.random() < 0.01 else f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        revenue = 0 if rng.random() < 0.4 else int(math.exp(rng.gauss(16.5, 2.0)))
+        budget = 0 if rng.random() < 0.45 else int(math.exp(rng.gauss(16.0, 1.5)))
+        lang = _LANGUAGE(rng)
+        genres: List[str] = []
+        for _ in range(_GENRE_COUNT(rng)):
+            g = _GENRE(rng)
+            if g not in genres:
+                genres.append(g)
+        yield {
+            "id": 10_000 + i * 7 + rng.randint(0, 6),
+            "title": title,
+            "vote_average": rating,
+            "vote_count": votes,
+            "status": "Released" if rng.random() < 0.98 else "Post Production",
+            "release_date": date,
+            "revenue": revenue,
+            "runtime": 0 if rng.random() < 0.02 else max(1, int(rng.gauss(105, 20))),
+            "adult": "False",
+            "backdrop_path": _path(rng),
+            "budget": budget,
+            "homepage": "" if rng.random() < 0.6 else f"https://www.example.com/movie/{i}",
+            "imdb_id": f"tt{rng.randint(1_000_000, 29_999_999):07d}",
+            "original_language": lang,
+            "original_title": title,
+            "overview": _overview(rng),
+            "popularity": round(math.exp(rng.gauss(3.0, 0.9)), 3),
+            "poster_path": _path(rng),
+            "tagline": rng.choice(TAGLINES),
+            "genres": ", ".join(genres),
+            "production_companies": ", ".join(rng.sample(COMPANIES, rng.randint(1, 3))),
+            "production_countries": ", ".join(rng.sample(COUNTRIES, rng.randint(1, 2))),
+            "spoken_languages": ", ".join(dict.fromkeys([LANGUAGE_NAMES[lang], "English"][:rng.randint(1, 2)])),
+            "keywords": ", ".join(rng.sample(KEYWORDS, rng.randint(0, 8))),
+        }
+
+
+def write_synthetic_csv(path: str, rows: int, seed: int = 0) -> str:
+    """Write a synthetic TMDB CSV with `rows` rows; returns the path."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for row in generate_rows(rows, seed):
+            writer.writerow([row[c] for c in COLUMNS])
+    return path
+
+
+def ensure_synthetic_csv(data_dir: str, size: str, seed: int = 0) -> str:
+    """Path of the cached synthetic file for a size name ("3k", "100k", "1m"), generating it if needed."""
+    rows = SIZES[size] if size in SIZES else int(size)
+    path = os.path.join(data_dir, f"tmdb_synth_{size}_seed{seed}.csv")
+    if not os.path.exists(path):
+        write_synthetic_csv(path + ".tmp", rows, seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic TMDB CSV.")
+    parser.add_argument("--out", required=True)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--rows", type=int)
+    group.add_argument("--size", choices=sorted(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_synthetic_csv(args.out, args.rows if args.rows is not None else SIZES[args.size], args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
+from rating_stats import RatingStats
+from review_dedupe import iter_clean_reviews
+
 # Jayraj Class updated to reflect composition
 #clean reviews
 # I updated the class name to ReviewCleaner to reflect composition 
 class ReviewCleaner:
-     """ cleans a list of movie reviews by removing missing data and duplicates, and reviews that are not specific
+    """ cleans a list of movie reviews by removing missing data and duplicates, and reviews that are not specific
 
-This function iterates through the provided list of reviews and performs
+This class iterates through the provided reviews and performs
     two main cleaning operations:
     1. Removes any review entries that are considered incomplete (e.g., None, "", 0, or empty lists/dicts).
     2. Removes duplicate review strings, keeping the first occurrence.
 
+clean_review() keeps the original list-in/list-out behaviour; iter_clean()
+accepts any iterable, yields lazily and de-duplicates on a normalized key
+(casefold, NFKC, collapsed whitespace) while remembering only fixed-size
+hashes, or a Bloom filter for unbounded streams.
+
 Args:
 reviews_list(list): List of raw movie reviews / potential mixed data types
 
@@ -20,28 +28,37 @@ Raises:
 
 Example:
 movie_reviews = ["Great movie!", None, "So-so.", "Great movie!", ""]
-clean_review(movie_reviews)
+ReviewCleaner().clean_review(movie_reviews)
 # Output: ['Great movie!', 'So-so.']
 """
-def clean_review(review):
-    if not isinstance(review, list):
-        raise TypeError("Input must be a list.")
 
-    cleaned_reviews = []
-    seen_reviews = set()
+    def __init__(self, normalize=True, bloom=False, capacity=1_000_000, fp_rate=0.001):
+        self.normalize = normalize
+        self.bloom = bloom
+        self.capacity = capacity
+        self.fp_rate = fp_rate
 
-    for rev in review:
+    def clean_review(self, review):
+        if not isinstance(review, list):
+            raise TypeError("Input must be a list.")
+        # exact-match dedupe, as before; normalization is opt-in through iter_clean()
+        return list(iter_clean_reviews(review, normalize=False))
 
-        if rev in (None, "", 0, [], {}):
-            continue
+    def iter_clean(self, reviews, normalize=None, bloom=None):
+        """Lazily clean any iterable of reviews (generator, file, stream...)."""
+        return iter_clean_reviews(
+            reviews,
+            normalize=self.normalize if normalize is None else normalize,
+            bloom=self.bloom if bloom is None else bloom,
+            capacity=self.capacity,
+            fp_rate=self.fp_rate,
+        )
 
 
-        if isinstance(rev, str) and rev not in seen_reviews:
-            cleaned_reviews.append(rev)
-            seen_reviews.add(rev)
+def clean_review(review):
+    """Module-level shortcut kept for older callers: ReviewCleaner().clean_review(review)."""
+    return ReviewCleaner().clean_review(review)
 
-    return cleaned_reviews
-     
 #summarize_plot
 # Jayraj Class PlotSummarizer updated to reflect composition
 class PlotSummarizer:
@@ -77,6 +94,24 @@ class PlotSummarizer:
             raise ValueError("Max length must be greater than 0.")
 
         return plot[:max_length - 3] + "..." if len(plot) > max_length else plot
+
+    def summarize_batch(self, plots, max_length=100, mode="word", corpus=None):
+        """Summarize a list or pandas Series of plots at once (see plot_summary).
+
+        mode is "char", "word", "sentence" or "extractive"; extractive mode
+        scores sentences with term frequencies from `corpus` (defaults to plots).
+        Summarizers are kept per (max_length, mode), so repeated calls reuse the memo.
+        """
+        from plot_summary import BatchPlotSummarizer
+
+        if not hasattr(self, "_batch"):
+            self._batch = {}
+        summarizer = self._batch.get((max_length, mode))
+        if summarizer is None:
+            summarizer = self._batch[(max_length, mode)] = BatchPlotSummarizer(max_length, mode)
+        if mode == "extractive" and (corpus is not None or not summarizer.fitted):
+            summarizer.fit(plots if corpus is None else corpus)
+        return summarizer.summarize_many(plots)
      
 #Jayraj Class RatingAnalyzer updated to reflect composition
 #average_rating
@@ -105,14 +140,15 @@ class RatingAnalyzer:
         if not isinstance(ratings, list):
             raise TypeError("Input must be a list.")
 
-        total = count = 0
+        return self.stats(ratings, quantiles=False).mean
 
-        for rating in ratings:
-            if isinstance(rating, (int, float)):
-                total += rating
-                count += 1
+    def stats(self, ratings, quantiles=True):
+        """One-pass RatingStats (count, mean, variance, min/max, quantiles).
 
-        return total / count if count > 0 else 0
+        Accepts any iterable or a NumPy array (vectorized path). Results
+        from different chunks or processes can be combined with merge().
+        """
+        return RatingStats(quantiles=quantiles).update(ratings)
      
 #Jayraj Function
 #is_positive
@@ -131,7 +167,7 @@ class PositiveReviewDetector:
             raise TypeError("Review must be a string.")
 
         text = review.lower()
-        return any(word in text for word in self.POSITIVE_WORDS)
+        return any(word in text for word in self.positive_keywords)
 
 # (All commits are found on our Colab document)
 
@@ -180,6 +216,7 @@ class DataClean:
         self.PositiveReviewDetector = PositiveReviewDetector()
         self._cleaned_reviews = None
         self._average_rating = None
+        self._rating_stats = None
 
     # ----- Properties -----
     @property
@@ -202,8 +239,17 @@ class DataClean:
     
     def average_rating(self):
         ratings = self._data.get("ratings", [])
-        self._average_rating = self.RatingAnalyzer.average(ratings)
+        if not isinstance(ratings, list):
+            raise TypeError("Input must be a list.")
+        self._rating_stats = self.RatingAnalyzer.stats(ratings)
+        self._average_rating = self._rating_stats.mean
         return self._average_rating
+
+    def rating_stats(self):
+        """Full rating statistics (computed by average_rating())."""
+        if self._rating_stats is None:
+            self.average_rating()
+        return self._rating_stats.summary()
     def summarize_plot(self, max_length=100):
         plot = self._data.get("plot", "")
         return self.PlotSummarizer.summarize(plot, max_length=max_length)
@@ -1,4 +1,8 @@
-import pandas as pd
+from __future__ import annotations
+
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
 
 class Dataset:
     """
@@ -18,7 +22,87 @@ class Dataset:
             raise ValueError(f"Missing required columns: {missing}")
 
         self._df = df.copy()
+        self._indexes = None  # range_index.IndexSet over self._df, built by create_index()
 
     def get_data(self) -> pd.DataFrame:
         """Return a defensive copy of the dataset."""
-        return self._df.copy()
\ No newline at end of file
+        return self._df.copy()
+
+    def sample(self, n: int, by: str | None = None, seed: int | None = None) -> Dataset:
+        """
+        A smaller Dataset for quick approximate charts: n random movies, or
+        up to n per stratum with by='genre' (first listed genre), 'year' or
+        any column. Rows get a sample_weight column (movies each one stands
+        for), which MovieVisualizer uses to scale counts back up.
+        """
+        from sampling import WEIGHT_COLUMN
+
+        out, strata = self._draw(n, by, seed)
+        if strata is None:
+            out[WEIGHT_COLUMN] = len(self._df) / len(out)
+        else:
+            sizes = strata.value_counts()
+            taken = strata.loc[out.index].value_counts()
+            out[WEIGHT_COLUMN] = strata.loc[out.index].map(sizes / taken).to_numpy()
+        return Dataset(out)
+
+    def draw_sample(self, n: int, by: str | None = None, seed: int | None = None):
+        """
+        The same draw as sample(), as a sampling.Sample: its mean(),
+        count() and count_by() return Estimates with standard errors.
+        """
+        from sampling import Sample
+
+        out, strata = self._draw(n, by, seed)
+        if strata is None:
+            return Sample({None: (out.to_dict('records'), len(self._df))}, by=None, seed=seed)
+        sizes = strata.value_counts()
+        groups = {}
+        for key, row in zip(strata.loc[out.index], out.to_dict('records')):
+            groups.setdefault(key, []).append(row)
+        return Sample({k: (rows, int(sizes[k])) for k, rows in groups.items()}, by=by, seed=seed)
+
+    def _draw(self, n: int, by: str | None, seed: int | None):
+        """Sampled rows, plus each movie's stratum label (None when unstratified)."""
+        from sampling import stratum_key
+
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive int.")
+        df = self._df
+        if by is None:
+            return df.sample(n=min(n, len(df)), random_state=seed), None
+        key = stratum_key(by)
+        strata = pd.Series([key(r) for r in df.to_dict('records')], index=df.index, dtype=object)
+        strata = strata.fillna('(none)')
+        shuffled = df.sample(frac=1.0, random_state=seed)
+        return shuffled[shuffled.groupby(strata.loc[shuffled.index]).cumcount() < n].copy(), strata
+
+    def create_index(self):
+        """
+        Build sorted range indexes (numeric columns, year, genres) so query()
+        can answer selective filters by lookup instead of full-column masks.
+        """
+        from range_index import IndexSet
+
+        if self._indexes is None:
+            self._indexes = IndexSet.from_frame(self._df)
+        return self._indexes
+
+    def query(self, expr, plan: str = "auto") -> pd.DataFrame:
+        """
+        Rows matching a filter expression, e.g.
+        "genre in ('Drama', 'Thriller') and vote_count >= 100 and runtime < 120".
+        Evaluated with vectorized masks, or through create_index() indexes
+        when they exist and the planner finds them cheaper.
+        """
+        from filter_expr import FilterExpr, compile_filter
+
+        compiled = expr if isinstance(expr, FilterExpr) else compile_filter(expr)
+        return compiled.filter_frame(self._df, self._indexes, plan).copy()
+
+    def explain(self, expr) -> str:
+        """How query(expr) would run (chosen plan and estimated costs)."""
+        from filter_expr import FilterExpr, compile_filter
+
+        compiled = expr if isinstance(expr, FilterExpr) else compile_filter(expr)
+        return compiled.explain(len(self._df), self._indexes, frame=True)
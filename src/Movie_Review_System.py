@@ -1,6 +1,13 @@
 #Pranavs Class
 #UPDATED WITH COMPOSITION AND POLYMORPHISM.
+import os
 from BaseReviewSystem import AbstractMovieReviewItem
+from hashlib import blake2b
+
+from metrics import default_registry
+from movie_library import is_spoiler_review, recommend_similar_movies, remove_spoiler_reviews
+from movie_ranking import WeightedRanker, top_k_indices
+from review_loader import iter_movie_reviews, iter_review_chunks
 
 class MovieReviewSystem(AbstractMovieReviewItem):
     """
@@ -11,26 +18,83 @@ class MovieReviewSystem(AbstractMovieReviewItem):
     #These methods use external helper functions rather than
     # inheriting from multiple classes. MovieReviewSystem "has-a" relationship
     # with these utilities: it uses them to perform work.
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, metrics=None, **reader_options):
         if not isinstance(filepath, str) or not filepath.strip():
             raise ValueError("File path must be a non-empty string.")
 
         self._filepath = filepath
+        self._reader_options = reader_options  # passed to review_loader (columns, header, compression...)
         self._reviews = []
         self._cleaned_reviews = []
+        # stage timings / row counts go to a MetricsRegistry (the process-wide one by default)
+        self.metrics = metrics if metrics is not None else default_registry()
 
     def load_reviews(self):
-        """Load reviews using composition functions."""
-        self._reviews = load_movie_reviews(self._filepath)
+        """
+        Load every review in the file (duplicates included; clean_reviews()
+        drops them). Use iter_cleaned_chunks() to stream a large file instead.
+        """
+        with self.metrics.stage("review_system.load_reviews") as st:
+            self._reviews = list(iter_movie_reviews(self._filepath, **self._reader_options))
+            st.rows_out = len(self._reviews)
+            if os.path.isfile(self._filepath):
+                st.count("bytes_read", os.path.getsize(self._filepath))
         return self._reviews
 
+    @staticmethod
+    def _review_key(review):
+        """8-byte digest of a review row; the one dedupe key for every path."""
+        return blake2b(repr(list(review)).encode("utf-8"), digest_size=8).digest()
+
+    def _dedupe(self, reviews, seen=None):
+        """Yield the first copy of each review by _review_key (seen may span calls)."""
+        seen = set() if seen is None else seen
+        for review in reviews:
+            key = self._review_key(review)
+            if key not in seen:
+                seen.add(key)
+                yield review
+
+    def iter_cleaned_chunks(self, chunk_size=10000):
+        """
+        Stream the review file and yield cleaned chunks (duplicates and
+        spoilers removed) without ever holding the whole file in memory.
+
+        Duplicates are tracked across chunks by 8-byte row digests, so memory
+        grows with the number of unique reviews, not with their text size.
+        """
+        seen = set()
+        for chunk in iter_review_chunks(self._filepath, chunk_size, **self._reader_options):
+            kept = [review for review in self._dedupe(chunk, seen=seen) if self._keep_review(review)]
+            if kept:
+                yield kept
+
+    def as_pipeline(self, *stages, queue_size=64):
+        """
+        load -> dedupe -> spoiler filter (-> class-specific filters) as a
+        lazy StreamPipeline over the review file; extra stages are appended.
+        """
+        from review_stream import Stage, StreamPipeline, filter_stage
+        return StreamPipeline(
+            iter_movie_reviews(self._filepath, **self._reader_options),
+            [Stage("dedupe", self._dedupe), filter_stage(self._keep_review, name="clean"), *stages],
+            queue_size=queue_size,
+        )
+
+    def _keep_review(self, review):
+        """Per-review filter used by the streaming path; same test as clean_reviews()."""
+        return not is_spoiler_review(review)
+
     def clean_reviews(self):
         """Remove duplicates and spoiler reviews."""
         if not self._reviews:
             raise RuntimeError("No reviews loaded")
 
-        no_duplicates = remove_duplicate_data(self._reviews)
-        self._cleaned_reviews = remove_spoiler_reviews(no_duplicates)
+        with self.metrics.stage("review_system.clean_reviews") as st:
+            st.rows_in = len(self._reviews)
+            no_duplicates = list(self._dedupe(self._reviews))
+            self._cleaned_reviews = remove_spoiler_reviews(no_duplicates)
+            st.rows_out = len(self._cleaned_reviews)
         return self._cleaned_reviews
 
     def recommend_movies(self):
@@ -38,7 +102,11 @@ class MovieReviewSystem(AbstractMovieReviewItem):
         if not self._cleaned_reviews:
             raise RuntimeError("No cleaned reviews available")
 
-        return recommend_similar_movies(self._cleaned_reviews)
+        with self.metrics.stage("review_system.recommend_movies") as st:
+            st.rows_in = len(self._cleaned_reviews)
+            recommended = recommend_similar_movies(self._cleaned_reviews)
+            st.rows_out = len(recommended)
+        return recommended
 
     
 
@@ -52,40 +120,92 @@ class CriticMovieReviewSystem(MovieReviewSystem):
 
     """
 
-    def __init__(self, filepath, minimum_rating=7):
-        super().__init__(filepath) # call parent method first
+    def __init__(self, filepath, minimum_rating=7, ranker=None, group_field=None, **reader_options):
+        super().__init__(filepath, **reader_options) # call parent method first
         self.minimum_rating = minimum_rating  
+        self.ranker = ranker if ranker is not None else WeightedRanker(min_votes=3)
+        # position of a genre/year field in each review row; feeds the ranker's grouped prior
+        self.group_field = group_field
 
     def clean_reviews(self):
         """Critics system removes spoilers using parent logic AND removes low-rating reviews."""
         cleaned = super().clean_reviews()
 
-        high_quality_only = []
-        for review in cleaned:
-            try:
-                rating = float(review[1])
-                if rating >= self.minimum_rating:
+        with self.metrics.stage("review_system.clean_reviews.minimum_rating") as st:
+            st.rows_in = len(cleaned)
+            high_quality_only = []
+            for review in cleaned:
+                if self._meets_minimum(review):
                     high_quality_only.append(review)
-            except (ValueError, IndexError):
-                continue 
+            st.rows_out = len(high_quality_only)
 
         self._cleaned_reviews = high_quality_only
         return self._cleaned_reviews
 
-    def recommend_movies(self):
+    def _meets_minimum(self, review):
+        """Ratings arrive as floats from the typed loader; strings still work."""
+        try:
+            rating = review[1]
+            if not isinstance(rating, (int, float)):
+                rating = float(rating)
+            return rating >= self.minimum_rating
+        except (TypeError, ValueError, IndexError):
+            return False
+
+    def _keep_review(self, review):
+        return super()._keep_review(review) and self._meets_minimum(review)
+
+    def recommend_movies(self, rank_by="rating", top_k=None):
         """
         Critic recommendations: return movies sorted by rating (high → low),
         not just all movies ≥ 4 stars.
+
+        rank_by="rating" returns the cleaned reviews sorted by raw rating.
+        rank_by="weighted" groups reviews by title and ranks titles by their
+        vote-weighted (Bayesian) score, so one glowing review cannot beat many
+        good ones. Rows come back as [title, weighted_score, review_count].
         """
         if not self._cleaned_reviews:
             raise RuntimeError("No cleaned reviews available")
+        if rank_by not in ("rating", "weighted"):
+            raise ValueError("rank_by must be 'rating' or 'weighted'")
+
+        with self.metrics.stage("review_system.recommend_movies", rank_by=rank_by) as st:
+            st.rows_in = len(self._cleaned_reviews)
+            if rank_by == "weighted":
+                recommended = self._recommend_weighted(top_k)
+            else:
+                # Parse each rating once instead of inside the sort key.
+                keyed = [(float(r[1]), i) for i, r in enumerate(self._cleaned_reviews)]
+                keyed.sort(key=lambda p: p[0], reverse=True)
+                if top_k is not None:
+                    keyed = keyed[:top_k]
+                recommended = [self._cleaned_reviews[i] for _, i in keyed]
+            st.rows_out = len(recommended)
+        return recommended
+
+    def _recommend_weighted(self, top_k=None):
+        """
+        Rank titles by weighted score of their (mean rating, review count).
 
-        sorted_reviews = sorted(
-            self._cleaned_reviews,
-            key=lambda r: float(r[1]),
-            reverse=True
-        )
-        return sorted_reviews
+        With a genre/year ranker the prior is grouped by the value at
+        group_field (taken from each title's first review); without a
+        group_field the prior falls back to the global mean.
+        """
+        totals = {}
+        groups = {}
+        for review in self._cleaned_reviews:
+            rating_sum, count = totals.get(review[0], (0.0, 0))
+            totals[review[0]] = (rating_sum + float(review[1]), count + 1)
+            if self.group_field is not None and review[0] not in groups:
+                groups[review[0]] = review[self.group_field] if len(review) > self.group_field else None
+
+        titles = list(totals)
+        means = [totals[t][0] / totals[t][1] for t in titles]
+        counts = [totals[t][1] for t in titles]
+        keys = self.ranker.value_group_keys([groups[t] for t in titles]) if groups else None
+        scores = self.ranker.score_columns(means, counts, keys)
+        return [[titles[i], float(scores[i]), counts[i]] for i in top_k_indices(scores, top_k)]
 
     def __str__(self):
         return f"CriticMovieReviewSystem({len(self._cleaned_reviews)} high-quality reviews)"
@@ -5,12 +5,19 @@ Functions: plot_top_movies, plot_genre_popularity, plot_rating_distribution, plo
 Class: MovieVisualizer
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from __future__ import annotations
 
-from base_visualizer import BaseVisualizer #New classes
-from dataset import Dataset #New Classes
+from BaseVisualizer import BaseVisualizer #New classes
+from Dataset import Dataset #New Classes
+from lazy_imports import lazy_import
+from movie_ranking import WeightedRanker, top_k_indices
+from group_quantiles import GroupedQuantiles
+from rollups import ReleaseRollups
+
+# plotting stack is imported on first use, not when the module is imported
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 
 class MovieVisualizer(BaseVisualizer):
@@ -29,29 +36,93 @@ class MovieVisualizer(BaseVisualizer):
 
     # VISUALIZATION METHODS
 
-    def plot_top_movies(self, top_n: int = 10) -> None:
+    def top_movies(self, top_n: int = 10, rank_by: str = 'vote_average',
+                   ranker: WeightedRanker | None = None) -> pd.DataFrame:
+        """
+        Top movies as a DataFrame. rank_by='weighted' ranks by vote-weighted
+        score (needs a 'vote_count' column) and adds a 'weighted_score' column.
+        """
         df = self.dataset.get_data()
-        top_movies = df.sort_values(by='vote_average', ascending=False).head(top_n)
+        if rank_by == 'vote_average':
+            return df.sort_values(by='vote_average', ascending=False).head(top_n)
+        if rank_by != 'weighted':
+            raise ValueError("rank_by must be 'vote_average' or 'weighted'")
+        if 'vote_count' not in df.columns:
+            raise ValueError("Weighted ranking needs a 'vote_count' column.")
+
+        ranker = ranker or WeightedRanker()
+        groups = None
+        if ranker.prior != 'global':
+            field = 'genres' if ranker.prior == 'genre' else 'release_date'
+            groups = ranker.value_group_keys(df[field].tolist())
+        scores = ranker.score_columns(df['vote_average'].to_numpy(), df['vote_count'].to_numpy(), groups)
+        idx = top_k_indices(scores, top_n)
+        top = df.iloc[idx].copy()
+        top['weighted_score'] = scores[idx]
+        return top
+
+    def plot_top_movies(self, top_n: int = 10, rank_by: str = 'vote_average',
+                        ranker: WeightedRanker | None = None) -> None:
+        top_movies = self.top_movies(top_n, rank_by=rank_by, ranker=ranker)
+        column = 'weighted_score' if rank_by == 'weighted' else 'vote_average'
 
         plt.figure(figsize=(10, 6))
-        plt.barh(top_movies['title'], top_movies['vote_average'])
+        plt.barh(top_movies['title'], top_movies[column])
         plt.gca().invert_yaxis()
-        plt.title(f"Top {top_n} Movies by Average Rating")
-        plt.xlabel("Average Rating (vote_average)")
+        if rank_by == 'weighted':
+            plt.title(f"Top {top_n} Movies by Weighted Rating")
+            plt.xlabel("Weighted Rating (vote_average shrunk by vote_count)")
+        else:
+            plt.title(f"Top {top_n} Movies by Average Rating")
+            plt.xlabel("Average Rating (vote_average)")
         plt.ylabel("Movie Title")
         plt.show()
 
-    def plot_genre_popularity(self) -> None:
+    # AGGREGATIONS (the data behind each plot, usable without matplotlib)
+
+    # A 'sample_weight' column (from Dataset.sample / sampling.sample_frame) makes
+    # each row count for that many movies, so sampled charts estimate full-data ones.
+
+    def genre_popularity(self) -> pd.DataFrame:
+        """Average vote_average per genre (a movie counts in each of its genres), best first."""
         df = self.dataset.get_data()
         genre_split = df.assign(genres=df['genres'].str.split(', ')).explode('genres')
-
-        genre_stats = (
+        if 'sample_weight' in genre_split.columns:
+            rated = genre_split.dropna(subset=['vote_average'])
+            weighted = (rated['vote_average'] * rated['sample_weight']).groupby(rated['genres']).sum()
+            means = weighted / rated.groupby('genres')['sample_weight'].sum()
+            return means.rename('vote_average').sort_values(ascending=False).reset_index()
+        return (
             genre_split.groupby('genres')['vote_average']
             .mean()
             .sort_values(ascending=False)
             .reset_index()
         )
 
+    def rating_distribution(self, bins: int = 20) -> pd.DataFrame:
+        """Histogram of vote_average: one row per bin with its edges and movie count."""
+        import numpy as np
+
+        df = self.dataset.get_data().dropna(subset=['vote_average'])
+        weights = df['sample_weight'].to_numpy(dtype=float) if 'sample_weight' in df.columns else None
+        counts, edges = np.histogram(df['vote_average'].to_numpy(dtype=float), bins=bins, weights=weights)
+        return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'movie_count': counts})
+
+    def release_rollups(self) -> ReleaseRollups:
+        """Release counts per day/month/quarter/year and genre, built once per visualizer and cached."""
+        if getattr(self, '_rollups', None) is None:
+            self._rollups = ReleaseRollups.from_frame(self.dataset.get_data())
+        return self._rollups
+
+    def release_counts(self, genres: list[str] | None = None, grain: str = 'year',
+                       rollups: ReleaseRollups | None = None) -> pd.DataFrame:
+        """Movies released per (period, genre), optionally only for the given genres."""
+        rollups = rollups or self.release_rollups()
+        return rollups.frame(grain, genres)
+
+    def plot_genre_popularity(self) -> None:
+        genre_stats = self.genre_popularity()
+
         plt.figure(figsize=(12, 6))
         sns.barplot(data=genre_stats, x='genres', y='vote_average')
         plt.xticks(rotation=45, ha='right')
@@ -61,42 +132,64 @@ class MovieVisualizer(BaseVisualizer):
         plt.show()
 
     def plot_rating_distribution(self) -> None:
-        df = self.dataset.get_data()
+        hist = self.rating_distribution(bins=20)
 
         plt.figure(figsize=(8, 5))
-        plt.hist(df['vote_average'], bins=20, edgecolor='black')
+        plt.bar(hist['bin_start'], hist['movie_count'], width=hist['bin_end'] - hist['bin_start'],
+                align='edge', edgecolor='black')
         plt.title("Distribution of Movie Ratings")
         plt.xlabel("Rating (vote_average)")
         plt.ylabel("Number of Movies")
         plt.grid(alpha=0.3)
         plt.show()
 
-    def plot_review_activity_over_time(self, genres: list[str] | None = None) -> None:
-        df = self.dataset.get_data()
-        df['release_date'] = pd.to_datetime(df['release_date'], errors='ignore')
-        df['year'] = df['release_date'].dt.year
-
-        genre_expanded = df.assign(genres=df['genres'].str.split(', ')).explode('genres')
+    def percentile_frame(self, sketches: GroupedQuantiles | None = None, column: str = 'vote_average',
+                         by: str = 'genre', qs: tuple = (0.5, 0.9, 0.99)) -> pd.DataFrame:
+        """
+        Per-group percentiles from quantile sketches. Without `sketches`, they
+        are built from this dataset once and cached on the visualizer.
+        """
+        if sketches is None:
+            if getattr(self, '_sketches', None) is None:
+                self._sketches = GroupedQuantiles().update_frame(self.dataset.get_data())
+            sketches = self._sketches
+        table = sketches.table(column, by=by, qs=qs)
+        return pd.DataFrame.from_dict(table, orient='index').rename_axis(by).reset_index()
+
+    def plot_percentiles(self, sketches: GroupedQuantiles | None = None, column: str = 'vote_average',
+                         by: str = 'genre', qs: tuple = (0.5, 0.9, 0.99)) -> None:
+        stats = self.percentile_frame(sketches, column, by, qs)
+        labels = [c for c in stats.columns if c.startswith('p')]
 
-        if genres:
-            genre_expanded = genre_expanded[genre_expanded['genres'].isin(genres)]
-            title_suffix = f" for Genres: {', '.join(genres)}"
-        else:
-            title_suffix = " (All Genres)"
+        plt.figure(figsize=(12, 6))
+        for label in labels:
+            plt.plot(stats[by].astype(str), stats[label], marker='o', label=label)
+        plt.xticks(rotation=45, ha='right')
+        plt.title(f"{column} Percentiles by {by.title()}")
+        plt.xlabel(by.title())
+        plt.ylabel(column)
+        plt.legend(title="Percentile")
+        plt.grid(alpha=0.3)
+        plt.tight_layout()
+        plt.show()
 
-        yearly_counts = (
-            genre_expanded.groupby(['year', 'genres'])
-            .size()
-            .reset_index(name='movie_count')
-        )
+    def plot_review_activity_over_time(self, genres: list[str] | None = None, grain: str = 'year',
+                                       window: int | None = None, rollups: ReleaseRollups | None = None) -> None:
+        """Release trend per genre from the rollups; `window` plots a trailing rolling sum instead."""
+        rollups = rollups or self.release_rollups()
+        title_suffix = f" for Genres: {', '.join(genres)}" if genres else " (All Genres)"
 
         plt.figure(figsize=(12, 6))
-        for genre in yearly_counts['genres'].unique():
-            data = yearly_counts[yearly_counts['genres'] == genre]
-            plt.plot(data['year'], data['movie_count'], marker='o', label=genre)
-
-        plt.title(f"Movies Released Per Year {title_suffix}")
-        plt.xlabel("Year")
+        for genre in genres or rollups.genres():
+            if window:
+                periods, counts = rollups.rolling(grain, window, genre=genre)
+            else:
+                periods, counts = rollups.series(grain, genre=genre)
+            plt.plot(periods, counts, marker='o' if grain == 'year' else None, label=genre)
+
+        window_label = f" ({window}-{grain} rolling sum)" if window else ""
+        plt.title(f"Movies Released Per {grain.title()}{window_label}{title_suffix}")
+        plt.xlabel(grain.title())
         plt.ylabel("Number of Movies Released")
         plt.legend(title="Genre", bbox_to_anchor=(1, 1), loc='upper left')
         plt.grid(alpha=0.3)
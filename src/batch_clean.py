@@ -0,0 +1,156 @@
+"""
+Batch DataClean over many movies.
+
+Instead of building one DataClean object per movie, a grouped stream of
+reviews keyed by movie id is cut into chunks and each chunk is cleaned in a
+worker process: review cleaning/dedupe, rating statistics, plot summary and
+sentiment per movie. Results come back in input order (deterministic for any
+number of workers) as one compact column-oriented table.
+
+Functions: group_reviews, iter_clean_chunks, clean_movies_batch
+Class:     CleanResultTable
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby, islice
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from Data_Clean import PlotSummarizer, PositiveReviewDetector, clean_review
+from pool_map import ordered_map
+from rating_stats import RatingStats
+from review_loader import _parse_rating
+
+RESULT_COLUMNS = (
+    "movie_id", "n_reviews", "n_clean", "n_positive",
+    "avg_rating", "rating_std", "rating_min", "rating_max", "summary",
+)
+
+Group = Tuple[Hashable, Dict[str, Any]]
+
+
+def group_reviews(records: Iterable[Sequence[Any]], id_field: int = 0,
+                  review_field: int = 1, rating_field: Optional[int] = 2,
+                  plot_field: Optional[int] = None) -> Iterator[Group]:
+    """
+    Turn (movie_id, review, rating[, plot]) records, already sorted/clustered
+    by movie id, into (movie_id, {"reviews": [...], "ratings": [...],
+    "plot": str}) groups; the plot is the first non-empty one of the movie.
+    Only one movie's reviews are held at a time. Ratings may be numbers or
+    numeric strings as read from a CSV (unlike DataClean.average_rating,
+    the batch path parses "7" as 7.0).
+    """
+    for movie_id, recs in groupby(records, key=lambda r: r[id_field]):
+        reviews: List[Any] = []
+        ratings: List[Any] = []
+        plot = None
+        for r in recs:
+            reviews.append(r[review_field])
+            if rating_field is not None:
+                ratings.append(r[rating_field])
+            if plot is None and plot_field is not None and len(r) > plot_field and r[plot_field]:
+                plot = r[plot_field]
+        group: Dict[str, Any] = {"reviews": reviews, "ratings": ratings}
+        if plot is not None:
+            group["plot"] = plot
+        yield movie_id, group
+
+
+def _clean_one(movie_id: Hashable, data: Dict[str, Any], summary_length: int,
+               summarizer: PlotSummarizer,
+               detector: PositiveReviewDetector) -> Tuple[Any, ...]:
+    reviews = data.get("reviews") or []
+    cleaned = clean_review(list(reviews))
+    # numeric strings (ratings read straight from a CSV) count; other text is skipped
+    ratings = [_parse_rating(r) if isinstance(r, str) else r for r in data.get("ratings") or []]
+    stats = RatingStats(quantiles=False).update(ratings)
+    plot = data.get("plot")
+    summary = summarizer.summarize(plot, max_length=summary_length) if isinstance(plot, str) and plot else ""
+    return (
+        movie_id, len(reviews), len(cleaned),
+        sum(1 for r in cleaned if detector.is_positive(r)),
+        stats.mean if stats.count else None,
+        stats.std if stats.count else None,
+        stats.min, stats.max, summary,
+    )
+
+
+def _clean_chunk(chunk: List[Group], summary_length: int) -> List[Tuple[Any, ...]]:
+    """Worker entry point: clean every movie of one chunk."""
+    summarizer, detector = PlotSummarizer(), PositiveReviewDetector()
+    return [_clean_one(mid, data, summary_length, summarizer, detector) for mid, data in chunk]
+
+
+def iter_clean_chunks(groups: Iterable[Group], workers: Optional[int] = 1,
+                      chunk_size: int = 256, summary_length: int = 100) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Yield cleaned result rows chunk by chunk, in input order.
+
+    Args:
+        groups: (movie_id, {"reviews", "ratings", "plot"}) pairs, e.g. from group_reviews().
+        workers: worker processes (1 = in this process, None = CPU count).
+        chunk_size: movies per task.
+        summary_length: max characters of the plot summary.
+    """
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive int")
+    if workers is not None and (not isinstance(workers, int) or workers <= 0):
+        raise ValueError("workers must be a positive int or None")
+
+    it = iter(groups)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield _clean_chunk(chunk, summary_length)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from ordered_map(pool, workers, partial(_clean_chunk, summary_length=summary_length), chunks)
+
+
+class CleanResultTable:
+    """Per-movie cleaning results stored as parallel columns."""
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, List[Any]] = {name: [] for name in RESULT_COLUMNS}
+
+    def extend(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        cols = [self._columns[name] for name in RESULT_COLUMNS]
+        for row in rows:
+            for col, value in zip(cols, row):
+                col.append(value)
+
+    @property
+    def columns(self) -> Dict[str, List[Any]]:
+        return {k: list(v) for k, v in self._columns.items()}
+
+    def column(self, name: str) -> List[Any]:
+        return list(self._columns[name])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [dict(zip(RESULT_COLUMNS, vals)) for vals in zip(*self._columns.values())]
+
+    def to_frame(self) -> Any:
+        import pandas as pd
+        return pd.DataFrame(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns["movie_id"])
+
+    def __repr__(self) -> str:
+        return f"CleanResultTable(movies={len(self)})"
+
+
+def clean_movies_batch(groups: Iterable[Group], workers: Optional[int] = 1,
+                       chunk_size: int = 256, summary_length: int = 100) -> CleanResultTable:
+    """Clean a whole grouped review stream and collect a CleanResultTable."""
+    table = CleanResultTable()
+    for rows in iter_clean_chunks(groups, workers, chunk_size, summary_length):
+        table.extend(rows)
+    return table
+
+
+__all__ = ["RESULT_COLUMNS", "group_reviews", "iter_clean_chunks", "clean_movies_batch", "CleanResultTable"]
@@ -0,0 +1,449 @@
+"""
+Columnar binary export/import for review tables and movie corpora.
+
+CSV re-parsing is slow and loses types. These helpers store tables column by
+column:
+
+- Parquet or Feather when pyarrow is installed.
+- Otherwise an "npcol" directory: one .npy file per numeric column, a UTF-8
+  string heap + int64 offsets per text column, optional validity masks, and
+  a schema.json. (A directory instead of a single .npz because members of a
+  zip archive cannot be memory-mapped.)
+
+Readers support column projection and memory mapping, so re-opening a
+large corpus costs milliseconds; rows are only decoded when accessed.
+
+Functions: write_columnar, read_columnar
+Classes:   StringColumn, ColumnarTable, ColumnarCorpus
+"""
+
+from __future__ import annotations
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from lazy_imports import is_available, lazy_import
+from movie_oop_core import BaseMovieCorpus, fetch_tmdb_movie_reviews
+
+# optional; pyarrow is slow to import, so it is only loaded for parquet/feather I/O
+if is_available("pyarrow"):
+    pa = lazy_import("pyarrow")
+    feather = lazy_import("pyarrow.feather")
+    pq = lazy_import("pyarrow.parquet")
+else:  # pragma: no cover - depends on environment
+    pa = None
+
+SCHEMA_FILE = "schema.json"
+_TYPES = ("int64", "float64", "bool", "str")
+
+# Types for the TMDB CSV columns; anything not listed is stored as text.
+TMDB_SCHEMA: Dict[str, str] = {
+    "id": "int64",
+    "vote_average": "float64",
+    "vote_count": "int64",
+    "revenue": "int64",
+    "runtime": "int64",
+    "budget": "int64",
+    "popularity": "float64",
+    "adult": "bool",
+}
+
+
+def _infer_type(values: Sequence[Any]) -> str:
+    kind = None
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            t = "bool"
+        elif isinstance(v, (int, np.integer)):
+            t = "int64"
+        elif isinstance(v, (float, np.floating)):
+            t = "float64"
+        else:
+            return "str"
+        if kind is None or kind == t:
+            kind = t
+        elif {kind, t} == {"int64", "float64"}:
+            kind = "float64"
+        else:
+            return "str"
+    return kind or "str"
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Convert one value to the schema type; None when it does not fit."""
+    if value is None:
+        return None
+    if kind == "str":
+        return str(value)
+    if value == "":
+        return None
+    try:
+        if kind == "int64":
+            return int(float(value)) if isinstance(value, str) and "." in value else int(value)
+        if kind == "float64":
+            return float(value)
+        if kind == "bool":
+            if isinstance(value, str):
+                return value.strip().lower() in ("true", "1", "yes")
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+class StringColumn:
+    """Text column stored as one UTF-8 byte heap plus offsets (decoded lazily)."""
+
+    def __init__(self, heap: np.ndarray, offsets: np.ndarray, valid: Optional[np.ndarray] = None):
+        self._heap = heap
+        self._offsets = offsets
+        self._valid = valid
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> "StringColumn":
+        encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        heap = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        valid = None
+        if any(v is None for v in values):
+            valid = np.array([v is not None for v in values], dtype=bool)
+        return cls(heap, offsets, valid)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if self._valid is not None and not self._valid[i]:
+            return None
+        return self._heap[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+    def tolist(self) -> List[Optional[str]]:
+        data = self._heap.tobytes()
+        o = self._offsets.tolist()
+        out = [data[o[i]:o[i + 1]].decode("utf-8") for i in range(len(self))]
+        if self._valid is not None:
+            for i in np.flatnonzero(~self._valid):
+                out[i] = None
+        return out
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return iter(self.tolist())
+
+
+class ColumnarTable:
+    """Read-only set of equally long columns plus their schema."""
+
+    def __init__(self, columns: Dict[str, Any], schema: Dict[str, str], valid: Optional[Dict[str, np.ndarray]] = None):
+        self._columns = columns
+        self._schema = schema
+        self._valid = valid or {}
+        lengths = {len(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("columns must have the same length")
+        self._length = lengths.pop() if lengths else 0
+
+    @property
+    def schema(self) -> Dict[str, str]:
+        return dict(self._schema)
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> Any:
+        """Raw column: numpy array (numeric/bool) or StringColumn (text)."""
+        return self._columns[name]
+
+    def values(self, name: str) -> List[Any]:
+        """Column as Python values with nulls restored as None."""
+        col = self._columns[name]
+        if isinstance(col, StringColumn):
+            return col.tolist()
+        out = col.tolist()
+        mask = self._valid.get(name)
+        if mask is not None:
+            for i in np.flatnonzero(~mask):
+                out[i] = None
+        return out
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        return {name: self.values(name) for name in self._columns}
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        cols = self.to_dict()
+        names = list(cols)
+        return [dict(zip(names, vals)) for vals in zip(*(cols[n] for n in names))]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"ColumnarTable(rows={self._length}, columns={self.column_names})"
+
+
+def _detect_format(path: str) -> str:
+    if os.path.isdir(path) and os.path.exists(os.path.join(path, SCHEMA_FILE)):
+        return "npcol"
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            magic = f.read(6)
+        if magic[:4] == b"PAR1":
+            return "parquet"
+        if magic == b"ARROW1":
+            return "feather"
+    raise ValueError(f"cannot tell the columnar format of {path!r}")
+
+
+def write_columnar(
+    columns: Dict[str, Sequence[Any]],
+    path: str,
+    format: str = "auto",
+    schema: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Write a dict of equally long columns in a columnar binary format.
+
+    Args:
+        columns: column name -> sequence of values.
+        path: output file (parquet/feather) or directory (npcol).
+        format: "parquet", "feather", "npcol" or "auto" (parquet when pyarrow
+            is installed, npcol otherwise).
+        schema: optional column -> type ("int64", "float64", "bool", "str");
+            values are coerced to it (unparseable -> null). Other columns are
+            inferred.
+
+    Returns:
+        str: the format actually written.
+    """
+    if not isinstance(columns, dict):
+        raise TypeError("columns must be a dict")
+    if format == "auto":
+        if pa is None:
+            format = "npcol"
+        else:
+            format = "feather" if path.endswith((".feather", ".arrow")) else "parquet"
+    if format not in ("parquet", "feather", "npcol"):
+        raise ValueError("format must be 'parquet', 'feather', 'npcol' or 'auto'")
+    if format != "npcol" and pa is None:
+        raise ImportError(f"{format} export needs pyarrow")
+
+    lengths = {len(v) for v in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("columns must have the same length")
+
+    types: Dict[str, str] = {}
+    data: Dict[str, List[Any]] = {}
+    for name, values in columns.items():
+        kind = (schema or {}).get(name) or _infer_type(values)
+        if kind not in _TYPES:
+            raise ValueError(f"unknown type {kind!r} for column {name!r}")
+        types[name] = kind
+        data[name] = [_coerce(v, kind) for v in values]
+
+    if format == "parquet":
+        pq.write_table(_arrow_table(data, types), path)
+        return format
+    if format == "feather":
+        feather.write_feather(_arrow_table(data, types), path)
+        return format
+
+    os.makedirs(path, exist_ok=True)
+    meta = {"version": 1, "length": lengths.pop() if lengths else 0, "columns": []}
+    for i, (name, values) in enumerate(data.items()):
+        kind = types[name]
+        stem = os.path.join(path, f"c{i:03d}")
+        nullable = any(v is None for v in values)
+        if kind == "str":
+            col = StringColumn.from_values(values)
+            np.save(stem + ".heap.npy", col._heap)
+            np.save(stem + ".offsets.npy", col._offsets)
+        else:
+            fill = {"int64": 0, "float64": np.nan, "bool": False}[kind]
+            np.save(stem + ".npy", np.array([fill if v is None else v for v in values], dtype=kind))
+        if nullable:
+            np.save(stem + ".valid.npy", np.array([v is not None for v in values], dtype=bool))
+        meta["columns"].append({"name": name, "type": kind, "file": f"c{i:03d}", "nullable": nullable})
+    with open(os.path.join(path, SCHEMA_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return format
+
+
+def _arrow_table(data: Dict[str, List[Any]], types: Dict[str, str]) -> Any:
+    arrow_types = {"int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+    return pa.table({n: pa.array(v, type=arrow_types[types[n]]) for n, v in data.items()})
+
+
+def read_columnar(path: str, columns: Optional[Sequence[str]] = None, mmap: bool = True) -> ColumnarTable:
+    """
+    Open a table written by write_columnar().
+
+    Args:
+        path: parquet/feather file or npcol directory.
+        columns: only load these columns (projection). None loads all.
+        mmap: memory-map the data instead of reading it into RAM.
+    """
+    fmt = _detect_format(path)
+    if fmt in ("parquet", "feather"):
+        if pa is None:
+            raise ImportError(f"{fmt} import needs pyarrow")
+        if fmt == "parquet":
+            table = pq.read_table(path, columns=list(columns) if columns else None, memory_map=mmap)
+        else:
+            table = feather.read_table(path, columns=list(columns) if columns else None, memory_map=mmap)
+        back = {"int64": "int64", "double": "float64", "bool": "bool", "string": "str", "large_string": "str"}
+        cols: Dict[str, Any] = {}
+        schema: Dict[str, str] = {}
+        valid: Dict[str, np.ndarray] = {}
+        for field in table.schema:
+            arr = table.column(field.name)
+            kind = back.get(str(field.type), "str")
+            schema[field.name] = kind
+            if kind == "str":
+                cols[field.name] = StringColumn.from_values(arr.to_pylist())
+            else:
+                if arr.null_count:
+                    valid[field.name] = arr.is_valid().to_numpy(zero_copy_only=False)
+                cols[field.name] = arr.to_numpy(zero_copy_only=False)
+        return ColumnarTable(cols, schema, valid)
+
+    with open(os.path.join(path, SCHEMA_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    wanted = set(columns) if columns else None
+    mode = "r" if mmap else None
+    cols = {}
+    schema = {}
+    valid = {}
+    for spec in meta["columns"]:
+        name = spec["name"]
+        if wanted is not None and name not in wanted:
+            continue
+        stem = os.path.join(path, spec["file"])
+        mask = np.load(stem + ".valid.npy", mmap_mode=mode) if spec["nullable"] else None
+        if spec["type"] == "str":
+            cols[name] = StringColumn(
+                np.load(stem + ".heap.npy", mmap_mode=mode),
+                np.load(stem + ".offsets.npy", mmap_mode=mode),
+                mask,
+            )
+        else:
+            cols[name] = np.load(stem + ".npy", mmap_mode=mode)
+            if mask is not None:
+                valid[name] = mask
+        schema[name] = spec["type"]
+    if wanted is not None and wanted - set(cols):
+        raise KeyError(f"unknown columns: {sorted(wanted - set(cols))}")
+    return ColumnarTable(cols, schema, valid)
+
+
+def rows_to_columns(rows: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Row dicts -> column dict (union of keys, missing -> None)."""
+    names: Dict[str, None] = {}
+    for r in rows:
+        for k in r:
+            names.setdefault(k, None)
+    return {n: [r.get(n) for r in rows] for n in names}
+
+
+class ColumnarCorpus(BaseMovieCorpus):
+    """
+    Corpus backed by a columnar export (see BaseMovieCorpus.to_columnar).
+
+    Queries only map the columns: row dicts are decoded on first access to
+    `rows` (or load(), which returns them), and title lookups scan just the
+    title column plus any rows added with add_rows.
+    """
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None, mmap: bool = True):
+        super().__init__()
+        if not isinstance(path, str) or not path.strip():
+            raise ValueError("path must be a non-empty string")
+        self._path = path
+        self._columns = columns
+        self._mmap = mmap
+        self._table: Optional[ColumnarTable] = None
+        self._titles: Optional[List[str]] = None
+
+    @property
+    def table(self) -> ColumnarTable:
+        self.ensure_loaded()
+        return self._table
+
+    def ensure_loaded(self) -> None:
+        """Map the columns once; queries then decode rows only if they need them."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._map()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """(Re)map the columns and return the rows, like every other corpus."""
+        self._map()
+        return self.rows
+
+    def _map(self) -> None:
+        # No row dict is decoded here unless ingest observers need to see the rows.
+        self._reset_observers()
+        self._table = read_columnar(self._path, self._columns, self._mmap)
+        self._rows = []
+        self._titles = None
+        self._loaded = True
+        if self._observers:
+            for row in self._all_rows():
+                self._notify(row)
+        self._rows_changed()
+
+    def _all_rows(self) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        if not self._rows and len(self._table):
+            self._rows = self._table.to_rows()
+        return self._rows
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        return [dict(r) for r in self._all_rows()]
+
+    def __len__(self) -> int:
+        if self._rows:
+            return len(self._rows)  # decoded, possibly with add_rows appended
+        return len(self._table) if self._table is not None else 0
+
+    def find_reviews_by_title(self, title: str) -> List[Dict[str, Any]]:
+        if not isinstance(title, str):
+            raise TypeError("title must be a string")
+        self.ensure_loaded()
+        return self._cached(("reviews", title.strip().lower()), lambda: self._scan_titles(title))
+
+    def _scan_titles(self, title: str) -> List[Dict[str, Any]]:
+        if self._titles is None:
+            self._titles = [(t or "").strip().lower() for t in self._table.values("title")]
+        q = title.strip().lower()
+        names = self._table.column_names
+        overview = self._table.column("overview") if "overview" in names else None
+        ratings = self._table.values("vote_average") if "vote_average" in names else None
+        found = []
+        for i, name in enumerate(self._titles):
+            if name and q in name:
+                rating = ratings[i] if ratings is not None else None
+                found.append({
+                    "author": "TMDB users",
+                    "content": ((overview[i] if overview is not None else "") or "").strip(),
+                    "author_details": {"rating": None if rating is None or rating != rating else float(rating)},
+                })
+        # rows appended with add_rows exist only as dicts
+        found.extend(fetch_tmdb_movie_reviews(title, self._rows[len(self._table):]))
+        return found
+
+    def __str__(self) -> str:
+        return f"ColumnarCorpus(path='{self._path}', rows={len(self)})"
+
+
+__all__ = [
+    "TMDB_SCHEMA", "StringColumn", "ColumnarTable", "ColumnarCorpus",
+    "write_columnar", "read_columnar", "rows_to_columns",
+]
@@ -0,0 +1,617 @@
+"""
+A small filter expression language for movie rows and DataFrames.
+
+    expr = compile_filter("genre in ('Drama', 'Thriller') and vote_count >= 100 and runtime < 120")
+    expr.filter_frame(df)                  # vectorized masks over a DataFrame
+    expr.select(rows, indexes)             # row ids, via range indexes when cheaper
+    print(expr.explain(len(rows), indexes))
+
+Grammar: comparisons joined with `and`, `or`, `not` and parentheses.
+
+    field (== | = | != | <> | < | <= | > | >=) value
+    field [not] in (value, ...)
+    field between low and high           (inclusive)
+    field contains 'text'                (case-insensitive substring)
+
+`genre` (or `genres`) tests membership in the comma-separated genre list;
+`year` is the release year; other fields are row keys/columns. A number on
+the right compares numerically, a quoted string compares text ignoring
+case. Missing or non-numeric cells never satisfy a comparison (so `x != 5`
+skips rows without x), but `not (...)` negates a whole test.
+
+An expression is parsed once (compile_filter caches the last few hundred)
+and can run three ways:
+
+    scan   one compiled Python predicate per row
+    mask   one NumPy/pandas boolean mask per comparison, combined (DataFrames)
+    index  range/term index lookups combined as row-id sets (range_index.IndexSet);
+           for a top-level `and` whose parts are only partly indexed, the
+           indexed parts pick candidates and the rest is checked on those
+           candidates only
+
+plan() estimates each available strategy from the exact match counts the
+indexes give in O(log n) and picks the cheapest; explain() shows the
+choice.
+
+Classes:   FilterExpr, Plan
+Functions: compile_filter
+"""
+
+from __future__ import annotations
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from range_index import _frame_values, _terms, _value_getter
+
+pd = lazy_import("pandas")
+
+TERM_FIELDS = {"genre": "genres", "genres": "genres"}
+
+# Relative cost of touching one row/id, per comparison (measured on the 100k synthetic dump)
+COST_SCAN_ROW = 1.0      # Python predicate on a row dict
+COST_MASK_ROW = 0.05     # vectorized comparison on a column
+COST_INDEX_ID = 0.05     # copying one matched row id out of an index
+COST_BITMAP_ROW = 0.01   # one bitmap AND/OR/NOT over all rows
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|-?\.\d+)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<op><=|>=|==|!=|<>|<|>|=|\(|\)|,)
+      | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {"and", "or", "not", "in", "between", "contains"}
+_ORDERING = {"<", "<=", ">", ">="}
+
+
+# Syntax tree
+
+@dataclass(frozen=True)
+class Cond:
+    """One comparison. kind is "term" (genre list), "number" or "string"."""
+
+    field: str
+    op: str
+    value: Any
+    kind: str
+
+    def __str__(self) -> str:
+        def lit(v: Any) -> str:
+            if isinstance(v, str):
+                return repr(v)
+            return str(int(v)) if v.is_integer() else repr(v)
+        if self.op in ("in", "not in"):
+            return f"{self.field} {self.op} ({', '.join(lit(v) for v in self.value)})"
+        if self.op == "between":
+            return f"{self.field} between {lit(self.value[0])} and {lit(self.value[1])}"
+        return f"{self.field} {self.op} {lit(self.value)}"
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    """and / or over two or more children, or not over one."""
+
+    op: str
+    children: Tuple[Any, ...]
+
+    def __str__(self) -> str:
+        if self.op == "not":
+            return f"not ({self.children[0]})"
+        return f" {self.op} ".join(f"({c})" if isinstance(c, BoolOp) and c.op != "not" else str(c)
+                                   for c in self.children)
+
+
+def _conjunction(nodes: Sequence[Any]) -> Any:
+    return nodes[0] if len(nodes) == 1 else BoolOp("and", tuple(nodes))
+
+
+def _leaves(node: Any) -> List[Cond]:
+    if isinstance(node, Cond):
+        return [node]
+    return [leaf for child in node.children for leaf in _leaves(child)]
+
+
+# Parsing
+
+def _tokenize(text: str) -> List[Tuple[str, Any, int]]:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"unexpected character {text[pos:].lstrip()[:1]!r} at position {pos}")
+        kind = m.lastgroup
+        raw, start = m.group(kind), m.start(kind)
+        if kind == "number":
+            value: Any = float(raw)
+        elif kind == "string":
+            value = re.sub(r"\\(.)", r"\1", raw[1:-1])
+        elif kind == "name" and raw.lower() in _KEYWORDS:
+            kind, value = "keyword", raw.lower()
+        else:
+            value = raw
+        tokens.append((kind, value, start))
+        pos = m.end()
+    tokens.append(("end", None, len(text)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def peek(self, kind: str, value: Any = None) -> bool:
+        k, v, _ = self.tokens[self.i]
+        return k == kind and (value is None or v == value)
+
+    def take(self, kind: str, value: Any = None) -> Any:
+        k, v, pos = self.tokens[self.i]
+        if k != kind or (value is not None and v != value):
+            found = "end of expression" if k == "end" else repr(v)
+            wanted = "end of expression" if kind == "end" else (value or kind)
+            raise ValueError(f"expected {wanted} at position {pos}, found {found}")
+        self.i += 1
+        return v
+
+    def parse(self) -> Any:
+        node = self.or_expr()
+        self.take("end")
+        return node
+
+    def or_expr(self) -> Any:
+        children = [self.and_expr()]
+        while self.peek("keyword", "or"):
+            self.take("keyword")
+            children.append(self.and_expr())
+        return children[0] if len(children) == 1 else BoolOp("or", tuple(children))
+
+    def and_expr(self) -> Any:
+        children = [self.not_expr()]
+        while self.peek("keyword", "and"):
+            self.take("keyword")
+            children.append(self.not_expr())
+        return children[0] if len(children) == 1 else BoolOp("and", tuple(children))
+
+    def not_expr(self) -> Any:
+        if self.peek("keyword", "not"):
+            self.take("keyword")
+            return BoolOp("not", (self.not_expr(),))
+        if self.peek("op", "("):
+            self.take("op")
+            node = self.or_expr()
+            self.take("op", ")")
+            return node
+        return self.comparison()
+
+    def value(self) -> Any:
+        if self.peek("number"):
+            return self.take("number")
+        if not self.peek("string"):
+            k, v, pos = self.tokens[self.i]
+            found = "end of expression" if k == "end" else repr(v)
+            raise ValueError(f"expected a number or quoted string at position {pos}, found {found}")
+        return self.take("string")
+
+    def comparison(self) -> Cond:
+        _, _, pos = self.tokens[self.i]
+        name = self.take("name")
+        if self.peek("keyword", "between"):
+            self.take("keyword")
+            low = self.value()
+            self.take("keyword", "and")
+            op, value = "between", (low, self.value())
+        elif self.peek("keyword", "contains"):
+            self.take("keyword")
+            op, value = "contains", self.take("string")
+        elif self.peek("keyword", "not") or self.peek("keyword", "in"):
+            op = "not in" if self.peek("keyword", "not") else "in"
+            if op == "not in":
+                self.take("keyword")
+            self.take("keyword", "in")
+            self.take("op", "(")
+            values = [self.value()]
+            while self.peek("op", ","):
+                self.take("op")
+                values.append(self.value())
+            self.take("op", ")")
+            value = tuple(values)
+        else:
+            op = self.take("op")
+            if op not in ("==", "=", "!=", "<>") and op not in _ORDERING:
+                raise ValueError(f"expected a comparison operator after {name!r} at position {pos}")
+            op = {"=": "==", "<>": "!="}.get(op, op)
+            value = self.value()
+        return _make_cond(name, op, value, pos)
+
+
+def _make_cond(name: str, op: str, value: Any, pos: int) -> Cond:
+    values = value if isinstance(value, tuple) else (value,)
+    numeric = [isinstance(v, float) for v in values]
+    field_name = TERM_FIELDS.get(name.lower(), name)
+    if name.lower() in TERM_FIELDS and op != "contains":
+        if any(numeric) or op in _ORDERING or op == "between":
+            raise ValueError(f"{name} compares genre names with ==, !=, in or contains (position {pos})")
+        return Cond(field_name, op, tuple(v.lower() for v in values) if isinstance(value, tuple) else value.lower(),
+                    "term")
+    if op == "contains":
+        return Cond(field_name, op, value.lower(), "string")
+    if all(numeric):
+        return Cond(field_name, op, value, "number")
+    if any(numeric):
+        raise ValueError(f"mixed numbers and strings for {name} at position {pos}")
+    if op in _ORDERING or op == "between":
+        raise ValueError(f"{op} on {name} needs a number at position {pos}")
+    return Cond(field_name, op, tuple(v.lower() for v in values) if isinstance(value, tuple) else value.lower(),
+                "string")
+
+
+# Row predicates (scan)
+
+def _test(op: str, value: Any) -> Callable[[Any], bool]:
+    if op == "==":
+        return lambda x: x == value
+    if op == "!=":
+        return lambda x: x != value
+    if op == "<":
+        return lambda x: x < value
+    if op == "<=":
+        return lambda x: x <= value
+    if op == ">":
+        return lambda x: x > value
+    if op == ">=":
+        return lambda x: x >= value
+    if op == "in":
+        wanted = frozenset(value)
+        return lambda x: x in wanted
+    if op == "not in":
+        unwanted = frozenset(value)
+        return lambda x: x not in unwanted
+    if op == "between":
+        lo, hi = value
+        return lambda x: lo <= x <= hi
+    return lambda x: value in x  # contains
+
+
+def _row_predicate(node: Any) -> Callable[[Dict[str, Any]], bool]:
+    if isinstance(node, BoolOp):
+        parts = [_row_predicate(c) for c in node.children]
+        if node.op == "not":
+            inner = parts[0]
+            return lambda row: not inner(row)
+        if node.op == "and":
+            return lambda row: all(p(row) for p in parts)
+        return lambda row: any(p(row) for p in parts)
+
+    test = _test(node.op, node.value)
+    if node.kind == "term":
+        column = node.field
+        if node.op in ("==", "!="):
+            present = node.op == "=="
+            return lambda row: (node.value in _terms(row.get(column))) == present
+        wanted = frozenset(node.value)
+        present = node.op == "in"
+        return lambda row: (not wanted.isdisjoint(_terms(row.get(column)))) == present
+    if node.kind == "number":
+        value_of = _value_getter(node.field)
+
+        def number(row: Dict[str, Any]) -> bool:
+            x = value_of(row)
+            return x == x and test(x)
+        return number
+    column = node.field
+
+    def text(row: Dict[str, Any]) -> bool:
+        x = row.get(column)
+        if x is None or x != x:
+            return False
+        return test(str(x).lower())
+    return text
+
+
+# Vectorized masks
+
+def _unique_mask(column: Any, test: Callable[[Any], bool]) -> np.ndarray:
+    """Evaluate a text test once per distinct cell value and broadcast it (missing -> False)."""
+    codes, uniques = pd.factorize(column)
+    lut = np.fromiter((bool(test(u)) for u in uniques), dtype=bool, count=len(uniques))
+    return np.append(lut, False)[codes]  # code -1 (missing) picks the trailing False
+
+
+def _mask(node: Any, df: Any) -> np.ndarray:
+    if isinstance(node, BoolOp):
+        masks = [_mask(c, df) for c in node.children]
+        if node.op == "not":
+            return ~masks[0]
+        return np.logical_and.reduce(masks) if node.op == "and" else np.logical_or.reduce(masks)
+
+    if node.field not in df.columns and node.field != "year":
+        raise KeyError(f"no column {node.field!r} in the frame")
+    if node.kind == "term":
+        wanted = {node.value} if node.op in ("==", "!=") else set(node.value)
+        present = _unique_mask(df[node.field], lambda cell: not wanted.isdisjoint(_terms(cell)))
+        return present if node.op in ("==", "in") else ~present
+    if node.kind == "number":
+        x = _frame_values(df, node.field)
+        known = ~np.isnan(x)
+        op, value = node.op, node.value
+        if op == "between":
+            return known & (x >= value[0]) & (x <= value[1])
+        if op in ("in", "not in"):
+            hit = np.isin(x, np.asarray(value, dtype=float))
+            return known & (hit if op == "in" else ~hit)
+        with np.errstate(invalid="ignore"):
+            return known & {"==": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal,
+                            ">": np.greater, ">=": np.greater_equal}[op](x, value)
+    test = _test(node.op, node.value)
+    return _unique_mask(df[node.field], lambda cell: test(str(cell).lower()))
+
+
+# Index evaluation
+
+def _indexable(node: Any, indexes: Any) -> bool:
+    if indexes is None:
+        return False
+    if isinstance(node, BoolOp):
+        return all(_indexable(c, indexes) for c in node.children)
+    if node.kind == "term":
+        return node.field in indexes.term_columns
+    return node.kind == "number" and node.field in indexes.columns
+
+
+def _ranges(node: Cond) -> List[Tuple[Optional[float], Optional[float], bool, bool]]:
+    """(lo, hi, lo_inclusive, hi_inclusive) pieces whose union is a numeric comparison."""
+    op, v = node.op, node.value
+    if op == "==":
+        return [(v, v, True, True)]
+    if op == "!=":
+        return [(None, v, True, False), (v, None, False, True)]
+    if op == "in":
+        return [(x, x, True, True) for x in v]
+    if op == "not in":
+        cuts = sorted(set(v))
+        bounds = [None] + cuts + [None]
+        return [(bounds[i], bounds[i + 1], False, False) for i in range(len(bounds) - 1)]
+    if op == "between":
+        return [(v[0], v[1], True, True)]
+    return [{"<": (None, v, True, False), "<=": (None, v, True, True),
+             ">": (v, None, False, True), ">=": (v, None, True, True)}[op]]
+
+
+def _leaf_count(node: Cond, indexes: Any) -> int:
+    """Exact number of rows a leaf matches, from the index alone (bisections / posting lengths)."""
+    if node.kind == "term":
+        index = indexes.term_index(node.field)
+        n = index.count(node.value if node.op in ("==", "!=") else list(node.value))
+        return n if node.op in ("==", "in") else len(indexes) - n
+    index = indexes.range_index(node.field)
+    return sum(index.count(*piece) for piece in _ranges(node))
+
+
+def _union(parts: Sequence[np.ndarray], n: int) -> np.ndarray:
+    if len(parts) == 1:
+        return np.sort(parts[0])
+    member = np.zeros(n, dtype=bool)
+    for p in parts:
+        member[p] = True
+    return np.flatnonzero(member)
+
+
+def _index_ids(node: Any, indexes: Any) -> np.ndarray:
+    """Sorted row ids matching a fully indexable node."""
+    n = len(indexes)
+    if isinstance(node, BoolOp):
+        parts = [_index_ids(c, indexes) for c in node.children]
+        if node.op == "not":
+            member = np.ones(n, dtype=bool)
+            member[parts[0]] = False
+            return np.flatnonzero(member)
+        if node.op == "or":
+            return _union(parts, n)
+        parts.sort(key=len)
+        ids = parts[0]
+        for other in parts[1:]:
+            if not len(ids):
+                break
+            member = np.zeros(n, dtype=bool)
+            member[other] = True
+            ids = ids[member[ids]]
+        return ids
+    if node.kind == "term":
+        index = indexes.term_index(node.field)
+        present = index.ids(node.value if node.op in ("==", "!=") else list(node.value))
+        if node.op in ("==", "in"):
+            return present
+        member = np.ones(n, dtype=bool)
+        member[present] = False
+        return np.flatnonzero(member)
+    index = indexes.range_index(node.field)
+    return _union([index.between(*piece) for piece in _ranges(node)], n)
+
+
+# Planning
+
+@dataclass
+class Plan:
+    """The chosen strategy, its estimated cost, and the alternatives considered."""
+
+    strategy: str
+    cost: float
+    costs: Dict[str, float]
+    rows: int
+    estimate: Optional[int] = None
+    indexed: List[Any] = field(default_factory=list)
+    residual: List[Any] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _index_cost(node: Any, indexes: Any, n: int, counts: Dict[str, int]) -> Tuple[float, float]:
+    """(cost, estimated matching rows) of evaluating a fully indexable node from the indexes."""
+    if isinstance(node, Cond):
+        matched = counts.setdefault(str(node), _leaf_count(node, indexes))
+        return matched * COST_INDEX_ID, matched
+    parts = [_index_cost(c, indexes, n, counts) for c in node.children]
+    cost = sum(c for c, _ in parts) + n * COST_BITMAP_ROW * max(len(parts) - 1, 1)
+    if node.op == "not":
+        return cost, n - parts[0][1]
+    if node.op == "and":  # assume independence
+        est = float(n)
+        for _, m in parts:
+            est *= m / n if n else 0.0
+        return cost, est
+    miss = 1.0
+    for _, m in parts:
+        miss *= 1 - (m / n if n else 0.0)
+    return cost, n * (1 - miss)
+
+
+def _mask_cost(node: Any, n: int) -> float:
+    # text tests factorize the column first: count them double
+    return sum((1 if leaf.kind == "number" else 2) for leaf in _leaves(node)) * n * COST_MASK_ROW
+
+
+class FilterExpr:
+    """A parsed filter expression (build with compile_filter)."""
+
+    def __init__(self, text: str):
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("filter expression must be a non-empty string")
+        self.text = text
+        self.tree = _Parser(text).parse()
+        self._predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+
+    @property
+    def fields(self) -> List[str]:
+        return sorted({leaf.field for leaf in _leaves(self.tree)})
+
+    @property
+    def predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        """The expression compiled to one Python function of a row dict."""
+        if self._predicate is None:
+            self._predicate = _row_predicate(self.tree)
+        return self._predicate
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        return self.predicate(row)
+
+    def mask(self, df: Any) -> np.ndarray:
+        """Boolean NumPy mask over a DataFrame's rows, built column-wise."""
+        return _mask(self.tree, df)
+
+    def _options(self, n_rows: int, indexes: Any, frame: bool) -> Tuple[Dict[str, Plan], Dict[str, int]]:
+        full = "mask" if frame else "scan"
+        counts: Dict[str, int] = {}
+        scan_cost = _mask_cost(self.tree, n_rows) if frame else len(_leaves(self.tree)) * n_rows * COST_SCAN_ROW
+        options = {full: Plan(full, scan_cost, {}, n_rows)}
+        if indexes is None or len(indexes) != n_rows:
+            return options, counts
+        if _indexable(self.tree, indexes):
+            cost, estimate = _index_cost(self.tree, indexes, n_rows, counts)
+            options["index"] = Plan("index", cost, {}, n_rows, int(round(estimate)), [self.tree])
+        elif isinstance(self.tree, BoolOp) and self.tree.op == "and":
+            indexed = [c for c in self.tree.children if _indexable(c, indexes)]
+            residual = [c for c in self.tree.children if not _indexable(c, indexes)]
+            if indexed:
+                cost, candidates = _index_cost(_conjunction(indexed), indexes, n_rows, counts)
+                per_row = COST_MASK_ROW * 4 if frame else COST_SCAN_ROW  # masks on a small slice cost more per row
+                cost += candidates * len(_leaves(_conjunction(residual))) * per_row
+                options["index+filter"] = Plan("index+filter", cost, {}, n_rows, None, indexed, residual)
+        return options, counts
+
+    def plan(self, n_rows: int, indexes: Any = None, frame: bool = False) -> Plan:
+        """
+        Cheapest way to evaluate over n_rows rows: "scan" (row dicts) or
+        "mask" (frame=True), "index" when indexes cover every comparison, or
+        "index+filter" when they cover some parts of a top-level `and`.
+        """
+        options, counts = self._options(n_rows, indexes, frame)
+        best = min(options.values(), key=lambda p: p.cost)
+        best.costs = {name: option.cost for name, option in options.items()}
+        best.counts = counts
+        return best
+
+    def explain(self, n_rows: int, indexes: Any = None, frame: bool = False) -> str:
+        """Human-readable plan: chosen strategy, costs of the alternatives, per-comparison match counts."""
+        plan = self.plan(n_rows, indexes, frame)
+        lines = [f"filter: {self.tree}",
+                 f"rows: {n_rows}   plan: {plan.strategy}   "
+                 + "   ".join(f"cost[{k}]={v:,.0f}" for k, v in sorted(plan.costs.items(), key=lambda kv: kv[1]))]
+        if indexes is None:
+            lines.append("indexes: none (build them to enable index plans)")
+        elif len(indexes) != n_rows:
+            lines.append(f"indexes: stale ({len(indexes)} rows indexed), ignored")
+        if plan.strategy.startswith("index"):
+            for node in plan.indexed:
+                for leaf in _leaves(node):
+                    lines.append(f"  index lookup  {leaf}  -> {plan.counts.get(str(leaf), 0):,} rows")
+            if plan.estimate is not None:
+                lines.append(f"  estimated result: ~{plan.estimate:,} rows")
+            for node in plan.residual:
+                lines.append(f"  then check    {node}  on the candidates")
+        else:
+            how = "mask" if frame else "row test"
+            for leaf in _leaves(self.tree):
+                lines.append(f"  {how:<12}  {leaf}")
+        return "\n".join(lines)
+
+    def select(self, rows: Sequence[Dict[str, Any]], indexes: Any = None, plan: str = "auto") -> List[int]:
+        """Ids (positions) of the matching rows, in row order."""
+        chosen = self._choose(plan, len(rows), indexes, frame=False)
+        if chosen.strategy == "scan":
+            keep = self.predicate
+            return [i for i, row in enumerate(rows) if keep(row)]
+        ids = self._candidates(chosen, indexes).tolist()
+        if not chosen.residual:
+            return ids
+        keep = _row_predicate(_conjunction(chosen.residual))
+        return [i for i in ids if keep(rows[i])]
+
+    def filter_frame(self, df: Any, indexes: Any = None, plan: str = "auto") -> Any:
+        """Matching rows of a DataFrame (positional indexes when given)."""
+        chosen = self._choose(plan, len(df), indexes, frame=True)
+        if chosen.strategy == "mask":
+            return df[self.mask(df)]
+        ids = self._candidates(chosen, indexes)
+        subset = df.iloc[ids]
+        if chosen.residual:
+            subset = subset[_mask(_conjunction(chosen.residual), subset)]
+        return subset
+
+    def _choose(self, plan: str, n_rows: int, indexes: Any, frame: bool) -> Plan:
+        if plan == "auto":
+            return self.plan(n_rows, indexes, frame)
+        if plan not in ("scan", "mask", "index"):
+            raise ValueError("plan must be 'auto', 'scan', 'mask' or 'index'")
+        if (plan == "mask") != frame and plan != "index":
+            raise ValueError("plan 'mask' is for DataFrames, 'scan' for row lists")
+        options, _ = self._options(n_rows, indexes, frame)
+        if plan == "index":
+            options = {k: v for k, v in options.items() if k.startswith("index")}
+            if not options:
+                raise ValueError("no index covers any part of this filter")
+        return min(options.values(), key=lambda p: p.cost)
+
+    def _candidates(self, plan: Plan, indexes: Any) -> np.ndarray:
+        return _index_ids(_conjunction(plan.indexed), indexes)
+
+    def __str__(self) -> str:
+        return str(self.tree)
+
+    def __repr__(self) -> str:
+        return f"FilterExpr({self.text!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_filter(text: str) -> FilterExpr:
+    """Parse (once per distinct text) into a reusable FilterExpr; raises ValueError on syntax errors."""
+    return FilterExpr(text)
+
+
+__all__ = ["FilterExpr", "Plan", "compile_filter"]
@@ -0,0 +1,241 @@
+"""
+Per-genre / per-year percentiles backed by quantile sketches.
+
+GroupedQuantiles keeps one small KLL sketch per (grouping, group, column),
+e.g. ("genre", "Drama", "runtime"). Feed it rows once, during corpus ingest
+(BaseMovieCorpus.add_observer) or from the streaming loader (iter_db); after
+that p50/p90/p99 queries read only the sketches, never the raw rows.
+Sketch sets are mergeable (shards, workers) and serialize to JSON.
+
+Class: GroupedQuantiles
+"""
+
+from __future__ import annotations
+import json
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from movie_ranking import _release_year
+from rating_stats import KLLSketch
+
+DEFAULT_COLUMNS = ("vote_average", "runtime", "revenue", "popularity")
+# TMDB uses 0 for "unknown" in these columns; counting them would drag every percentile down.
+DEFAULT_ZERO_AS_MISSING = ("runtime", "revenue", "budget")
+
+Grouping = Union[str, Tuple[str, ...]]
+
+
+def _genres(row: Dict[str, Any]) -> List[str]:
+    genres = row.get("genres") or ""
+    if not isinstance(genres, str):
+        return []
+    return [g.strip() for g in genres.split(",") if g.strip()]
+
+
+def _dimension_values(row: Dict[str, Any], dim: str) -> List[Hashable]:
+    """All group values of one dimension for a row (a movie is in each of its genres)."""
+    if dim == "genre":
+        return _genres(row)
+    if dim == "year":
+        year = _release_year(row)
+        return [] if year is None else [year]
+    if dim == "all":
+        return ["all"]
+    value = row.get(dim)
+    return [] if value in (None, "") else [value]
+
+
+def _grouping_name(grouping: Grouping) -> str:
+    return grouping if isinstance(grouping, str) else "+".join(grouping)
+
+
+class GroupedQuantiles:
+    """
+    Compact per-group quantile sketches for numeric TMDB columns.
+
+    Args:
+        columns: numeric columns to sketch.
+        by: groupings; each is a dimension ("genre", "year", "all", or any
+            row key) or a tuple of dimensions for combined groups, e.g.
+            ("genre", "year").
+        k: KLL accuracy parameter (rank error about 1.65/k).
+        zero_as_missing: columns where 0 means "unknown" and is skipped.
+
+    Example:
+        gq = GroupedQuantiles()
+        corpus.add_observer(gq)
+        corpus.load()
+        gq.table("runtime", by="genre")   # {"Drama": {"p50": ..., ...}, ...}
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        by: Sequence[Grouping] = ("genre", "year"),
+        k: int = 200,
+        zero_as_missing: Sequence[str] = DEFAULT_ZERO_AS_MISSING,
+    ):
+        if not columns:
+            raise ValueError("columns must not be empty")
+        if not by:
+            raise ValueError("by must not be empty")
+        self._columns = tuple(columns)
+        self._by: Tuple[Tuple[str, ...], ...] = tuple((g,) if isinstance(g, str) else tuple(g) for g in by)
+        self._k = k
+        self._zero_as_missing = set(zero_as_missing)
+        self._sketches: Dict[Tuple[str, Hashable, str], KLLSketch] = {}
+        self._rows = 0
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self._columns
+
+    @property
+    def groupings(self) -> List[str]:
+        return [_grouping_name(g) for g in self._by]
+
+    @property
+    def rows_seen(self) -> int:
+        return self._rows
+
+    # Feeding
+
+    def _value(self, row: Dict[str, Any], column: str) -> Optional[float]:
+        v = row.get(column)
+        if v is None or v == "":
+            return None
+        try:
+            x = float(v)
+        except (TypeError, ValueError):
+            return None
+        if x != x or (x == 0 and column in self._zero_as_missing):
+            return None
+        return x
+
+    def reset(self) -> None:
+        """Drop every sketch (the corpus is reloading)."""
+        self._sketches = {}
+        self._rows = 0
+
+    def add_row(self, row: Dict[str, Any]) -> None:
+        """Add one movie row to every group it belongs to."""
+        self._rows += 1
+        values = [(c, self._value(row, c)) for c in self._columns]
+        values = [(c, x) for c, x in values if x is not None]
+        if not values:
+            return
+        for dims in self._by:
+            name = _grouping_name(dims)
+            groups: List[Tuple[Hashable, ...]] = [()]
+            for dim in dims:
+                groups = [g + (v,) for g in groups for v in _dimension_values(row, dim)]
+            for g in groups:
+                key = g[0] if len(g) == 1 else g
+                for column, x in values:
+                    sk = self._sketches.get((name, key, column))
+                    if sk is None:
+                        sk = self._sketches[(name, key, column)] = KLLSketch(self._k)
+                    sk.add(x)
+
+    def update(self, rows: Iterable[Dict[str, Any]]) -> "GroupedQuantiles":
+        """Add many rows (list, generator, iter_db(...), DataFrame records...)."""
+        for row in rows:
+            self.add_row(row)
+        return self
+
+    def update_frame(self, df: Any) -> "GroupedQuantiles":
+        """Add the rows of a pandas DataFrame."""
+        return self.update(df.to_dict("records"))
+
+    def merge(self, other: "GroupedQuantiles") -> "GroupedQuantiles":
+        """Fold another sketch set with the same columns/groupings into this one."""
+        if not isinstance(other, GroupedQuantiles):
+            raise TypeError("can only merge another GroupedQuantiles")
+        if other._columns != self._columns or other._by != self._by:
+            raise ValueError("columns and groupings must match to merge")
+        for key, sk in other._sketches.items():
+            mine = self._sketches.get(key)
+            if mine is None:
+                self._sketches[key] = KLLSketch.from_dict(sk.to_dict())
+            else:
+                mine.merge(sk)
+        self._rows += other._rows
+        return self
+
+    # Queries (sketches only)
+
+    def _grouping(self, by: Grouping) -> str:
+        name = _grouping_name(by)
+        if name not in self.groupings:
+            raise KeyError(f"no grouping {name!r}; have {self.groupings}")
+        return name
+
+    def groups(self, by: Grouping = "genre") -> List[Hashable]:
+        name = self._grouping(by)
+        found = {g for (n, g, _) in self._sketches if n == name}
+        return sorted(found, key=str)
+
+    def quantiles(self, column: str, group: Hashable, by: Grouping = "genre",
+                  qs: Sequence[float] = (0.5, 0.9, 0.99)) -> List[Optional[float]]:
+        """Approximate quantiles of `column` within one group (None if unseen)."""
+        if column not in self._columns:
+            raise KeyError(f"column {column!r} is not sketched")
+        sk = self._sketches.get((self._grouping(by), group, column))
+        if sk is None:
+            return [None for _ in qs]
+        return sk.quantiles(qs)
+
+    def count(self, column: str, group: Hashable, by: Grouping = "genre") -> int:
+        sk = self._sketches.get((self._grouping(by), group, column))
+        return 0 if sk is None else sk.n
+
+    def table(self, column: str, by: Grouping = "genre",
+              qs: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[Hashable, Dict[str, Any]]:
+        """{group: {"count": n, "p50": ..., "p90": ..., "p99": ...}} for every group."""
+        labels = [f"p{round(q * 100, 1):g}" for q in qs]
+        out: Dict[Hashable, Dict[str, Any]] = {}
+        for group in self.groups(by):
+            n = self.count(column, group, by)
+            if n:
+                out[group] = {"count": n, **dict(zip(labels, self.quantiles(column, group, by, qs)))}
+        return out
+
+    # Persistence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "columns": list(self._columns),
+            "by": [list(g) for g in self._by],
+            "k": self._k,
+            "zero_as_missing": sorted(self._zero_as_missing),
+            "rows": self._rows,
+            "sketches": [
+                {"grouping": n, "group": list(g) if isinstance(g, tuple) else g, "column": c, "sketch": sk.to_dict()}
+                for (n, g, c), sk in self._sketches.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GroupedQuantiles":
+        gq = cls(data["columns"], [tuple(g) for g in data["by"]], data["k"], data["zero_as_missing"])
+        gq._rows = data["rows"]
+        for entry in data["sketches"]:
+            g = entry["group"]
+            gq._sketches[(entry["grouping"], tuple(g) if isinstance(g, list) else g, entry["column"])] = \
+                KLLSketch.from_dict(entry["sketch"])
+        return gq
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "GroupedQuantiles":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self) -> str:
+        return (f"GroupedQuantiles(columns={list(self._columns)}, by={self.groupings}, "
+                f"rows={self._rows}, sketches={len(self._sketches)})")
+
+
+__all__ = ["GroupedQuantiles", "DEFAULT_COLUMNS"]
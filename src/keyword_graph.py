@@ -0,0 +1,381 @@
+"""
+Keyword co-occurrence graph over the TMDB `keywords` column.
+
+KeywordGraph builds two sparse matrices in CSR form (plain numpy arrays:
+indptr, indices, data; no scipy needed):
+
+- incidence: movie x keyword, one entry per keyword a movie is tagged with
+  (with its transpose, keyword x movie, for postings lookups)
+- co-occurrence: keyword x keyword, how many movies carry both keywords,
+  plus the PMI of each pair, log(c_ab * N / (df_a * df_b))
+
+and answers graph queries from them with vectorized array operations:
+
+    graph = KeywordGraph.build(iter_db("tmdb.csv"), workers=4, min_df=2)
+    graph.related_keywords("time travel", top_k=10)          # by PMI
+    graph.similar_movies("Interstellar", top_k=10)           # most shared keywords
+    graph.save("keywords.kwg"); KeywordGraph.load("keywords.kwg", mmap=True)
+
+Construction streams the rows in chunks; with workers > 1, tokenizing and
+pair counting run in worker processes. Co-occurrence pairs are counted per
+chunk (np.unique on packed pair keys) and reduced, so memory follows the
+number of distinct pairs, not movies x keywords^2. Saved graphs are a
+directory of .npy arrays (memory-mappable) plus a meta.json, like the npcol
+layout in columnar_io.
+
+Class: KeywordGraph
+"""
+
+from __future__ import annotations
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from columnar_io import StringColumn
+from movie_ranking import top_k_indices
+from pool_map import ordered_map
+
+META_FILE = "meta.json"
+_ARRAYS = ("indptr", "indices", "df", "pair_indptr", "pair_indices", "pair_counts")
+
+Chunk = Tuple[List[str], List[str], np.ndarray, np.ndarray]
+
+
+def split_keywords(value: Any) -> List[str]:
+    """Normalized keyword list of a cell ("Time Travel, robot" -> ["time travel", "robot"]), duplicates dropped."""
+    if not isinstance(value, str):
+        return []
+    return list(dict.fromkeys(k.strip().lower() for k in value.split(",") if k.strip()))
+
+
+def _tokenize_chunk(cells: List[Tuple[str, Any]]) -> Chunk:
+    """Worker: (title, keywords cell) pairs -> titles, local vocab, local CSR."""
+    vocab: Dict[str, int] = {}
+    titles: List[str] = []
+    lengths: List[int] = []
+    ids: List[int] = []
+    for title, keywords in cells:
+        words = split_keywords(keywords)
+        titles.append(title)
+        lengths.append(len(words))
+        ids.extend(vocab.setdefault(w, len(vocab)) for w in words)
+    indptr = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    return titles, list(vocab), indptr, np.asarray(ids, dtype=np.int32)
+
+
+def _pair_counts(indptr: np.ndarray, indices: np.ndarray, n_keywords: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Co-occurrence counts of one CSR block as (packed pair keys a * K + b with
+    a < b, counts). Every entry is paired with the entries after it in its
+    row, all at once: partners of entry g are g+1 .. row_end-1.
+    """
+    lengths = np.diff(indptr)
+    row_end = np.repeat(indptr[1:], lengths)
+    first = np.arange(indptr[0], indptr[-1], dtype=np.int64)
+    partners = row_end - first - 1
+    total = int(partners.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    left = np.repeat(first, partners)
+    starts = np.cumsum(partners) - partners
+    right = left + 1 + (np.arange(total, dtype=np.int64) - np.repeat(starts, partners))
+    a = indices[left - indptr[0]].astype(np.int64)
+    b = indices[right - indptr[0]].astype(np.int64)
+    keys = np.minimum(a, b) * n_keywords + np.maximum(a, b)
+    return np.unique(keys, return_counts=True)
+
+
+def _pair_counts_job(args: Tuple[np.ndarray, np.ndarray, int]) -> Tuple[np.ndarray, np.ndarray]:
+    return _pair_counts(*args)
+
+
+def _reduce_pairs(parts: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    keys = np.concatenate([k for k, _ in parts]) if parts else np.empty(0, dtype=np.int64)
+    counts = np.concatenate([c for _, c in parts]) if parts else np.empty(0, dtype=np.int64)
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return uniq, np.bincount(inverse, weights=counts, minlength=len(uniq)).astype(np.int64)
+
+
+def _transpose(indptr: np.ndarray, indices: np.ndarray, n_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR of the transpose (rows sorted within each column)."""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    t_indptr = np.zeros(n_cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_cols), out=t_indptr[1:])
+    return t_indptr, rows[order]
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Tuple[str, Any]]]:
+    it = ((r.get("title") or r.get("original_title") or "", r.get("keywords")) for r in rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class KeywordGraph:
+    """
+    Sparse movie x keyword incidence and keyword x keyword co-occurrence/PMI.
+
+    Build with KeywordGraph.build(rows); the constructor takes finished arrays.
+    """
+
+    def __init__(self, titles: Sequence[str], vocab: Sequence[str], indptr: np.ndarray, indices: np.ndarray,
+                 df: np.ndarray, pair_indptr: np.ndarray, pair_indices: np.ndarray, pair_counts: np.ndarray):
+        self._titles = list(titles)
+        self._vocab = list(vocab)
+        self._ids = {w: i for i, w in enumerate(self._vocab)}
+        self.indptr, self.indices, self.df = indptr, indices, df
+        self.pair_indptr, self.pair_indices, self.pair_counts = pair_indptr, pair_indices, pair_counts
+        self._postings: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._title_ids: Optional[Dict[str, int]] = None
+        self._pmi: Optional[np.ndarray] = None
+
+    # Construction
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict[str, Any]], workers: Optional[int] = 1, chunk_size: int = 50_000,
+              min_df: int = 1) -> "KeywordGraph":
+        """
+        Build from TMDB row dicts (title + keywords), streamed in chunks.
+
+        Args:
+            workers: processes for tokenizing and pair counting (1 = inline, None = CPU count).
+            chunk_size: movies per chunk.
+            min_df: drop keywords used by fewer movies (rare tags only add noise to PMI).
+        """
+        if workers is not None and (not isinstance(workers, int) or workers <= 0):
+            raise ValueError("workers must be a positive int or None")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive int")
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+        try:
+            titles, vocab, indptr, indices = cls._incidence(rows, pool, workers, chunk_size)
+            indptr, indices, vocab = cls._prune(indptr, indices, vocab, min_df)
+            df = np.bincount(indices, minlength=len(vocab)).astype(np.int64)
+            pair_indptr, pair_indices, pair_counts = cls._cooccurrence(indptr, indices, len(vocab), pool, workers,
+                                                                       chunk_size)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return cls(titles, vocab, indptr, indices, df, pair_indptr, pair_indices, pair_counts)
+
+    @staticmethod
+    def _incidence(rows: Iterable[Dict[str, Any]], pool: Optional[ProcessPoolExecutor], workers: int,
+                   chunk_size: int) -> Tuple[List[str], List[str], np.ndarray, np.ndarray]:
+        chunks = _chunks(rows, chunk_size)
+        results = ordered_map(pool, workers, _tokenize_chunk, chunks)
+        vocab: Dict[str, int] = {}
+        titles: List[str] = []
+        indptrs: List[np.ndarray] = [np.zeros(1, dtype=np.int64)]
+        parts: List[np.ndarray] = []
+        offset = 0
+        for chunk_titles, local_vocab, local_indptr, local_indices in results:
+            remap = np.fromiter((vocab.setdefault(w, len(vocab)) for w in local_vocab), dtype=np.int32,
+                                count=len(local_vocab))
+            titles.extend(chunk_titles)
+            parts.append(remap[local_indices] if len(local_indices) else local_indices)
+            indptrs.append(local_indptr[1:] + offset)
+            offset += int(local_indptr[-1])
+        indices = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        return titles, list(vocab), np.concatenate(indptrs), indices
+
+    @staticmethod
+    def _prune(indptr: np.ndarray, indices: np.ndarray, vocab: List[str],
+               min_df: int) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        if min_df <= 1:
+            return indptr, indices, vocab
+        df = np.bincount(indices, minlength=len(vocab))
+        keep = df >= min_df
+        remap = np.cumsum(keep, dtype=np.int64).astype(np.int32) - 1
+        mask = keep[indices]
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))[mask]
+        new_indptr = np.zeros(len(indptr), dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(indptr) - 1), out=new_indptr[1:])
+        return new_indptr, remap[indices[mask]], [w for w, k in zip(vocab, keep) if k]
+
+    @staticmethod
+    def _cooccurrence(indptr: np.ndarray, indices: np.ndarray, n_keywords: int,
+                      pool: Optional[ProcessPoolExecutor], workers: int,
+                      chunk_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n_movies = len(indptr) - 1
+        def jobs() -> Iterator[Tuple[np.ndarray, np.ndarray, int]]:
+            for start in range(0, n_movies, chunk_size):
+                block = indptr[start:min(start + chunk_size, n_movies) + 1]
+                yield block, indices[block[0]:block[-1]], n_keywords
+
+        parts: List[Tuple[np.ndarray, np.ndarray]] = []
+        for part in ordered_map(pool, workers, _pair_counts_job, jobs()):
+            parts.append(part)
+            if len(parts) >= 8:  # fold as we go so partial counts never pile up
+                parts = [_reduce_pairs(parts)]
+        keys, counts = _reduce_pairs(parts)
+        a, b = keys // max(n_keywords, 1), keys % max(n_keywords, 1)
+        # symmetric CSR: each pair stored in both rows
+        rows = np.concatenate([a, b])
+        cols = np.concatenate([b, a]).astype(np.int32)
+        data = np.concatenate([counts, counts])
+        order = np.lexsort((cols, rows))
+        pair_indptr = np.zeros(n_keywords + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_keywords), out=pair_indptr[1:])
+        return pair_indptr, cols[order], data[order]
+
+    # Accessors
+
+    @property
+    def n_movies(self) -> int:
+        return len(self._titles)
+
+    @property
+    def n_keywords(self) -> int:
+        return len(self._vocab)
+
+    @property
+    def vocabulary(self) -> List[str]:
+        return list(self._vocab)
+
+    @property
+    def titles(self) -> List[str]:
+        return list(self._titles)
+
+    def keyword_id(self, keyword: str) -> int:
+        if not isinstance(keyword, str):
+            raise TypeError("keyword must be a string")
+        try:
+            return self._ids[keyword.strip().lower()]
+        except KeyError:
+            raise KeyError(f"unknown keyword {keyword!r}") from None
+
+    def movie_id(self, movie: Union[int, str]) -> int:
+        """Row index of a movie: an index, or a title (exact case-insensitive match, else first containing it)."""
+        if isinstance(movie, (int, np.integer)) and not isinstance(movie, bool):
+            if not 0 <= movie < self.n_movies:
+                raise KeyError(f"movie index {movie} out of range")
+            return int(movie)
+        if not isinstance(movie, str):
+            raise TypeError("movie must be a row index or a title")
+        if self._title_ids is None:
+            self._title_ids = {}
+            for i, t in enumerate(self._titles):
+                self._title_ids.setdefault(t.strip().lower(), i)
+        q = movie.strip().lower()
+        if q in self._title_ids:
+            return self._title_ids[q]
+        for i, t in enumerate(self._titles):
+            if q in t.lower():
+                return i
+        raise KeyError(f"no movie titled {movie!r}")
+
+    def movie_keywords(self, movie: Union[int, str]) -> List[str]:
+        i = self.movie_id(movie)
+        return [self._vocab[k] for k in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def cooccurrence(self, a: str, b: str) -> int:
+        """Movies tagged with both keywords."""
+        ia, ib = self.keyword_id(a), self.keyword_id(b)
+        row = self.pair_indices[self.pair_indptr[ia]:self.pair_indptr[ia + 1]]
+        pos = np.searchsorted(row, ib)
+        if pos < len(row) and row[pos] == ib:
+            return int(self.pair_counts[self.pair_indptr[ia] + pos])
+        return 0
+
+    @property
+    def pmi(self) -> np.ndarray:
+        """PMI of every stored pair, aligned with pair_indices (computed once, vectorized)."""
+        if self._pmi is None:
+            rows = np.repeat(np.arange(self.n_keywords), np.diff(self.pair_indptr))
+            n = max(self.n_movies, 1)
+            self._pmi = np.log(self.pair_counts * n / (self.df[rows] * self.df[self.pair_indices].astype(np.float64)))
+        return self._pmi
+
+    # Queries
+
+    def related_keywords(self, keyword: str, top_k: int = 10, by: str = "pmi",
+                         min_count: int = 2) -> List[Tuple[str, float, int]]:
+        """
+        Keywords most associated with `keyword` as (keyword, score, co-occurrences).
+        by="pmi" favours specific associations, by="count" frequent ones;
+        pairs seen fewer than min_count times are ignored (PMI of rare pairs is noise).
+        """
+        if by not in ("pmi", "count"):
+            raise ValueError("by must be 'pmi' or 'count'")
+        k = self.keyword_id(keyword)
+        lo, hi = self.pair_indptr[k], self.pair_indptr[k + 1]
+        counts = self.pair_counts[lo:hi]
+        scores = (self.pmi[lo:hi] if by == "pmi" else counts).astype(float)
+        scores = np.where(counts >= min_count, scores, np.nan)
+        order = [i for i in top_k_indices(scores, top_k) if not np.isnan(scores[i])]
+        cols = self.pair_indices[lo:hi]
+        return [(self._vocab[cols[i]], float(scores[i]), int(counts[i])) for i in order]
+
+    def _movie_postings(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._postings is None:
+            self._postings = _transpose(self.indptr, self.indices, self.n_keywords)
+        return self._postings
+
+    def similar_movies(self, movie: Union[int, str], top_k: int = 10,
+                       weighting: str = "count") -> List[Tuple[str, float]]:
+        """
+        Movies sharing the most keywords with `movie` as (title, score).
+        weighting="idf" counts rare shared keywords more than common ones.
+        """
+        if weighting not in ("count", "idf"):
+            raise ValueError("weighting must be 'count' or 'idf'")
+        i = self.movie_id(movie)
+        kws = self.indices[self.indptr[i]:self.indptr[i + 1]]
+        if not len(kws):
+            return []
+        t_indptr, t_rows = self._movie_postings()
+        starts, ends = t_indptr[kws], t_indptr[kws + 1]
+        lengths = ends - starts
+        # gather all postings of the movie's keywords in one shot
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(int(lengths.sum()))
+        others = t_rows[offsets]
+        weights = None
+        if weighting == "idf":
+            weights = np.repeat(np.log(self.n_movies / self.df[kws]), lengths)
+        scores = np.bincount(others, weights=weights, minlength=self.n_movies).astype(float)
+        scores[i] = 0
+        scores[scores <= 0] = np.nan
+        return [(self._titles[j], float(scores[j])) for j in top_k_indices(scores, top_k) if not np.isnan(scores[j])]
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """Write the graph as a directory of .npy arrays plus meta.json."""
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, name + ".npy"), getattr(self, name))
+        for name, values in (("titles", self._titles), ("vocab", self._vocab)):
+            col = StringColumn.from_values(values)
+            np.save(os.path.join(path, name + ".heap.npy"), col._heap)
+            np.save(os.path.join(path, name + ".offsets.npy"), col._offsets)
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "movies": self.n_movies, "keywords": self.n_keywords,
+                       "pairs": int(len(self.pair_counts) // 2)}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "KeywordGraph":
+        """Re-open a saved graph; mmap=True maps the big arrays instead of reading them."""
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            raise ValueError(f"{path!r} is not a saved KeywordGraph")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode) for name in _ARRAYS}
+        strings = {}
+        for name in ("titles", "vocab"):
+            strings[name] = StringColumn(np.load(os.path.join(path, name + ".heap.npy")),
+                                         np.load(os.path.join(path, name + ".offsets.npy"))).tolist()
+        return cls(strings["titles"], strings["vocab"], **arrays)
+
+    def __repr__(self) -> str:
+        return f"KeywordGraph(movies={self.n_movies}, keywords={self.n_keywords}, pairs={len(self.pair_counts) // 2})"
+
+
+__all__ = ["KeywordGraph", "split_keywords"]
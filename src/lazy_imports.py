@@ -0,0 +1,79 @@
+"""
+Lazy module imports.
+
+pandas, matplotlib, seaborn and even numpy take tens to hundreds of
+milliseconds to import. Modules that only need them in some functions bind
+a LazyModule instead:
+
+    pd = lazy_import("pandas")
+    plt = lazy_import("matplotlib.pyplot")
+
+The real import happens on the first attribute access (pd.DataFrame), so a
+script that only calls load_db() never pays for the plotting stack.
+
+Functions: lazy_import, is_available
+Class:     LazyModule
+"""
+
+from __future__ import annotations
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> Any:
+    """Module `name` if already imported, else a LazyModule that imports it on first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_available(name: str) -> bool:
+    """Whether `name` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+__all__ = ["LazyModule", "lazy_import", "is_available"]
@@ -0,0 +1,295 @@
+"""
+Lightweight pipeline instrumentation.
+
+A MetricsRegistry collects, per named stage, call counts, wall and CPU time
+(total and max), rows in/out, and optionally tracemalloc peak memory, plus
+free-form counters such as bytes read or cache hits. Recording a stage costs
+two clock reads on entry and exit and one short lock, so it can stay on in
+production. Dump everything as JSON or in the Prometheus text format (for
+node_exporter's textfile collector or a scrape endpoint).
+
+    registry = default_registry()
+    with registry.stage("pipeline.normalize") as st:
+        st.rows_in = len(reviews)
+        rows = normalize_tmdb_reviews(reviews)
+        st.rows_out = len(rows)
+    registry.count("bytes_read", 4096, source="reviews.csv")
+    registry.write_prometheus("/var/lib/node_exporter/tmdb.prom")
+
+Classes:   MetricsRegistry, StageTimer
+Functions: default_registry, timed
+"""
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+import tracemalloc
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# tracemalloc is process-global: count the memory-traced stages in flight so
+# only the outermost one resets the peak, and stop tracing when the last one
+# ends if a stage started it.
+_TRACE_LOCK = threading.Lock()
+_trace_active = 0
+_trace_started = False
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+def _prom_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                    for k, v in labels)
+    return "{" + body + "}"
+
+
+class StageTimer:
+    """
+    Context object for one stage run; set rows_in/rows_out or add counters while it runs.
+
+    tracemalloc keeps one peak for the whole process, so memory peaks are
+    exact only for stages that do not overlap. A stage nested in (or running
+    concurrently with) another traced stage reports an upper bound that may
+    include the other stage's allocations.
+    """
+
+    __slots__ = ("_registry", "name", "labels", "rows_in", "rows_out", "_wall", "_cpu", "_mem_base")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: LabelKey):
+        self._registry = registry
+        self.name = name
+        self.labels = labels
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self._mem_base: Optional[int] = None
+
+    def count(self, counter: str, value: float = 1) -> None:
+        """Add to a counter labelled with this stage."""
+        self._registry.count(counter, value, stage=self.name, **dict(self.labels))
+
+    def __enter__(self) -> "StageTimer":
+        global _trace_active, _trace_started
+        if self._registry.trace_memory:
+            with _TRACE_LOCK:
+                if _trace_active == 0:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                        _trace_started = True
+                    tracemalloc.reset_peak()
+                _trace_active += 1
+                self._mem_base = tracemalloc.get_traced_memory()[0]
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        peak = None
+        if self._mem_base is not None:
+            peak = self._end_trace()
+        self._registry._record(self.name, self.labels, wall, cpu, self.rows_in, self.rows_out, peak,
+                               exc_type is not None)
+
+    def _end_trace(self) -> Optional[int]:
+        """Peak above this stage's baseline; stops tracemalloc if a stage started it and none is left."""
+        global _trace_active, _trace_started
+        with _TRACE_LOCK:
+            peak = None
+            if tracemalloc.is_tracing():
+                peak = max(0, tracemalloc.get_traced_memory()[1] - self._mem_base)
+            _trace_active -= 1
+            if _trace_active == 0 and _trace_started:
+                tracemalloc.stop()
+                _trace_started = False
+        return peak
+
+
+class _NullStage:
+    """Stage stand-in used when the registry is disabled."""
+
+    rows_in = rows_out = None
+
+    def count(self, counter: str, value: float = 1) -> None:
+        pass
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of stage timings and counters.
+
+    Args:
+        prefix: metric name prefix for the Prometheus output.
+        trace_memory: record tracemalloc peak per stage (costly; off by default;
+            exact only for stages that do not overlap, see StageTimer).
+        enabled: when False, stage() and count() do nothing.
+    """
+
+    def __init__(self, prefix: str = "tmdb", trace_memory: bool = False, enabled: bool = True):
+        self.prefix = prefix
+        self.trace_memory = trace_memory
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, LabelKey], Dict[str, float]] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+
+    # Recording
+
+    def stage(self, name: str, **labels: Any) -> Any:
+        """Context manager timing one run of a stage."""
+        if "stage" in labels:
+            raise ValueError("'stage' is a reserved label (it holds the stage name)")
+        if not self.enabled:
+            return _NULL_STAGE
+        return StageTimer(self, name, _labels(labels))
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add value to a counter (e.g. bytes_read, cache_hits)."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _record(self, name: str, labels: LabelKey, wall: float, cpu: float, rows_in: Optional[int],
+                rows_out: Optional[int], peak: Optional[int], failed: bool) -> None:
+        key = (name, labels)
+        with self._lock:
+            s = self._stages.get(key)
+            if s is None:
+                s = self._stages[key] = {"calls": 0, "errors": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                         "wall_seconds_max": 0.0, "rows_in": 0, "rows_out": 0}
+            s["calls"] += 1
+            s["errors"] += failed
+            s["wall_seconds"] += wall
+            s["cpu_seconds"] += cpu
+            if wall > s["wall_seconds_max"]:
+                s["wall_seconds_max"] = wall
+            if rows_in is not None:
+                s["rows_in"] += rows_in
+            if rows_out is not None:
+                s["rows_out"] += rows_out
+            if peak is not None:
+                s["peak_bytes"] = max(s.get("peak_bytes", 0), peak)
+
+    def timed(self, name: Optional[str] = None, **labels: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of stage(); the stage name defaults to the function's qualified name."""
+        def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+            stage_name = name or fn.__qualname__
+
+            @wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.stage(stage_name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # Reading
+
+    def stage_stats(self, name: str, **labels: Any) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stages.get((name, _labels(labels)), {}))
+
+    def counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": [dict(stage=n, labels=dict(l), **s) for (n, l), s in sorted(self._stages.items())],
+                "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self._counters.items())],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        p = _prom_name(self.prefix)
+        series: Dict[str, Tuple[str, str, list]] = {}
+
+        def add(metric: str, kind: str, help_text: str, labels: LabelKey, value: float) -> None:
+            series.setdefault(metric, (kind, help_text, []))[2].append((labels, value))
+
+        with self._lock:
+            for (name, labels), s in sorted(self._stages.items()):
+                lab = (("stage", name),) + labels
+                add(f"{p}_stage_calls_total", "counter", "Stage runs.", lab, s["calls"])
+                add(f"{p}_stage_errors_total", "counter", "Stage runs that raised.", lab, s["errors"])
+                add(f"{p}_stage_wall_seconds_total", "counter", "Wall-clock time spent in the stage.", lab, s["wall_seconds"])
+                add(f"{p}_stage_cpu_seconds_total", "counter", "Process CPU time spent in the stage.", lab, s["cpu_seconds"])
+                add(f"{p}_stage_wall_seconds_max", "gauge", "Slowest single run.", lab, s["wall_seconds_max"])
+                add(f"{p}_stage_rows_in_total", "counter", "Rows entering the stage.", lab, s["rows_in"])
+                add(f"{p}_stage_rows_out_total", "counter", "Rows leaving the stage.", lab, s["rows_out"])
+                if "peak_bytes" in s:
+                    add(f"{p}_stage_peak_bytes", "gauge", "Peak traced memory above the stage's start.", lab, s["peak_bytes"])
+            for (name, labels), v in sorted(self._counters.items()):
+                add(f"{p}_{_prom_name(name)}_total", "counter", f"{name} counter.", labels, v)
+
+        lines = []
+        for metric, (kind, help_text, samples) in series.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(f"{metric}{_prom_labels(lab)} {float(v)!r}" for lab, v in samples)
+        return "\n".join(lines) + "\n"
+
+    def _write(self, path: str, text: str) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)  # scrapers never see a half-written file
+
+    def write_json(self, path: str) -> None:
+        self._write(path, self.to_json())
+
+    def write_prometheus(self, path: str) -> None:
+        self._write(path, self.to_prometheus())
+
+    def __repr__(self) -> str:
+        return f"MetricsRegistry(stages={len(self._stages)}, counters={len(self._counters)}, enabled={self.enabled})"
+
+
+_DEFAULT = MetricsRegistry()
+
+
+def default_registry() -> MetricsRegistry:
+    """Process-wide registry used when a component isn't given its own."""
+    return _DEFAULT
+
+
+def timed(name: Optional[str] = None, **labels: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """@timed("stage") using the default registry."""
+    return _DEFAULT.timed(name, **labels)
+
+
+__all__ = ["MetricsRegistry", "StageTimer", "default_registry", "timed"]
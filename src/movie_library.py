@@ -166,8 +166,13 @@ def export_reviews_to_csv(reviews, filename):
 
 # plot_top_movies()
 # I will need to use pandas library in order to create the functions fo visualization
-import pandas as pd
-import matplotlib.pyplot as plt
+# pandas/matplotlib/seaborn are bound lazily (see lazy_imports) so load_db and the
+# other data functions don't pay for the plotting stack.
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 def plot_top_movies(df, top_n=10):
   """
@@ -193,20 +198,19 @@ def plot_top_movies(df, top_n=10):
     raise ValueError("DataFrame must have 'title' and 'average_rating' columns.")
 
   top_movies = df.sort_values(by='vote_average', ascending=False).head(top_n)
-    plt.figure(figsize=(10, 6))
-    plt.barh(top_movies['title'], top_movies['vote_average'], color='skyblue')
-    plt.gca().invert_yaxis()
-    plt.title(f"Top {top_n} Movies by Average Rating")
-    plt.xlabel("Average Rating (vote_average)")
-    plt.ylabel("Movie Title")
-    plt.show() # Had to use Gemini AI to understand how to work with Matplot.lib (plt) to make visualizations
+  plt.figure(figsize=(10, 6))
+  plt.barh(top_movies['title'], top_movies['vote_average'], color='skyblue')
+  plt.gca().invert_yaxis()
+  plt.title(f"Top {top_n} Movies by Average Rating")
+  plt.xlabel("Average Rating (vote_average)")
+  plt.ylabel("Movie Title")
+  plt.show() # Had to use Gemini AI to understand how to work with Matplot.lib (plt) to make visualizations
 
      
 
 # Emilio Sanchez San Martin Functions
 
 # plot_genre_popularity()
-import seaborn as sns
 
 def plot_genre_popularity(df):
   """
@@ -274,9 +278,6 @@ def plot_rating_distribution(df):
 
 # Emilio Sanchez San Martin Functions
 
-import pandas as pd
-import matplotlib.pyplot as plt
-
 def plot_review_activity_over_time (df, genres=None):
 
   """
@@ -306,27 +307,16 @@ def plot_review_activity_over_time (df, genres=None):
   if not required_cols.issubset(df.columns):
       raise ValueError(f"Missing required columns: {required_cols - set(df.columns)}")
 
-  # Parse release dates
-  df['release_date'] = pd.to_datetime(df['release_date'], errors='coerce')
-  df['year'] = df['release_date'].dt.year
-
-  # Expand genres (some rows have multiple genres separated by commas)
-  genre_expanded = df.assign(genres=df['genres'].str.split(', ')).explode('genres')
+  # Count movies released per year per genre (fixed-format date parsing, one pass)
+  from rollups import ReleaseRollups
+  rollups = ReleaseRollups.from_frame(df, grains=('year',))
+  yearly_genre_counts = rollups.frame('year', genres)
 
-  # Filter by specific genres if provided
   if genres:
-      genre_expanded = genre_expanded[genre_expanded['genres'].isin(genres)]
       title_suffix = f" for Selected Genres: {', '.join(genres)}"
   else:
       title_suffix = " (All Genres)"
 
-  # Count movies released per year per genre
-  yearly_genre_counts = (
-      genre_expanded.groupby(['year', 'genres'])
-      .size()
-      .reset_index(name='movie_count')
-  )
-
   plt.figure(figsize=(12, 6))
 
   # Plot each genre separately
@@ -354,12 +344,12 @@ def load_movie_reviews(filepath):
 
     Returns:
         A list of rows from the CSV file, each row as a list [review, rating].
+        Rows are parsed with proper CSV quoting and the rating is a float
+        (None when missing). Use review_loader.iter_movie_reviews to stream
+        files that do not fit in memory.
     """
-    reviews = []
-    with open(filepath, 'r') as file:
-        for line in file:
-            reviews.append(line.strip().split(','))
-    return reviews
+    from review_loader import load_movie_reviews as _load_typed_reviews
+    return _load_typed_reviews(filepath)
 
 #remove_duplicate_data- Pranav Rishi
 def remove_duplicate_data(reviews):
@@ -421,9 +411,26 @@ def remove_spoiler_reviews(reviews):
 
     unspoiled_reviews = []
     for review in reviews:
-        if "spoiler" not in review[0].lower():
+        if not is_spoiler_review(review):
             unspoiled_reviews.append(review)
     return unspoiled_reviews
+
+
+def is_spoiler_review(review):
+    """
+    Checks whether a single review is a spoiler.
+
+    This is the per-review test used by remove_spoiler_reviews, so streaming
+    code can filter one review at a time and agree with the list version.
+
+    Args:
+        review (list): A review whose first item is its text.
+
+    Returns:
+        bool: True if the first item mentions the word spoiler.
+    """
+    text = review[0]
+    return isinstance(text, str) and "spoiler" in text.lower()
      
 
 #recommend_similar_movies()-Pranav Rishi
@@ -603,20 +610,9 @@ clean_review(movie_reviews)
     if not isinstance(review, list):
         raise TypeError("Input must be a list.")
 
-    cleaned_reviews = []
-    seen_reviews = set()
-
-    for rev in review:
-
-        if rev in (None, "", 0, [], {}):
-            continue
+    from review_dedupe import iter_clean_reviews
 
-
-        if isinstance(rev, str) and rev not in seen_reviews:
-            cleaned_reviews.append(rev)
-            seen_reviews.add(rev)
-
-    return cleaned_reviews
+    return list(iter_clean_reviews(review, normalize=False))
      
 # Jayraj Function
 #summarize_plot
@@ -680,15 +676,9 @@ def average_rating(ratings):
     if not isinstance(ratings, list):
         raise TypeError("Input must be a list.")
 
-    total = 0
-    count = 0
-
-    for rating in ratings:
-        if isinstance(rating, (int, float)):
-            total += rating
-            count += 1
-
-    return total / count if count > 0 else 0
+    # One vectorized pass; rating_stats.RatingStats also gives variance and quantiles.
+    from rating_stats import RatingStats
+    return RatingStats(quantiles=False).update(ratings).mean
      
 #Jayraj Function
 #is_positive
@@ -786,15 +776,7 @@ class DataClean:
         if not isinstance(reviews, list):
             raise TypeError("Expected 'reviews' to be a list.")
         
-        cleaned = []
-        seen = set()
-        for rev in reviews:
-            if rev in (None, "", 0, [], {}):
-                continue
-            if isinstance(rev, str) and rev not in seen:
-                cleaned.append(rev)
-                seen.add(rev)
-        
+        cleaned = clean_review(reviews)
         self._cleaned_reviews = cleaned
         return cleaned
 
@@ -13,8 +13,18 @@ Design:
 
 from __future__ import annotations
 import csv
+import itertools
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Sequence
+from math import nan
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from movieclass_table_dataset import ReviewTable, _review_row
+
+if TYPE_CHECKING:  # asyncio/concurrent.futures cost ~80 ms to import; only abuild_reviews needs them
+    import asyncio
+    from concurrent.futures import Executor
 
 # Helpers to keep columns consistent for Dataset/Visualizer integration my teammates functions
 
@@ -56,12 +66,107 @@ def _normalize_row_for_required_cols(row: Dict[str, Any]) -> Dict[str, Any]:
 
 # Project 1 functions
 
-def load_db(path: str) -> List[Dict[str, Any]]:
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return nan
+
+
+def _title_key(title: Any) -> Any:
+    """Cache key for a title lookup (lookups are case-insensitive and stripped)."""
+    return title.strip().lower() if isinstance(title, str) else title
+
+
+def _row_year(row: Dict[str, Any]) -> Optional[int]:
+    """Release year from 'release_year' or the 'YYYY' prefix of 'release_date'."""
+    year: Optional[int] = None
+    if row.get("release_year"):
+        try:
+            year = int(row["release_year"])
+        except ValueError:
+            year = None
+    if year is None and row.get("release_date"):
+        d = row["release_date"]
+        if isinstance(d, str) and len(d) >= 4 and d[:4].isdigit():
+            year = int(d[:4])
+    return year
+
+
+def _row_filter(
+    genre: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    min_votes: Optional[float] = None,
+    min_rating: Optional[float] = None,
+) -> Callable[[Dict[str, Any]], bool]:
+    """Predicate behind BaseMovieCorpus.filter_rows (shared by corpora that scan rows their own way)."""
+    g = genre.strip().lower() if isinstance(genre, str) else None
+
+    def keep(row: Dict[str, Any]) -> bool:
+        if g is not None and g not in [x.strip().lower() for x in (row.get("genres") or "").split(",")]:
+            return False
+        if year_min is not None or year_max is not None:
+            year = _row_year(row)
+            if year is None:
+                return False
+            if year_min is not None and year < year_min or year_max is not None and year > year_max:
+                return False
+        if min_votes is not None and _as_float(row.get("vote_count")) < min_votes:
+            return False
+        if min_rating is not None and _as_float(row.get("vote_average")) < min_rating:
+            return False
+        return True
+    return keep
+
+
+def iter_db(
+    path: str,
+    year_min: int = 2010,
+    year_max: int = 2025,
+    min_votes: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream TMDB rows from CSV one at a time (same filters and normalization
+    as load_db, but nothing is kept in memory).
+
+    path may also be a directory written by year_partitions.repartition_by_year;
+    then only the partitions inside [year_min, year_max] are read.
+    """
+    if not isinstance(path, str):
+        raise TypeError("path must be a string")
+
+    if os.path.isdir(path):
+        from year_partitions import iter_year_range
+        yield from _filter_db_rows(iter_year_range(path, year_min, year_max, min_votes), year_min, year_max, min_votes)
+        return
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        yield from _filter_db_rows(csv.DictReader(f), year_min, year_max, min_votes)
+
+
+def _filter_db_rows(rows: Iterable[Dict[str, Any]], year_min: int, year_max: int,
+                    min_votes: int) -> Iterator[Dict[str, Any]]:
+    for row in rows:
+        year = _row_year(row)
+
+        try:
+            votes = int(row.get("vote_count", "0"))
+        except ValueError:
+            votes = 0
+
+        if year is not None and year_min <= year <= year_max and votes >= min_votes:
+            yield _normalize_row_for_required_cols(row)
+
+
+def load_db(path: str, on_row: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
     """
     Load TMDB rows from CSV and filter:
       - keep 2010 <= release year <= 2025
       - keep vote_count >= 1
 
+    on_row, if given, is called with every kept row while the file is read
+    (used to build sketches/indexes during ingest).
+
     Returns:
         list of row dicts (with required columns normalized/present)
     """
@@ -69,28 +174,10 @@ def load_db(path: str) -> List[Dict[str, Any]]:
         raise TypeError("path must be a string")
 
     rows: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            year: Optional[int] = None
-            if row.get("release_year"):
-                try:
-                    year = int(row["release_year"])
-                except ValueError:
-                    year = None
-            if year is None and row.get("release_date"):
-                d = row["release_date"]
-                if isinstance(d, str) and len(d) >= 4 and d[:4].isdigit():
-                    year = int(d[:4])
-
-            
-            try:
-                votes = int(row.get("vote_count", "0"))
-            except ValueError:
-                votes = 0
-
-            if year is not None and 2010 <= year <= 2025 and votes >= 1:
-                rows.append(_normalize_row_for_required_cols(row))
+    for row in iter_db(path):
+        if on_row is not None:
+            on_row(row)
+        rows.append(row)
 
     return rows
 
@@ -141,38 +228,36 @@ def normalize_tmdb_reviews(reviews: List[Dict[str, Any]]) -> List[List[Any]]:
     if not isinstance(reviews, list):
         raise TypeError("reviews must be a list")
 
-    out: List[List[Any]] = []
-    for item in reviews:
-        if not isinstance(item, dict):
-            continue
-        author = item.get("author", "TMDB users")
-        content = (item.get("content", "") or "").strip()
-        details = item.get("author_details", {})
-        rating = details.get("rating") if isinstance(details, dict) else None
-        out.append([author, content, rating])
-    return out
+    return [_review_row(item) for item in reviews if isinstance(item, dict)]
 
 
-def export_reviews_to_csv(reviews: Sequence[Sequence[Any]], filename: str) -> None:
+def export_reviews_to_csv(reviews: Iterable[Sequence[Any]], filename: str) -> None:
     """
     Save normalized rows to CSV with columns: Author, Content, Rating.
+    `reviews` may be any iterable of rows, including a generator.
     """
-    if not isinstance(reviews, (list, tuple)):
-        raise TypeError("reviews must be a list or tuple")
+    if isinstance(reviews, (str, bytes)) or not isinstance(reviews, Iterable):
+        raise TypeError("reviews must be an iterable of rows")
     if not isinstance(filename, str):
         raise TypeError("filename must be a string")
-    if len(reviews) == 0:
+    reviews = iter(reviews)
+    first = next(reviews, None)
+    if first is None:
         raise ValueError("no reviews to export")
 
-    with open(filename, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Author", "Content", "Rating"])
-        for row in reviews:
-            if isinstance(row, (list, tuple)) and len(row) >= 3:
-                writer.writerow([row[0], row[1], row[2]])
+    from itertools import chain
+    from review_export import write_rows
+    write_rows(
+        (row[:3] for row in chain([first], reviews) if isinstance(row, (list, tuple)) and len(row) >= 3),
+        filename,
+        compression=None,
+    )
 
 # Abstract Base Class + Inheritance (polymorphic)
 
+_CORPUS_TOKENS = itertools.count()  # unique per corpus for the process lifetime (id() gets reused)
+
+
 class BaseMovieCorpus(ABC):
     """
     Abstract base for a movie corpus (polymorphic source of rows + reviews).
@@ -185,15 +270,233 @@ class BaseMovieCorpus(ABC):
     def __init__(self):
         self._loaded: bool = False
         self._rows: List[Dict[str, Any]] = []
+        self._load_lock = threading.Lock()
+        self._observers: List[Any] = []
+        self._cache: Any = None
+        self._cache_token = next(_CORPUS_TOKENS)
+        self._generation = 0
+        self._distinct: List[Any] = []  # GroupedDistinct sketches kept current by ingest
+        self._rollups: Any = None  # ReleaseRollups kept current by ingest
+        self._indexes: Any = None  # IndexSet (range/term indexes) kept current by ingest
 
     @property
     def rows(self) -> List[Dict[str, Any]]:
         """Copy of loaded rows."""
         return [dict(r) for r in self._rows]
 
+    def add_observer(self, observer: Any) -> None:
+        """
+        Register an ingest observer: any object with add_row(row) and
+        reset(). It sees every row as the corpus loads (reset() is called
+        first, so a reload does not count rows twice); rows already loaded
+        are replayed.
+        """
+        if not callable(getattr(observer, "add_row", None)) or not callable(getattr(observer, "reset", None)):
+            raise TypeError("observer must have add_row(row) and reset() methods")
+        self._observers.append(observer)
+        for row in (self._all_rows() if self._loaded else self._rows):
+            observer.add_row(row)
+
+    def _notify(self, row: Dict[str, Any]) -> None:
+        for observer in self._observers:
+            observer.add_row(row)
+
+    def _reset_observers(self) -> None:
+        """Start of every load(): observers forget the rows of the previous load."""
+        for observer in self._observers:
+            observer.reset()
+
+    def track_distinct(self, columns: Optional[Sequence[str]] = None, by: Sequence[Any] = ("all", "genre", "year"),
+                       p: int = 12) -> Any:
+        """
+        Count distinct values of columns (comma lists split) per group with
+        HyperLogLog sketches filled during ingest; register before load() so
+        the sketches are built in the same pass. Returns the GroupedDistinct.
+        """
+        from hll import DEFAULT_COLUMNS, GroupedDistinct
+        sketch = GroupedDistinct(columns or DEFAULT_COLUMNS, by=by, p=p)
+        self.add_observer(sketch)
+        self._distinct.append(sketch)
+        return sketch
+
+    def approx_distinct(self, column: str, group_by: Optional[Any] = None) -> Any:
+        """
+        Approximate number of distinct values of a column: one int overall,
+        or {group: int} with group_by ("year", "genre", any column, or a
+        tuple of them). Answered from sketches in constant memory; the first
+        query for a column/grouping not yet tracked builds its sketch with one
+        scan and keeps it current afterwards.
+        """
+        from hll import GroupedDistinct
+        by = "all" if group_by is None else group_by
+        sketch = next((d for d in self._distinct if d.covers(column, by)), None)
+        if sketch is None:
+            sketch = GroupedDistinct([column], by=[by])
+            sketch.update(self._all_rows())
+            self._observers.append(sketch)
+            self._distinct.append(sketch)
+        if group_by is None:
+            return sketch.estimate(column)
+        return sketch.table(column, by=by)
+
+    def release_rollups(self) -> Any:
+        """
+        Movie counts per day/month/quarter/year and genre (a ReleaseRollups).
+        Built with one scan on first use, or during load if called before
+        it, and kept current by ingest afterwards, so trend queries never
+        rescan the rows.
+        """
+        if self._rollups is None:
+            from rollups import ReleaseRollups
+            rollups = ReleaseRollups()
+            if self._loaded:
+                rollups.update(self._rows)
+            self._observers.append(rollups)
+            self._rollups = rollups
+        return self._rollups
+
+    def index_set(self) -> Any:
+        """
+        Sorted range indexes on the numeric columns plus genre postings (an
+        IndexSet; row ids are positions in the loaded rows). Call before
+        load() to build them during the load pass; afterwards they are
+        built with one scan, kept current by add_rows, and rebuilt after a
+        reload.
+        """
+        from range_index import IndexSet
+        if self._indexes is not None and self._loaded and self._indexes.rows_seen != len(self._rows):
+            self._observers.remove(self._indexes)
+            self._indexes = None
+        if self._indexes is None:
+            self._indexes = IndexSet.build(self._rows) if self._loaded else IndexSet()
+            self._observers.append(self._indexes)
+        return self._indexes
+
+    def range_filter(self, genre: Optional[Any] = None, order_by: Optional[str] = None, descending: bool = False,
+                     limit: Optional[int] = None, **ranges: Any) -> List[Dict[str, Any]]:
+        """
+        Rows inside every numeric range, answered from index_set():
+        budget=(1e6, 5e7), runtime=(None, 90), popularity=(10, None), year=2015.
+        genre is one genre or several (any matches). order_by sorts by an
+        indexed column.
+        """
+        self.ensure_loaded()
+        indexes = self.index_set()
+        ids = indexes.query(ranges, {"genres": genre} if genre else None, order_by, descending, limit)
+        rows = self._rows
+        return [dict(rows[i]) for i in ids.tolist()]
+
+    def _current_indexes(self) -> Any:
+        """index_set() if it has been built and covers the loaded rows, else None (never builds)."""
+        if self._indexes is not None and self._indexes.rows_seen == len(self._rows):
+            return self._indexes
+        return None
+
+    def where(self, expr: Any, plan: str = "auto") -> List[Dict[str, Any]]:
+        """
+        Rows matching a filter expression (see filter_expr), e.g.
+        "genre in ('Drama', 'Thriller') and vote_count >= 100 and runtime < 120".
+        Runs as a row scan, or from index_set() when it exists and the
+        planner finds it cheaper; cached like filter_rows.
+        """
+        from filter_expr import FilterExpr, compile_filter
+        compiled = expr if isinstance(expr, FilterExpr) else compile_filter(expr)
+
+        def compute() -> List[Dict[str, Any]]:
+            rows = self._all_rows()
+            return [dict(rows[i]) for i in compiled.select(rows, self._current_indexes(), plan)]
+
+        self.ensure_loaded()
+        return self._cached(("where", compiled.text, plan), compute)
+
+    def explain(self, expr: Any) -> str:
+        """How where(expr) would run over the loaded rows."""
+        from filter_expr import FilterExpr, compile_filter
+        compiled = expr if isinstance(expr, FilterExpr) else compile_filter(expr)
+        self.ensure_loaded()
+        return compiled.explain(len(self._rows), self._current_indexes())
+
+    @property
+    def generation(self) -> int:
+        """Bumped whenever the rows change (load/reload, add_rows); cached results key on it."""
+        return self._generation
+
+    @property
+    def cache(self) -> Any:
+        return self._cache
+
+    @property
+    def cache_token(self) -> int:
+        """Identifies this corpus in shared QueryCache keys; never reused, unlike id()."""
+        return self._cache_token
+
+    def set_cache(self, cache: Any) -> None:
+        """Serve repeated queries from a QueryCache (None turns caching off)."""
+        self._cache = cache
+
+    def _cached(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        if self._cache is None:
+            return compute()
+        return self._cache.get_or_compute((self._cache_token,) + key, compute, self._generation)
+
+    def _rows_changed(self) -> None:
+        self._generation += 1
+
+    def _all_rows(self) -> List[Dict[str, Any]]:
+        """The loaded row dicts themselves (not copies), for scans."""
+        self.ensure_loaded()
+        return self._rows
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Append rows to a loaded corpus (observers see them; cached queries go stale)."""
+        all_rows = self._all_rows()
+        n = 0
+        for row in rows:
+            row = _normalize_row_for_required_cols(row)
+            all_rows.append(row)
+            self._notify(row)
+            n += 1
+        if n:
+            self._rows_changed()
+        return n
+
+    def filter_rows(
+        self,
+        genre: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        min_votes: Optional[float] = None,
+        min_rating: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows matching every given criterion (genre is case-insensitive); cached like title lookups."""
+        def compute() -> List[Dict[str, Any]]:
+            keep = _row_filter(genre, year_min, year_max, min_votes, min_rating)
+            return [dict(r) for r in self._all_rows() if keep(r)]
+
+        self.ensure_loaded()
+        return self._cached(("filter", genre, year_min, year_max, min_votes, min_rating), compute)
+
+    def ensure_loaded(self) -> None:
+        """Load once, even when many threads ask at the same time."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self.load()
+
     def __len__(self) -> int:
         return len(self._rows)
 
+    def to_columnar(self, path: str, format: str = "auto") -> str:
+        """
+        Save the loaded rows in a typed columnar format (Parquet/Feather with
+        pyarrow, else an npcol directory). Re-open with ColumnarCorpus(path).
+        Returns the format written.
+        """
+        from columnar_io import TMDB_SCHEMA, rows_to_columns, write_columnar
+        self.ensure_loaded()
+        return write_columnar(rows_to_columns(self._rows), path, format=format, schema=TMDB_SCHEMA)
+
     @abstractmethod
     def load(self) -> List[Dict[str, Any]]:
         """Load rows into memory and return them."""
@@ -219,20 +522,27 @@ class TMDBCSVCorpus(BaseMovieCorpus):
         if not isinstance(path, str) or not path.strip():
             raise ValueError("path must be a non-empty string")
         self._path = path
+        self._file_generation = 0
 
     @property
     def path(self) -> str:
         return self._path
 
+    def _has_added_rows(self) -> bool:
+        """True once add_rows has put rows in memory that the CSV file lacks."""
+        return self._loaded and self._generation != self._file_generation
+
     def load(self) -> List[Dict[str, Any]]:
-        self._rows = load_db(self._path)
+        self._reset_observers()
+        self._rows = load_db(self._path, on_row=self._notify if self._observers else None)
         self._loaded = True
+        self._rows_changed()
+        self._file_generation = self._generation
         return self.rows
 
     def find_reviews_by_title(self, title: str) -> List[Dict[str, Any]]:
-        if not self._loaded:
-            self.load()
-        return fetch_tmdb_movie_reviews(title, self._rows)
+        self.ensure_loaded()
+        return self._cached(("reviews", _title_key(title)), lambda: fetch_tmdb_movie_reviews(title, self._rows))
 
     def __str__(self) -> str:
         return f"TMDBCSVCorpus(path='{self._path}', rows={len(self)})"
@@ -252,58 +562,30 @@ class MemoryCorpus(BaseMovieCorpus):
         return self.rows
 
     def find_reviews_by_title(self, title: str) -> List[Dict[str, Any]]:
-        return fetch_tmdb_movie_reviews(title, self._rows)
+        return self._cached(("reviews", _title_key(title)), lambda: fetch_tmdb_movie_reviews(title, self._rows))
 
     def __str__(self) -> str:
         return f"MemoryCorpus(rows={len(self)})"
 
 
-# Composition: ReviewTable + Pipeline 
+# Composition: ReviewTable (shared with movieclass_table_dataset) + Pipeline 
 
-class ReviewTable:
-    """
-    Holds review items and provides normalization + CSV export.
-
-    Used by ReviewPipeline (composition), independent of which BaseMovieCorpus
-    subclass provides the raw data (polymorphism).
-    """
-
-    def __init__(self, reviews: Optional[List[Any]] = None):
-        self._raw: List[Any] = []
-        self._rows: Optional[List[List[Any]]] = None
-        if reviews:
-            self.add_reviews(reviews)
+_WORKER_CORPORA: Dict[str, tuple] = {}  # path -> ((mtime_ns, size), corpus), per worker process
 
-    @property
-    def raw(self) -> List[Any]:
-        return list(self._raw)
-
-    @property
-    def rows(self) -> Optional[List[List[Any]]]:
-        return None if self._rows is None else [list(r) for r in self._rows]
 
-    def add_reviews(self, reviews: List[Any]) -> None:
-        if not isinstance(reviews, list):
-            raise TypeError("reviews must be a list")
-        self._raw.extend(reviews)
-        self._rows = None  # invalidate cache
-
-    def normalize(self) -> List[List[Any]]:
-        self._rows = normalize_tmdb_reviews(self._raw)
-        return [list(r) for r in self._rows]
-
-    def export_csv(self, filename: str) -> None:
-        if self._rows is None:
-            self.normalize()
-        export_reviews_to_csv(self._rows or [], filename)
-
-    def __len__(self) -> int:
-        return 0 if self._rows is None else len(self._rows)
-
-    def __str__(self) -> str:
-        n_raw = len(self._raw)
-        n_rows = len(self) if self._rows is not None else 0
-        return f"ReviewTable(raw={n_raw}, rows={n_rows})"
+def _fetch_normalized_in_worker(title: str, path: str) -> tuple:
+    """
+    Process-pool body of ReviewPipeline.abuild_reviews. Takes only picklable
+    inputs; the CSV is loaded once per worker process and reloaded when the
+    file's mtime or size changes.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _WORKER_CORPORA.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _WORKER_CORPORA[path] = (stamp, TMDBCSVCorpus(path))
+    reviews = cached[1].find_reviews_by_title(title)
+    return reviews, normalize_tmdb_reviews(reviews)
 
 
 class ReviewPipeline:
@@ -317,13 +599,20 @@ class ReviewPipeline:
         pipe = ReviewPipeline(corpus)
         table = pipe.build_reviews("Dune")
         table.export_csv("out/dune_reviews.csv")
+
+    build_reviews records per-stage timings, row counts, bytes read and
+    cache hits in `metrics` (a MetricsRegistry; the process-wide one by default).
     """
 
-    def __init__(self, corpus: BaseMovieCorpus):
+    def __init__(self, corpus: BaseMovieCorpus, cache: Any = None, metrics: Any = None):
         if not isinstance(corpus, BaseMovieCorpus):
             raise TypeError("corpus must be a BaseMovieCorpus")
+        from metrics import default_registry
         self._corpus = corpus
         self._table = ReviewTable()
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._cache = cache
+        self._metrics = metrics if metrics is not None else default_registry()
 
     @property
     def corpus(self) -> BaseMovieCorpus:
@@ -333,20 +622,141 @@ class ReviewPipeline:
     def table(self) -> ReviewTable:
         return self._table
 
+    @property
+    def cache(self) -> Any:
+        return self._cache
+
+    @property
+    def metrics(self) -> Any:
+        return self._metrics
+
+    def _load_corpus(self) -> None:
+        """ensure_loaded, timed as its own stage the first time it actually reads."""
+        if self._corpus._loaded or not self._metrics.enabled:
+            self._corpus.ensure_loaded()
+            return
+        source = self._corpus.__class__.__name__
+        with self._metrics.stage("pipeline.load", source=source) as st:
+            self._corpus.ensure_loaded()
+            st.rows_out = len(self._corpus)
+            path = getattr(self._corpus, "path", None)
+            if isinstance(path, str) and os.path.isfile(path):
+                st.count("bytes_read", os.path.getsize(path))
+
+    def _cache_counts(self) -> Optional[tuple]:
+        cache = self._cache if self._cache is not None else self._corpus.cache
+        if cache is None or not self._metrics.enabled:
+            return None
+        stats = cache.stats()
+        return (stats["hits"], stats["misses"])
+
+    def _find_reviews(self, title: str) -> List[Dict[str, Any]]:
+        if self._cache is None or self._corpus.cache is self._cache:
+            return self._corpus.find_reviews_by_title(title)
+        self._corpus.ensure_loaded()
+        return self._cache.get_or_compute(
+            (self._corpus.cache_token, "reviews", _title_key(title)),
+            lambda: self._corpus.find_reviews_by_title(title),
+            self._corpus.generation,
+        )
+
     def build_reviews(self, title: str) -> ReviewTable:
         """Fetch reviews from the corpus, store, normalize, and return the table."""
-        reviews = self._corpus.find_reviews_by_title(title)
-        self._table.add_reviews(reviews)
-        self._table.normalize()
+        self._load_corpus()
+        before = self._cache_counts()
+        with self._metrics.stage("pipeline.find_reviews") as st:
+            reviews = self._find_reviews(title)
+            st.rows_out = len(reviews)
+            if before is not None:
+                # stats diff: exact unless another thread shares the cache
+                hits, misses = self._cache_counts()
+                st.count("cache_hits", hits - before[0])
+                st.count("cache_misses", misses - before[1])
+        with self._metrics.stage("pipeline.normalize") as st:
+            st.rows_in = len(reviews)
+            st.rows_out = self._table.extend(reviews)
         return self._table
 
+    def _fetch_normalized(self, title: str) -> tuple:
+        """Blocking part of a build: corpus scan + normalization (runs in an executor)."""
+        reviews = self._find_reviews(title)
+        return reviews, normalize_tmdb_reviews(reviews)
+
+    async def abuild_reviews(self, title: str, executor: Optional[Executor] = None) -> ReviewTable:
+        """
+        Async build_reviews for servers handling many concurrent requests.
+
+        The corpus scan runs in `executor` (default: the loop's thread pool)
+        so the event loop never stalls, identical in-flight requests (same
+        title, case-insensitive) share one computation, and every caller
+        gets its own ReviewTable instead of the shared self.table.
+
+        A ProcessPoolExecutor never gets the corpus itself: a plain
+        TMDBCSVCorpus sends the title plus the CSV path (workers load the
+        file once, bypassing the query cache); any other corpus is scanned
+        here and only the matching reviews are normalized in the pool.
+        """
+        if not isinstance(title, str):
+            raise TypeError("title must be a string")
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        loop = asyncio.get_running_loop()
+        key = title.strip().lower()
+
+        fut = self._inflight.get(key)
+        if fut is None or fut.get_loop() is not loop:
+            if isinstance(executor, ProcessPoolExecutor):
+                fut = asyncio.ensure_future(self._fetch_in_process(title, executor))
+            else:
+                fut = loop.run_in_executor(executor, self._fetch_normalized, title)
+            self._inflight[key] = fut
+
+            def _forget(done: "asyncio.Future[Any]", key: str = key) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            fut.add_done_callback(_forget)
+
+        # shield: one caller being cancelled must not cancel the shared work
+        reviews, rows = await asyncio.shield(fut)
+        return ReviewTable._from_normalized(reviews, rows)
+
+    async def _fetch_in_process(self, title: str, executor: Executor) -> tuple:
+        """_fetch_normalized for process pools: the corpus holds a lock, so it can't be pickled."""
+        import asyncio
+        from functools import partial
+
+        loop = asyncio.get_running_loop()
+        corpus = self._corpus
+        if type(corpus) is TMDBCSVCorpus and not corpus._has_added_rows():
+            return await loop.run_in_executor(executor, partial(_fetch_normalized_in_worker, title, corpus.path))
+        # Other corpora (or a CSV corpus with add_rows) only exist here: scan
+        # in this process and ship just the matches out for normalization.
+        reviews = await loop.run_in_executor(None, self._find_reviews, title)
+        return reviews, await loop.run_in_executor(executor, normalize_tmdb_reviews, reviews)
+
+    def stream(self, title: str, *stages: Any, queue_size: int = 64) -> Any:
+        """
+        The same fetch -> normalize flow as a lazy StreamPipeline, with any
+        extra stages (dedupe, sentiment, export...) appended.
+
+        Example:
+            pipe.stream("Dune", csv_export_stage("dune.csv")).run(threaded=True)
+        """
+        from review_stream import StreamPipeline, corpus_reviews, normalize_stage
+        return StreamPipeline(
+            corpus_reviews(self._corpus, title),
+            [normalize_stage(), *stages],
+            queue_size=queue_size,
+        )
+
     def __str__(self) -> str:
         return f"ReviewPipeline(source={self._corpus.__class__.__name__}, table={self._table})"
 
 
 __all__ = [
     # Original functions
-    "load_db", "fetch_tmdb_movie_reviews", "normalize_tmdb_reviews", "export_reviews_to_csv",
+    "load_db", "iter_db", "fetch_tmdb_movie_reviews", "normalize_tmdb_reviews", "export_reviews_to_csv",
     # ABC and the inheritance
     "BaseMovieCorpus", "TMDBCSVCorpus", "MemoryCorpus",
     # Composition parts
@@ -0,0 +1,266 @@
+"""
+Vote-weighted (Bayesian / IMDb-style) ranking for movies and critic reviews.
+
+Raw vote_average ranking puts 1-vote movies at the top. The weighted score
+shrinks each rating towards a prior mean C in proportion to how few votes
+back it:
+
+    WR = (v / (v + m)) * R + (m / (v + m)) * C
+
+where R is the movie's average rating, v its vote count and m the number of
+votes needed before a rating is trusted. C is the global vote-weighted mean,
+or a per-genre / per-year mean when a grouped prior is requested.
+
+Functions: weighted_scores, top_k_indices
+Class:     WeightedRanker
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+_PRIORS = ("global", "genre", "year")
+
+
+def _primary_genre(row: Dict[str, Any]) -> str:
+    """First listed genre of a TMDB row ("" when missing)."""
+    return _first_genre(row.get("genres"))
+
+
+def _first_genre(genres: Any) -> str:
+    """First entry of a comma-separated genres value ("" when missing)."""
+    if not isinstance(genres, str):
+        return ""
+    return genres.split(",", 1)[0].strip()
+
+
+def _year_of(value: Any) -> Optional[int]:
+    """Year of an int year, a date/datetime, or a string starting with 4 digits."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return int(value[:4]) if len(value) >= 4 and value[:4].isdigit() else None
+    year = getattr(value, "year", None)  # datetime.date, pandas.Timestamp
+    return year if isinstance(year, int) else None
+
+
+def _release_year(row: Dict[str, Any]) -> Optional[int]:
+    """Release year from 'release_year' or the first 4 chars of 'release_date'."""
+    year = row.get("release_year")
+    if year not in (None, ""):
+        try:
+            return int(year)
+        except (TypeError, ValueError):
+            pass
+    d = row.get("release_date")
+    if isinstance(d, str) and len(d) >= 4 and d[:4].isdigit():
+        return int(d[:4])
+    return None
+
+
+def _to_float_array(values: Sequence[Any]) -> np.ndarray:
+    """Convert mixed values (str/None/float) to float64, unparseable -> NaN."""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        out = np.empty(len(values), dtype=float)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def weighted_scores(
+    ratings: Sequence[Any],
+    votes: Sequence[Any],
+    min_votes: Optional[float] = None,
+    quantile: float = 0.9,
+    groups: Optional[Sequence[Hashable]] = None,
+    min_group_size: int = 5,
+) -> np.ndarray:
+    """
+    Compute IMDb-style weighted ratings for a whole corpus in one pass.
+
+    Args:
+        ratings: average rating per movie (vote_average).
+        votes: vote count per movie (vote_count).
+        min_votes: votes needed before a rating is trusted (m). Defaults to
+            the `quantile` of the vote counts.
+        quantile: quantile of vote counts used when min_votes is None.
+        groups: optional group key per movie (genre, year, ...). Each group
+            gets its own prior mean; groups smaller than min_group_size fall
+            back to the global prior.
+        min_group_size: minimum movies a group needs for its own prior.
+
+    Returns:
+        float64 array of weighted scores (NaN where the rating is missing).
+
+    Raises:
+        ValueError: If the inputs have different lengths or bad parameters.
+    """
+    R = _to_float_array(ratings)
+    v = _to_float_array(votes)
+    if R.shape != v.shape:
+        raise ValueError("ratings and votes must have the same length")
+    if not 0.0 <= quantile <= 1.0:
+        raise ValueError("quantile must be between 0 and 1")
+    if R.size == 0:
+        return R
+
+    v = np.where(np.isnan(v) | (v < 0), 0.0, v)
+    valid = ~np.isnan(R)
+
+    if min_votes is None:
+        m = float(np.quantile(v[valid], quantile)) if valid.any() else 0.0
+    else:
+        if min_votes < 0:
+            raise ValueError("min_votes must be non-negative")
+        m = float(min_votes)
+
+    # Vote-weighted prior mean; plain mean if nobody voted at all.
+    Rz = np.where(valid, R, 0.0)
+    vz = np.where(valid, v, 0.0)
+    total_votes = vz.sum()
+    if total_votes > 0:
+        global_c = float((Rz * vz).sum() / total_votes)
+    else:
+        global_c = float(Rz.sum() / max(int(valid.sum()), 1))
+
+    C = np.full(R.shape, global_c)
+    if groups is not None:
+        if len(groups) != R.size:
+            raise ValueError("groups must have the same length as ratings")
+        _, codes = np.unique(np.asarray([str(g) for g in groups]), return_inverse=True)
+        n_groups = int(codes.max()) + 1
+        g_count = np.bincount(codes, weights=valid.astype(float), minlength=n_groups)
+        g_votes = np.bincount(codes, weights=vz, minlength=n_groups)
+        g_sum = np.bincount(codes, weights=Rz * vz, minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            g_c = np.where(g_votes > 0, g_sum / g_votes, global_c)
+        g_c = np.where(g_count >= min_group_size, g_c, global_c)
+        C = g_c[codes]
+
+    denom = v + m
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(denom > 0, (v / denom) * R + (m / denom) * C, C)
+    scores[~valid] = np.nan
+    return scores
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first. NaN scores sort last.
+
+    Uses partial selection (argpartition) so only the top k get fully sorted.
+    """
+    scores = np.asarray(scores, dtype=float)
+    n = scores.size
+    keyed = np.where(np.isnan(scores), -np.inf, scores)
+    if k is None or k >= n:
+        return np.argsort(-keyed, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    part = np.argpartition(-keyed, k - 1)[:k]
+    return part[np.argsort(-keyed[part], kind="stable")]
+
+
+class WeightedRanker:
+    """
+    Ranks movies by vote-weighted score.
+
+    Works on TMDB row dicts (as returned by load_db / BaseMovieCorpus.rows) or
+    on plain rating/vote columns, e.g. from a pandas DataFrame.
+
+    Example:
+        ranker = WeightedRanker(prior="genre")
+        best = ranker.rank_rows(corpus.rows, k=10)
+    """
+
+    def __init__(
+        self,
+        min_votes: Optional[float] = None,
+        quantile: float = 0.9,
+        prior: str = "global",
+        min_group_size: int = 5,
+    ):
+        if prior not in _PRIORS:
+            raise ValueError(f"prior must be one of {_PRIORS}")
+        if min_votes is not None and min_votes < 0:
+            raise ValueError("min_votes must be non-negative")
+        if not 0.0 <= quantile <= 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        self._min_votes = min_votes
+        self._quantile = quantile
+        self._prior = prior
+        self._min_group_size = min_group_size
+
+    @property
+    def prior(self) -> str:
+        return self._prior
+
+    def group_keys(self, rows: Sequence[Dict[str, Any]]) -> Optional[List[Hashable]]:
+        """Prior group key per row, or None for a global prior."""
+        if self._prior == "genre":
+            return [_primary_genre(r) for r in rows]
+        if self._prior == "year":
+            return [_release_year(r) for r in rows]
+        return None
+
+    def value_group_keys(self, values: Sequence[Any]) -> Optional[List[Hashable]]:
+        """
+        Prior group key per raw field value (a genres string for prior="genre",
+        a year, date or date string for prior="year"), or None for a global prior.
+        """
+        if self._prior == "genre":
+            return [_first_genre(v) for v in values]
+        if self._prior == "year":
+            return [_year_of(v) for v in values]
+        return None
+
+    def score_columns(
+        self,
+        ratings: Sequence[Any],
+        votes: Sequence[Any],
+        groups: Optional[Sequence[Hashable]] = None,
+    ) -> np.ndarray:
+        """Weighted score per position of the given rating/vote columns."""
+        return weighted_scores(
+            ratings, votes,
+            min_votes=self._min_votes,
+            quantile=self._quantile,
+            groups=groups,
+            min_group_size=self._min_group_size,
+        )
+
+    def score_rows(self, rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Weighted score per TMDB row dict."""
+        ratings = [r.get("vote_average") for r in rows]
+        votes = [r.get("vote_count") for r in rows]
+        return self.score_columns(ratings, votes, self.group_keys(rows))
+
+    def rank_rows(self, rows: Sequence[Dict[str, Any]], k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Top-k rows (copies) with a 'weighted_score' key, best first."""
+        if not isinstance(rows, (list, tuple)):
+            raise TypeError("rows must be a list or tuple")
+        scores = self.score_rows(rows)
+        out: List[Dict[str, Any]] = []
+        for i in top_k_indices(scores, k):
+            r = dict(rows[i])
+            s = scores[i]
+            r["weighted_score"] = None if np.isnan(s) else float(s)
+            out.append(r)
+        return out
+
+    def __repr__(self) -> str:
+        return (
+            f"WeightedRanker(min_votes={self._min_votes}, quantile={self._quantile}, "
+            f"prior={self._prior!r})"
+        )
+
+
+__all__ = ["weighted_scores", "top_k_indices", "WeightedRanker"]
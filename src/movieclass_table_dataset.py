@@ -8,10 +8,26 @@ Jayden Williams
 
 from __future__ import annotations
 import csv
-from typing import Any, Dict, List, Optional, Sequence
+import os
+import warnings
+from array import array
+from contextlib import contextmanager
+from math import nan
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 #Project 1 functions
 
+@contextmanager
+def _open_rows(path: str, year_min: int, year_max: int, min_votes: int) -> Iterator[Iterable[Dict[str, Any]]]:
+    """Raw row dicts from a CSV, or from just the needed partitions of a year-partitioned directory."""
+    if os.path.isdir(path):
+        from year_partitions import iter_year_range
+        yield iter_year_range(path, year_min, year_max, min_votes)
+        return
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        yield csv.DictReader(f)
+
+
 def load_db(path: str) -> List[Dict[str, Any]]:
     """
     Load TMDB rows from CSV and filter:
@@ -24,31 +40,30 @@ def load_db(path: str) -> List[Dict[str, Any]]:
     if not isinstance(path, str):
         raise TypeError("path must be a string")
 
-    rows: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            year: Optional[int] = None
-            if row.get("release_year"):
-                try:
-                    year = int(row["release_year"])
-                except ValueError:
-                    year = None
-            if year is None and row.get("release_date"):
-                d = row["release_date"]
-                if len(d) >= 4 and d[:4].isdigit():
-                    year = int(d[:4])
+    with _open_rows(path, 2010, 2025, 1) as reader:
+        return [row for row in reader if _keep_row(row, 2010, 2025, 1)]
 
-            # vote_count
-            try:
-                votes = int(row.get("vote_count", "0"))
-            except ValueError:
-                votes = 0
 
-            if year is not None and 2010 <= year <= 2025 and votes >= 1:
-                rows.append(row)
+def _keep_row(row: Dict[str, Any], year_min: int, year_max: int, min_votes: int) -> bool:
+    """load_db's row filter: release year inside [year_min, year_max] and vote_count >= min_votes."""
+    year: Optional[int] = None
+    if row.get("release_year"):
+        try:
+            year = int(row["release_year"])
+        except ValueError:
+            year = None
+    if year is None and row.get("release_date"):
+        d = row["release_date"]
+        if len(d) >= 4 and d[:4].isdigit():
+            year = int(d[:4])
+
+    # vote_count
+    try:
+        votes = int(row.get("vote_count", "0"))
+    except ValueError:
+        votes = 0
 
-    return rows
+    return year is not None and year_min <= year <= year_max and votes >= min_votes
 
 
 def fetch_tmdb_movie_reviews(title: str, movie_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -97,35 +112,39 @@ def normalize_tmdb_reviews(reviews: List[Dict[str, Any]]) -> List[List[Any]]:
     if not isinstance(reviews, list):
         raise TypeError("reviews must be a list")
 
-    out: List[List[Any]] = []
-    for item in reviews:
-        if not isinstance(item, dict):
-            continue
-        author = item.get("author", "TMDB users")
-        content = (item.get("content", "") or "").strip()
-        details = item.get("author_details", {})
-        rating = details.get("rating") if isinstance(details, dict) else None
-        out.append([author, content, rating])
-    return out
+    return [_review_row(item) for item in reviews if isinstance(item, dict)]
+
 
+def _review_row(item: Dict[str, Any]) -> List[Any]:
+    """One review dict as [author, content, rating]."""
+    author = item.get("author", "TMDB users")
+    content = (item.get("content", "") or "").strip()
+    details = item.get("author_details", {})
+    rating = details.get("rating") if isinstance(details, dict) else None
+    return [author, content, rating]
 
-def export_reviews_to_csv(reviews: Sequence[Sequence[Any]], filename: str) -> None:
+
+def export_reviews_to_csv(reviews: Iterable[Sequence[Any]], filename: str) -> None:
     """
     Save normalized rows to CSV with columns: Author, Content, Rating.
+    `reviews` may be any iterable of rows, including a generator.
     """
-    if not isinstance(reviews, (list, tuple)):
-        raise TypeError("reviews must be a list or tuple")
+    if isinstance(reviews, (str, bytes)) or not isinstance(reviews, Iterable):
+        raise TypeError("reviews must be an iterable of rows")
     if not isinstance(filename, str):
         raise TypeError("filename must be a string")
-    if len(reviews) == 0:
+    reviews = iter(reviews)
+    first = next(reviews, None)
+    if first is None:
         raise ValueError("no reviews to export")
 
-    with open(filename, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Author", "Content", "Rating"])
-        for row in reviews:
-            if isinstance(row, (list, tuple)) and len(row) >= 3:
-                writer.writerow([row[0], row[1], row[2]])
+    from itertools import chain
+    from review_export import write_rows
+    write_rows(
+        (row[:3] for row in chain([first], reviews) if isinstance(row, (list, tuple)) and len(row) >= 3),
+        filename,
+        compression=None,
+    )
 
 
 #Project 2 Portion
@@ -152,6 +171,7 @@ class MovieDataset:
         self._year_max = year_max
         self._min_votes = min_votes
         self._rows: Optional[List[Dict[str, Any]]] = None
+        self._indexes: Any = None  # (rows they index, IndexSet)
 
     # Listing all of the Properties
     @property
@@ -199,36 +219,76 @@ class MovieDataset:
     # Behavior
     def load(self) -> List[Dict[str, Any]]:
         """Load filtered rows using load_db(), then apply tighter object filters."""
-        data = load_db(self._path)
-      
-        filtered: List[Dict[str, Any]] = []
-        for row in data:
-            year = None
-            if row.get("release_year"):
-                try:
-                    year = int(row["release_year"])
-                except ValueError:
-                    year = None
-            if year is None and row.get("release_date"):
-                d = row["release_date"]
-                if len(d) >= 4 and d[:4].isdigit():
-                    year = int(d[:4])
-
-            try:
-                votes = int(row.get("vote_count", "0"))
-            except ValueError:
-                votes = 0
-
-            if (
-                year is not None
-                and self._year_min <= year <= self._year_max
-                and votes >= self._min_votes
-            ):
-                filtered.append(row)
+        if os.path.isdir(self._path):
+            # year-partitioned layout: read only partitions inside both load_db's window and ours;
+            # partitions are pruned, not filtered, so rows still go through load_db's checks
+            lo, hi, votes = max(self._year_min, 2010), min(self._year_max, 2025), max(self._min_votes, 1)
+            with _open_rows(self._path, lo, hi, votes) as reader:
+                filtered = [row for row in reader if _keep_row(row, lo, hi, votes)]
+        else:
+            filtered = [row for row in load_db(self._path)
+                        if _keep_row(row, self._year_min, self._year_max, self._min_votes)]
 
         self._rows = filtered
         return [dict(r) for r in self._rows]
 
+    def indexes(self) -> Any:
+        """Range indexes over the loaded rows (see range_index.IndexSet), built once per load."""
+        if self._rows is None:
+            self.load()
+        if self._indexes is None or self._indexes[0] is not self._rows:
+            from range_index import IndexSet
+            self._indexes = (self._rows, IndexSet.build(self._rows))
+        return self._indexes[1]
+
+    def filter(self, genre: Optional[Any] = None, order_by: Optional[str] = None, descending: bool = False,
+               limit: Optional[int] = None, **ranges: Any) -> List[Dict[str, Any]]:
+        """
+        Loaded rows matching numeric ranges and genres, answered from the
+        range indexes instead of a row scan:
+
+            ds.filter(budget=(1_000_000, 50_000_000), runtime=(None, 90))
+            ds.filter(genre=["Horror", "Thriller"], popularity=(10, None), order_by="popularity",
+                      descending=True, limit=10)
+
+        Ranges are inclusive (lo, hi) tuples with None for an open end, or a
+        single value for equality; indexed columns are year, vote_average,
+        vote_count, revenue, budget, runtime and popularity.
+        """
+        indexes = self.indexes()
+        ids = indexes.query(ranges, {"genres": genre} if genre else None, order_by, descending, limit)
+        rows = self._rows or []
+        return [dict(rows[i]) for i in ids.tolist()]
+
+    def where(self, expr: Any, plan: str = "auto") -> List[Dict[str, Any]]:
+        """
+        Loaded rows matching a filter expression (see filter_expr):
+
+            ds.where("genre in ('Drama', 'Thriller') and vote_count >= 100 and runtime < 120")
+
+        The expression is parsed once and run as a row scan, or through the
+        range indexes when indexes() has been built and that is cheaper.
+        """
+        from filter_expr import FilterExpr, compile_filter
+        compiled = expr if isinstance(expr, FilterExpr) else compile_filter(expr)
+        if self._rows is None:
+            self.load()
+        rows = self._rows or []
+        return [dict(rows[i]) for i in compiled.select(rows, self._current_indexes(), plan)]
+
+    def explain(self, expr: Any) -> str:
+        """How where(expr) would run (chosen plan, estimated costs, per-comparison match counts)."""
+        from filter_expr import FilterExpr, compile_filter
+        compiled = expr if isinstance(expr, FilterExpr) else compile_filter(expr)
+        if self._rows is None:
+            self.load()
+        return compiled.explain(len(self._rows or []), self._current_indexes())
+
+    def _current_indexes(self) -> Any:
+        if self._indexes is not None and self._indexes[0] is self._rows:
+            return self._indexes[1]
+        return None
+
     def find_reviews_by_title(self, title: str) -> List[Dict[str, Any]]:
         """Return pseudo-review dicts for movies whose title contains `title`."""
         if self._rows is None:
@@ -248,6 +308,11 @@ class MovieDataset:
         )
 
 
+# Rating kinds, one byte per row next to the float column: values come back
+# with the type they went in with (7 stays 7, NaN stays NaN).
+_FLOAT, _INT, _NONE, _OTHER = 0, 1, 2, 3
+
+
 class ReviewTable:
     """
     Holds review items and provides normalization + CSV export.
@@ -256,55 +321,225 @@ class ReviewTable:
       rt = ReviewTable(reviews_from_dataset)
       rows = rt.normalize()
       rt.export_csv("out.csv")
+
+    Rows are stored column-wise (authors, contents, ratings as a float array
+    plus a one-byte kind per row). Raw items are only held until they are
+    normalized, so repeated add_reviews()/normalize() calls process just
+    the new items and a normalized table keeps no second copy of them.
     """
 
     def __init__(self, reviews: Optional[List[Any]] = None):
-        self._raw: List[Any] = []
-        self._rows: Optional[List[List[Any]]] = None
+        self._pending: List[Any] = []             # raw items not normalized yet
+        self._authors: List[Any] = []
+        self._contents: List[Any] = []
+        self._ratings = array("d")
+        self._kinds = bytearray()                 # _FLOAT/_INT/_NONE/_OTHER per row
+        self._odd_ratings: Dict[int, Any] = {}    # non-numeric ratings by row index
+        self._watermark = 0                       # raw items normalized so far
+        self._normalized = False
         if reviews:
             self.add_reviews(reviews)
 
+    @classmethod
+    def _from_normalized(cls, raw: List[Any], rows: List[List[Any]]) -> "ReviewTable":
+        """Table over already-normalized rows (copies, so callers never share state)."""
+        table = cls()
+        for row in rows:
+            table._append_row(row[0], row[1], row[2])
+        table._watermark = len(raw)
+        table._normalized = True
+        return table
+
     @property
     def raw(self) -> List[Any]:
-        return list(self._raw)
+        """
+        Deprecated: normalized items are no longer kept, so this only holds
+        items added since the last normalize(). Use `rows` instead.
+        """
+        warnings.warn(
+            "ReviewTable.raw is deprecated: it only holds items not normalized yet; use rows",
+            DeprecationWarning, stacklevel=2,
+        )
+        return list(self._pending)
 
     @property
     def rows(self) -> Optional[List[List[Any]]]:
-        return None if self._rows is None else [list(r) for r in self._rows]
+        if not self._is_current():
+            return None
+        return self._materialize()
 
     @property
     def is_empty(self) -> bool:
-        return len(self._raw) == 0
+        return self._watermark == 0 and not self._pending
 
     def add_reviews(self, reviews: List[Any]) -> None:
         if not isinstance(reviews, list):
             raise TypeError("reviews must be a list")
-        self._raw.extend(reviews)
-        self._rows = None  # invalidate cache
+        self._pending.extend(reviews)
+
+    def extend(self, reviews: Iterable[Any]) -> int:
+        """
+        Bulk fast path: append any iterable of review dicts (or normalized
+        rows) and normalize them in the same pass. Returns the number of rows
+        added (malformed items are skipped and not counted).
+        """
+        self._normalize_pending()
+        start = len(self._authors)
+        self._normalize_items(reviews)
+        return len(self._authors) - start
 
     def normalize(self) -> List[List[Any]]:
-        # If already normalized shape, just copy
-        if self._raw and all(isinstance(x, (list, tuple)) and len(x) >= 3 for x in self._raw):
-            self._rows = [list(x) for x in self._raw]
-        else:
-            self._rows = normalize_tmdb_reviews(self._raw)
-        return [list(r) for r in self._rows]
+        self._normalize_pending()
+        return self._materialize()
+
+    def export_csv(
+        self,
+        filename: str,
+        compression: Optional[str] = "infer",
+        shard_rows: Optional[int] = None,
+        shard_key: Any = None,
+        workers: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Export normalized rows (Author, Content, Rating) without building a
+        list of rows first.
+
+        With shard_rows or shard_key, `filename` is an output directory and the
+        rows are split into shards written by `workers` processes; the
+        manifest dict is returned. Otherwise one CSV is written (".gz",
+        ".bz2" and ".xz" suffixes compress it) and None is returned.
+        """
+        from review_export import export_sharded, write_rows
+
+        self._normalize_pending()
+        if not self._authors:
+            raise ValueError("no reviews to export")
+        if shard_rows is None and shard_key is None:
+            write_rows(self._iter_rows(), filename, compression=compression)
+            return None
+        return export_sharded(
+            self._iter_rows(), filename,
+            shard_rows=shard_rows or 1_000_000,
+            key=shard_key,
+            compression=None if compression == "infer" else compression,
+            workers=workers,
+        )
 
-    def export_csv(self, filename: str) -> None:
-        if self._rows is None:
-            self.normalize()
-        export_reviews_to_csv(self._rows or [], filename)
+    def to_columnar(self, path: str, format: str = "auto") -> str:
+        """
+        Save normalized rows as typed columns (author, content, rating).
+
+        The rating column is always float64; int ratings are flagged in a
+        "rating_int" column and non-numeric ones kept as text in a
+        "rating_other" column, each written only when needed.
+        """
+        from columnar_io import write_columnar
+        self._normalize_pending()
+        kinds = self._kinds
+        columns: Dict[str, List[Any]] = {
+            "author": self._authors,
+            "content": self._contents,
+            "rating": [r if k in (_FLOAT, _INT) else None for r, k in zip(self._ratings, kinds)],
+        }
+        schema = {"author": "str", "content": "str", "rating": "float64"}
+        if _INT in kinds:
+            columns["rating_int"] = [k == _INT for k in kinds]
+            schema["rating_int"] = "bool"
+        if self._odd_ratings:
+            other: List[Any] = [None] * len(kinds)
+            for i, r in self._odd_ratings.items():
+                other[i] = str(r)
+            columns["rating_other"] = other
+            schema["rating_other"] = "str"
+        return write_columnar(columns, path, format=format, schema=schema)
+
+    @classmethod
+    def from_columnar(cls, path: str, mmap: bool = True) -> "ReviewTable":
+        """Rebuild a normalized table from to_columnar() output."""
+        from columnar_io import read_columnar
+        data = read_columnar(path, mmap=mmap)
+        names = data.column_names
+        ints = data.values("rating_int") if "rating_int" in names else None
+        other = data.values("rating_other") if "rating_other" in names else None
+        table = cls()
+        table._authors = data.values("author")
+        table._contents = data.values("content")
+        for i, r in enumerate(data.values("rating")):
+            if other is not None and other[i] is not None:
+                r = other[i]
+            elif ints is not None and ints[i]:
+                r = int(r)
+            table._append_rating(r)
+        table._watermark = len(table._authors)
+        table._normalized = True
+        return table
+
+    def _is_current(self) -> bool:
+        return self._normalized and not self._pending
+
+    def _normalize_pending(self) -> None:
+        """Normalize the pending raw items, then drop them."""
+        pending, self._pending = self._pending, []
+        self._normalize_items(pending)
+
+    def _normalize_items(self, items: Iterable[Any]) -> None:
+        # Already-normalized rows are taken as-is, review dicts are converted,
+        # anything else is skipped.
+        n = 0
+        for item in items:
+            n += 1
+            if isinstance(item, (list, tuple)) and len(item) >= 3:
+                self._append_row(item[0], item[1], item[2])
+            elif isinstance(item, dict):
+                self._append_row(*_review_row(item))
+        self._watermark += n
+        self._normalized = True
+
+    def _append_row(self, author: Any, content: Any, rating: Any) -> None:
+        self._authors.append(author)
+        self._contents.append(content)
+        self._append_rating(rating)
+
+    def _append_rating(self, rating: Any) -> None:
+        if isinstance(rating, float):
+            self._kinds.append(_FLOAT)
+            self._ratings.append(rating)
+        elif isinstance(rating, int) and not isinstance(rating, bool):
+            self._kinds.append(_INT)
+            self._ratings.append(rating)
+        elif rating is None:
+            self._kinds.append(_NONE)
+            self._ratings.append(nan)
+        else:
+            self._odd_ratings[len(self._ratings)] = rating
+            self._kinds.append(_OTHER)
+            self._ratings.append(nan)
+
+    def _rating_at(self, i: int) -> Any:
+        kind = self._kinds[i]
+        if kind == _FLOAT:
+            return self._ratings[i]
+        if kind == _INT:
+            return int(self._ratings[i])
+        if kind == _NONE:
+            return None
+        return self._odd_ratings[i]
+
+    def _iter_rows(self) -> Iterator[List[Any]]:
+        for i, (a, c) in enumerate(zip(self._authors, self._contents)):
+            yield [a, c, self._rating_at(i)]
+
+    def _materialize(self) -> List[List[Any]]:
+        return list(self._iter_rows())
 
     def __len__(self) -> int:
-        return 0 if self._rows is None else len(self._rows)
+        return len(self._authors) if self._is_current() else 0
 
     def __str__(self) -> str:
-        n_raw = len(self._raw)
-        n_rows = len(self) if self._rows is not None else 0
-        return f"ReviewTable(raw={n_raw}, rows={n_rows})"
+        return f"ReviewTable(raw={self._watermark + len(self._pending)}, rows={len(self)})"
 
     def __repr__(self) -> str:
-        return f"ReviewTable(raw={len(self._raw)}, rows={(len(self._rows) if self._rows else 0)})"
+        return f"ReviewTable(raw={self._watermark + len(self._pending)}, rows={len(self._authors)})"
 
 
 __all__ = [
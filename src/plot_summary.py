@@ -0,0 +1,238 @@
+"""
+Batch plot summarization for card text.
+
+PlotSummarizer.summarize handles one string per call and cuts mid-word.
+BatchPlotSummarizer works on whole lists or pandas Series of overviews:
+
+- "char":       the original hard cut at max_length (with "...")
+- "word":       cut at the last word boundary that fits
+- "sentence":   keep as many whole leading sentences as fit
+- "extractive": keep the highest-scoring sentences (in story order), scored
+                by corpus term frequency precomputed once with fit()
+
+Every summary is memoized by a hash of the overview, so summarizing the same
+catalogue again costs one dict lookup per movie; the memo can be saved to and
+loaded from JSON between runs.
+
+Functions: truncate_words, truncate_sentences, split_sentences
+Class:     BatchPlotSummarizer
+"""
+
+from __future__ import annotations
+import json
+import re
+from collections import Counter
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List
+
+MODES = ("char", "word", "sentence", "extractive")
+ELLIPSIS = "..."
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_TOKEN = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an the and or but of to in on at for with by from as is are was were be been "
+    "his her their its this that these those he she they it who whom which when where "
+    "while into after before than then so not no has have had will would can".split()
+)
+
+
+def truncate_chars(text: str, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    if max_length <= len(ELLIPSIS):  # no room for the ellipsis: plain cut
+        return text[:max_length]
+    return text[:max_length - len(ELLIPSIS)] + ELLIPSIS
+
+
+def truncate_words(text: str, max_length: int) -> str:
+    """Shorten text to max_length characters without splitting a word."""
+    if len(text) <= max_length:
+        return text
+    if max_length <= len(ELLIPSIS):
+        return text[:max_length]
+    limit = max_length - len(ELLIPSIS)
+    cut = text[:limit]
+    if not text[limit].isspace():  # the cut lands inside a word: drop the partial word
+        parts = cut.rsplit(None, 1)
+        if len(parts) == 2:
+            cut = parts[0]
+    return cut.rstrip(" ,;:-") + ELLIPSIS
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+def truncate_sentences(text: str, max_length: int) -> str:
+    """Keep whole leading sentences that fit; fall back to word truncation."""
+    if len(text) <= max_length:
+        return text
+    kept = ""
+    for sentence in split_sentences(text):
+        candidate = f"{kept} {sentence}" if kept else sentence
+        if len(candidate) > max_length:
+            break
+        kept = candidate
+    return kept or truncate_words(text, max_length)
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BatchPlotSummarizer:
+    """
+    Summarize many plot overviews at once.
+
+    Args:
+        max_length: maximum characters per summary.
+        mode: one of "char", "word", "sentence", "extractive".
+        max_cache: memo entries kept (oldest dropped first); 0 disables the memo.
+
+    Example:
+        summarizer = BatchPlotSummarizer(120, mode="extractive").fit(df["overview"])
+        df["card"] = summarizer.summarize_many(df["overview"])
+    """
+
+    def __init__(self, max_length: int = 100, mode: str = "word", max_cache: int = 1_000_000):
+        if not isinstance(max_length, int):
+            raise TypeError("Max length must be an integer.")
+        if max_length <= 0:
+            raise ValueError("Max length must be greater than 0.")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.max_length = max_length
+        self.mode = mode
+        self.max_cache = max_cache
+        self._weights: Dict[str, float] = {}
+        self._fitted = False
+        self._cache: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # Corpus statistics
+
+    def fit(self, plots: Iterable[Any]) -> "BatchPlotSummarizer":
+        """Precompute normalized corpus term frequencies for extractive mode."""
+        counts: Counter = Counter()
+        for plot in plots:
+            if isinstance(plot, str):
+                counts.update(_tokens(plot))
+        top = max(counts.values(), default=1)
+        self._weights = {term: n / top for term, n in counts.items()}
+        self._fitted = True  # even with an empty vocabulary, so callers don't refit every time
+        self._cache.clear()  # extractive summaries depend on the statistics
+        return self
+
+    @property
+    def fitted(self) -> bool:
+        return self._fitted
+
+    def _score(self, sentence: str, weights: Dict[str, float]) -> float:
+        toks = _tokens(sentence)
+        return sum(weights.get(t, 0.0) for t in toks) / len(toks) if toks else 0.0
+
+    def _extract(self, text: str) -> str:
+        if len(text) <= self.max_length:
+            return text
+        sentences = split_sentences(text)
+        weights = self._weights
+        if not weights:  # not fitted: fall back to the document's own term counts
+            counts = Counter(_tokens(text))
+            top = max(counts.values(), default=1)
+            weights = {t: n / top for t, n in counts.items()}
+        ranked = sorted(range(len(sentences)), key=lambda i: (-self._score(sentences[i], weights), i))
+        chosen: List[int] = []
+        used = 0
+        for i in ranked:
+            extra = len(sentences[i]) + (1 if chosen else 0)
+            if used + extra <= self.max_length:
+                chosen.append(i)
+                used += extra
+        if not chosen:
+            return truncate_words(sentences[ranked[0]], self.max_length)
+        return " ".join(sentences[i] for i in sorted(chosen))
+
+    # Summaries
+
+    def _compute(self, text: str) -> str:
+        if self.mode == "char":
+            return truncate_chars(text, self.max_length)
+        if self.mode == "word":
+            return truncate_words(text, self.max_length)
+        if self.mode == "sentence":
+            return truncate_sentences(text, self.max_length)
+        return self._extract(text)
+
+    def _key(self, text: str) -> str:
+        return blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+    def summarize(self, plot: Any) -> Any:
+        """Summary of one overview; non-strings (None, NaN) pass through unchanged."""
+        if not isinstance(plot, str):
+            return plot
+        if not self.max_cache:
+            return self._compute(plot)
+        key = self._key(plot)
+        summary = self._cache.get(key)
+        if summary is not None:
+            self.hits += 1
+            return summary
+        self.misses += 1
+        summary = self._compute(plot)
+        if len(self._cache) >= self.max_cache:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = summary
+        return summary
+
+    def summarize_many(self, plots: Any) -> Any:
+        """
+        Summarize a list/iterable (returns a list) or a pandas Series (returns
+        a Series with the same index). Each distinct overview is summarized once.
+        """
+        if hasattr(plots, "map") and hasattr(plots, "index"):  # pandas Series
+            uniques = plots.dropna().unique()
+            lookup = {p: self.summarize(p) for p in uniques}
+            return plots.map(lookup)
+        return [self.summarize(p) for p in plots]
+
+    # Memo persistence
+
+    def fingerprint(self) -> str:
+        """
+        Hash of everything a summary depends on: mode, max_length, the
+        sentence/token rules and, in extractive mode, the fitted weights.
+        """
+        h = blake2b(digest_size=12)
+        h.update(json.dumps([self.mode, self.max_length, _SENTENCE_END.pattern,
+                             _TOKEN.pattern, sorted(_STOPWORDS)]).encode("utf-8"))
+        if self.mode == "extractive":
+            h.update(json.dumps(sorted(self._weights.items())).encode("utf-8"))
+        return h.hexdigest()
+
+    def save_cache(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"mode": self.mode, "max_length": self.max_length,
+                       "fingerprint": self.fingerprint(), "summaries": self._cache}, f)
+
+    def load_cache(self, path: str) -> int:
+        """Load a saved memo made with the same settings and corpus weights; returns entries loaded."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("fingerprint") != self.fingerprint():
+            return 0
+        self._cache.update(data.get("summaries", {}))
+        return len(data.get("summaries", {}))
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def __repr__(self) -> str:
+        return (f"BatchPlotSummarizer(max_length={self.max_length}, mode={self.mode!r}, "
+                f"fitted={self.fitted}, cached={len(self._cache)})")
+
+
+__all__ = ["MODES", "truncate_chars", "truncate_words", "truncate_sentences", "split_sentences",
+           "BatchPlotSummarizer"]
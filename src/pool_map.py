@@ -0,0 +1,48 @@
+"""
+Order-preserving map over a process pool with bounded look-ahead.
+
+batch_clean, keyword_graph and review_export all feed a stream of work
+items to a ProcessPoolExecutor and consume the results in input order.
+pool.map() would submit the whole stream up front; ordered_map keeps at
+most 2*workers tasks in flight, so memory stays flat however long the
+stream is, and runs inline when there is no pool:
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in ordered_map(pool, workers, fn, items):
+            ...
+
+Functions: ordered_map
+"""
+
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional
+
+
+def ordered_map(pool: Optional[Executor], workers: int, fn: Callable[[Any], Any],
+                items: Iterable[Any]) -> Iterator[Any]:
+    """
+    map(fn, items) in `pool`, yielding results in input order with at most
+    2*workers tasks submitted ahead of the consumer; inline map without a pool.
+    """
+    if pool is None:
+        yield from map(fn, items)
+        return
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("workers must be a positive int")
+    window = 2 * workers
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:  # consumer stopped early or a task failed
+            fut.cancel()
+
+
+__all__ = ["ordered_map"]
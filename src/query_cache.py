@@ -0,0 +1,177 @@
+"""
+LRU/TTL result cache for corpus queries.
+
+QueryCache maps a query key to its result, bounded by entry count and by an
+estimate of the results' memory, with least-recently-used eviction and an
+optional time-to-live. Every entry remembers the data generation it was
+computed from; BaseMovieCorpus bumps its generation on reload and when rows
+are added, so stale results are dropped on the next lookup automatically.
+
+Plug one into a corpus or pipeline:
+
+    cache = QueryCache(max_entries=10_000, max_bytes=256 * 2**20, ttl=600)
+    corpus.set_cache(cache)
+    pipeline = ReviewPipeline(corpus, cache=cache)
+    cache.stats()   # {"hits": ..., "misses": ..., "hit_rate": ...}
+
+Class: QueryCache
+"""
+
+from __future__ import annotations
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """Rough deep size in bytes of lists/tuples/dicts of plain values."""
+    size = sys.getsizeof(obj)
+    if _depth > 3:
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _depth + 1) for v in obj)
+    return size
+
+
+def copy_result(value: Any) -> Any:
+    """Copy a cached result one level into its rows so callers can't mutate the cache."""
+    if isinstance(value, list):
+        return [dict(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v for v in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with optional TTL and memory bound.
+
+    Args:
+        max_entries: most results kept (None for no count limit).
+        max_bytes: bound on the estimated size of all results (None for none).
+        ttl: seconds a result stays valid (None = until evicted/invalidated).
+        copy: applied to results on the way out (default copy_result; None to share).
+        clock: time source, for tests.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        copy: Optional[Callable[[Any], Any]] = copy_result,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries is not None and (not isinstance(max_entries, int) or max_entries <= 0):
+            raise ValueError("max_entries must be a positive int or None")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError("max_bytes must be a positive int or None")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive or None")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._copy = copy
+        self._clock = clock
+        # key -> (value, size, expires_at, generation)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Optional[float], Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, generation: Any = None, default: Any = None) -> Any:
+        """Cached result for key, or default when missing, expired or from another generation."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, expires, gen = entry
+                if gen != generation:
+                    self._drop(key)
+                    self._invalidations += 1
+                elif expires is not None and self._clock() >= expires:
+                    self._drop(key)
+                    self._expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._copy(value) if self._copy else value
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, generation: Any = None) -> bool:
+        """Store a result; returns False if it alone exceeds max_bytes."""
+        size = estimate_size(value) if self._max_bytes is not None else 0
+        if self._max_bytes is not None and size > self._max_bytes:
+            return False
+        expires = self._clock() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, expires, generation)
+            self._bytes += size
+            while (self._max_entries is not None and len(self._entries) > self._max_entries) or \
+                    (self._max_bytes is not None and self._bytes > self._max_bytes):
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+        return True
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], generation: Any = None) -> Any:
+        """Cached result, or compute(), store and return it."""
+        value = self.get(key, generation, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        self.put(key, value, generation)
+        return self._copy(value) if self._copy else value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Drop every entry (or those whose key matches predicate); returns how many."""
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for k in keys:
+                self._drop(k)
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"QueryCache(entries={len(self)}, max_entries={self._max_entries}, "
+                f"max_bytes={self._max_bytes}, ttl={self._ttl})")
+
+
+__all__ = ["QueryCache", "estimate_size", "copy_result"]
@@ -0,0 +1,478 @@
+"""
+Local query server over a warm TMDB corpus.
+
+Loading the TMDB CSV takes seconds; answering a question about it once it is
+in memory takes milliseconds. CorpusService loads a TMDBCSVCorpus once,
+keeps per-column arrays and a title index next to it, and reloads in the
+background when the CSV changes on disk (requests keep using the previous
+snapshot until the new one is ready). serve() exposes it as HTTP/JSON on
+localhost or a Unix socket; CorpusClient is the matching thin client.
+
+Endpoints (GET, query-string parameters, JSON responses):
+    /health                         rows, generation, path, load time
+    /titles?q=dune&limit=20         movies whose title contains q
+    /reviews?title=Dune             normalized review rows (ReviewPipeline)
+    /filter?genre=Drama&year_min=2015&min_votes=100&min_rating=7&fields=title,vote_average
+    /top?k=10&by=weighted&genre=Action        by: weighted or a numeric column
+    /aggregate?column=runtime&by=genre        by: genre, year or all
+
+Usage:
+    python src/query_server.py TMDB_movie_dataset_v13.csv --port 8765
+    python src/query_server.py TMDB_movie_dataset_v13.csv --socket /tmp/tmdb.sock
+
+    client = CorpusClient("http://127.0.0.1:8765")
+    client.top(k=5, by="weighted", genre="Drama")
+
+Classes:   CorpusService, CorpusClient, UnknownEndpoint
+Functions: make_server, serve
+"""
+
+from __future__ import annotations
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from lazy_imports import lazy_import
+from movie_oop_core import BaseMovieCorpus, ReviewPipeline, TMDBCSVCorpus, _row_year
+from movie_ranking import WeightedRanker, _to_float_array, top_k_indices
+from rating_stats import RatingStats
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+
+def _genres(row: Dict[str, Any]) -> List[str]:
+    genres = row.get("genres") or ""
+    return [g.strip().lower() for g in genres.split(",") if g.strip()] if isinstance(genres, str) else []
+
+
+def _clean(value: Any) -> Any:
+    """JSON-safe value (NaN/inf -> None, numpy scalars -> Python)."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _jsonable(value: Any) -> Any:
+    """_clean applied through dicts and lists, so a response never carries bare NaN."""
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return _clean(value)
+
+
+class UnknownEndpoint(KeyError):
+    """Raised by CorpusService.handle for a path that is not one of ROUTES."""
+
+
+class _Snapshot:
+    """One loaded generation of the corpus plus the arrays queries run on."""
+
+    def __init__(self, corpus: BaseMovieCorpus, generation: int, stamp: Tuple[int, int]):
+        corpus.ensure_loaded()
+        self.corpus = corpus
+        self.rows: List[Dict[str, Any]] = corpus._rows
+        self.generation = generation
+        self.stamp = stamp
+        self.loaded_at = time.time()
+
+        self.titles = [(r.get("title") or "").strip().lower() for r in self.rows]
+        self.years = np.array([_row_year(r) or -1 for r in self.rows], dtype=np.int64)
+        genre_index: Dict[str, List[int]] = {}
+        for i, row in enumerate(self.rows):
+            for g in _genres(row):
+                genre_index.setdefault(g, []).append(i)
+        self.genres = {g: np.array(ix, dtype=np.int64) for g, ix in genre_index.items()}
+        self._columns: Dict[str, Any] = {}
+        self._aggregates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def column(self, name: str) -> Any:
+        """Float array of a column (built once per snapshot)."""
+        arr = self._columns.get(name)
+        if arr is None:
+            if name == "weighted":
+                arr = WeightedRanker().score_columns(self.column("vote_average"), self.column("vote_count"))
+            else:
+                if self.rows and name not in self.rows[0]:
+                    raise ValueError(f"unknown column {name!r}")
+                arr = _to_float_array([r.get(name) for r in self.rows])
+            with self._lock:
+                self._columns[name] = arr
+        return arr
+
+    def mask(self, params: Dict[str, str]) -> Any:
+        """Boolean mask of rows matching the filter parameters."""
+        keep = np.ones(len(self.rows), dtype=bool)
+        if params.get("genre"):
+            genre_mask = np.zeros(len(self.rows), dtype=bool)
+            for g in params["genre"].split(","):
+                ix = self.genres.get(g.strip().lower())
+                if ix is not None:
+                    genre_mask[ix] = True
+            keep &= genre_mask
+        if params.get("year_min"):
+            keep &= self.years >= int(params["year_min"])
+        if params.get("year_max"):
+            keep &= (self.years <= int(params["year_max"])) & (self.years >= 0)
+        if params.get("min_votes"):
+            keep &= self.column("vote_count") >= float(params["min_votes"])
+        if params.get("min_rating"):
+            keep &= self.column("vote_average") >= float(params["min_rating"])
+        if params.get("max_rating"):
+            keep &= self.column("vote_average") <= float(params["max_rating"])
+        if params.get("q"):
+            q = params["q"].strip().lower()
+            keep &= np.fromiter((q in t for t in self.titles), dtype=bool, count=len(self.titles))
+        return keep
+
+    def aggregate(self, column: str, by: str) -> Dict[str, Any]:
+        key = (column, by)
+        cached = self._aggregates.get(key)
+        if cached is not None:
+            return cached
+        values = self.column(column)
+        if by == "all":
+            groups = {"all": np.arange(len(self.rows))}
+        elif by == "genre":
+            groups = self.genres
+        elif by == "year":
+            groups = {int(y): np.flatnonzero(self.years == y) for y in np.unique(self.years) if y >= 0}
+        else:
+            raise ValueError("by must be 'genre', 'year' or 'all'")
+        out = {}
+        for g, ix in sorted(groups.items(), key=lambda kv: str(kv[0])):
+            stats = RatingStats().update_array(values[ix])
+            if stats.count:
+                out[str(g)] = {k: _clean(v) for k, v in stats.summary().items()}
+        with self._lock:
+            self._aggregates[key] = out
+        return out
+
+
+class CorpusService:
+    """
+    Keeps one warm corpus snapshot and reloads it when the CSV changes.
+
+    Args:
+        path: TMDB CSV path.
+        poll_interval: seconds between mtime checks (0 disables the watcher).
+        corpus_factory: builds the corpus for a path (default TMDBCSVCorpus).
+    """
+
+    def __init__(self, path: str, poll_interval: float = 2.0,
+                 corpus_factory: Callable[[str], BaseMovieCorpus] = TMDBCSVCorpus):
+        if not isinstance(path, str) or not path.strip():
+            raise ValueError("path must be a non-empty string")
+        self._path = path
+        self._poll_interval = poll_interval
+        self._factory = corpus_factory
+        self._generation = 0
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+        self._snapshot = self._build()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def snapshot(self) -> _Snapshot:
+        return self._snapshot
+
+    def _stamp(self) -> Tuple[int, int]:
+        st = os.stat(self._path)
+        return st.st_mtime_ns, st.st_size
+
+    def _build(self) -> _Snapshot:
+        stamp = self._stamp()
+        self._generation += 1
+        return _Snapshot(self._factory(self._path), self._generation, stamp)
+
+    def reload(self) -> bool:
+        """Load the CSV again and swap it in; on error the old snapshot stays."""
+        with self._reload_lock:
+            try:
+                self._snapshot = self._build()
+                self.last_error = None
+                return True
+            except Exception as e:  # csv.Error, KeyError, ... from a half-written file
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("reload of %s failed, keeping the previous snapshot: %s", self._path, self.last_error)
+                return False
+
+    def check_for_changes(self) -> bool:
+        """Reload if the file's mtime or size changed; returns whether it reloaded."""
+        try:
+            changed = self._stamp() != self._snapshot.stamp
+        except OSError:
+            return False
+        return self.reload() if changed else False
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            try:
+                self.check_for_changes()
+            except Exception:  # never let one bad poll end the watcher thread
+                logger.exception("corpus watcher: checking %s failed", self._path)
+
+    def start(self) -> "CorpusService":
+        """Start the background file watcher."""
+        if self._poll_interval and self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="corpus-watcher", daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    # Queries
+
+    def health(self, params: Dict[str, str]) -> Dict[str, Any]:
+        snap = self._snapshot
+        return {"path": self._path, "rows": len(snap.rows), "generation": snap.generation,
+                "loaded_at": snap.loaded_at, "last_error": self.last_error}
+
+    def titles(self, params: Dict[str, str]) -> Dict[str, Any]:
+        q = params.get("q", "").strip().lower()
+        if not q:
+            raise ValueError("q is required")
+        limit = int(params.get("limit", 20))
+        snap = self._snapshot
+        hits = [i for i, t in enumerate(snap.titles) if q in t]
+        hits.sort(key=lambda i: (snap.titles[i] != q, i))  # exact title first
+        return {"count": len(hits), "rows": [snap.rows[i] for i in hits[:limit]]}
+
+    def reviews(self, params: Dict[str, str]) -> Dict[str, Any]:
+        title = params.get("title", "")
+        if not title.strip():
+            raise ValueError("title is required")
+        table = ReviewPipeline(self._snapshot.corpus).build_reviews(title)
+        rows = [[_clean(v) for v in row] for row in table.normalize()]
+        return {"count": len(rows), "rows": rows}
+
+    def _project(self, rows: List[Dict[str, Any]], params: Dict[str, str]) -> List[Dict[str, Any]]:
+        fields = [f for f in params.get("fields", "").split(",") if f]
+        if not fields:
+            return rows
+        return [{f: r.get(f) for f in fields} for r in rows]
+
+    def filter(self, params: Dict[str, str]) -> Dict[str, Any]:
+        snap = self._snapshot
+        ix = np.flatnonzero(snap.mask(params))
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 50))
+        rows = [snap.rows[i] for i in ix[offset:offset + limit]]
+        return {"count": int(ix.size), "rows": self._project(rows, params)}
+
+    def top(self, params: Dict[str, str]) -> Dict[str, Any]:
+        snap = self._snapshot
+        by = params.get("by", "weighted")
+        k = int(params.get("k", 10))
+        scores = snap.column(by)
+        ix = np.flatnonzero(snap.mask(params))
+        order = ix[top_k_indices(scores[ix], k)]
+        rows = self._project([snap.rows[i] for i in order], params)
+        return {"by": by, "rows": [dict(r, score=_clean(scores[i])) for r, i in zip(rows, order)]}
+
+    def aggregate(self, params: Dict[str, str]) -> Dict[str, Any]:
+        column = params.get("column", "vote_average")
+        by = params.get("by", "genre")
+        return {"column": column, "by": by, "groups": self._snapshot.aggregate(column, by)}
+
+    ROUTES = ("health", "titles", "reviews", "filter", "top", "aggregate")
+
+    def handle(self, endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
+        if endpoint not in self.ROUTES:
+            raise UnknownEndpoint(endpoint)
+        return getattr(self, endpoint)(params)
+
+
+# HTTP transport
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "TMDBQueryServer/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/") or "health"
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        started = time.perf_counter()
+        try:
+            status, body = 200, self.server.service.handle(endpoint, params)
+        except UnknownEndpoint:
+            status, body = 404, {"error": f"unknown endpoint {endpoint!r}"}
+        except (TypeError, ValueError) as e:
+            status, body = 400, {"error": str(e)}
+        except Exception as e:  # keep serving; report the failure to this caller
+            status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+        if isinstance(body, dict):
+            body["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        data = json.dumps(_jsonable(body), default=str, allow_nan=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service: CorpusService, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                socket_path: Optional[str] = None, verbose: bool = False) -> socketserver.BaseServer:
+    """Threaded HTTP server for `service` on host:port, or on a Unix socket if socket_path is given."""
+    if socket_path:
+        server: socketserver.BaseServer = _UnixHTTPServer(socket_path, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def serve(path: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+          poll_interval: float = 2.0, verbose: bool = False) -> None:
+    """Load the corpus once and answer queries until interrupted."""
+    service = CorpusService(path, poll_interval=poll_interval).start()
+    server = make_server(service, host, port, socket_path, verbose)
+    where = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"serving {len(service.snapshot.rows)} movies from {path} on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# Client
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class CorpusClient:
+    """
+    Thin client for the query server.
+
+    Example:
+        client = CorpusClient("http://127.0.0.1:8765")   # or CorpusClient(socket_path="/tmp/tmdb.sock")
+        client.titles("dune")
+        client.filter(genre="Drama", year_min=2015, fields="title,vote_average")
+    """
+
+    def __init__(self, url: str = f"http://127.0.0.1:{DEFAULT_PORT}", socket_path: Optional[str] = None,
+                 timeout: float = 30.0):
+        parts = urlsplit(url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or DEFAULT_PORT
+        self._socket_path = socket_path
+        self._timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._socket_path:
+            return _UnixHTTPConnection(self._socket_path, self._timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+    def get(self, endpoint: str, **params: Any) -> Dict[str, Any]:
+        query = urlencode({k: v for k, v in params.items() if v is not None})
+        conn = self._connection()
+        try:
+            conn.request("GET", f"/{endpoint}" + (f"?{query}" if query else ""))
+            resp = conn.getresponse()
+            body = json.loads(resp.read().decode("utf-8"))
+        finally:
+            conn.close()
+        if resp.status == 404:
+            raise KeyError(body.get("error"))
+        if resp.status == 400:
+            raise ValueError(body.get("error"))
+        if resp.status != 200:
+            raise RuntimeError(body.get("error"))
+        return body
+
+    def health(self) -> Dict[str, Any]:
+        return self.get("health")
+
+    def titles(self, q: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return self.get("titles", q=q, limit=limit)["rows"]
+
+    def reviews(self, title: str) -> List[List[Any]]:
+        return self.get("reviews", title=title)["rows"]
+
+    def filter(self, **params: Any) -> List[Dict[str, Any]]:
+        return self.get("filter", **params)["rows"]
+
+    def top(self, k: int = 10, by: str = "weighted", **params: Any) -> List[Dict[str, Any]]:
+        return self.get("top", k=k, by=by, **params)["rows"]
+
+    def aggregate(self, column: str = "vote_average", by: str = "genre") -> Dict[str, Any]:
+        return self.get("aggregate", column=column, by=by)["groups"]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve TMDB corpus queries over HTTP/JSON.")
+    parser.add_argument("path", help="TMDB CSV file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", dest="socket_path", help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--poll", type=float, default=2.0, help="seconds between reload checks (0 = off)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    serve(args.path, args.host, args.port, args.socket_path, args.poll, args.verbose)
+
+
+__all__ = ["CorpusService", "CorpusClient", "UnknownEndpoint", "make_server", "serve"]
+
+
+if __name__ == "__main__":
+    main()
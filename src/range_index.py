@@ -0,0 +1,363 @@
+"""
+Sorted range indexes over the numeric TMDB columns.
+
+Range filters ("budget between X and Y", "runtime under 90", "popularity
+above P") used to parse every row's strings and compare them one by one. A
+RangeIndex keeps one column's values sorted, next to the row ids they came
+from. A range query then needs only two binary searches (np.searchsorted),
+and the matching ids are a contiguous slice already in value order, which
+also gives ordered iteration. TermIndex keeps row-id postings for
+comma-list columns such as genres. IndexSet holds both kinds for a row
+list and answers combined filters by intersecting row-id sets, smallest
+first:
+
+    indexes = IndexSet.build(rows)
+    ids = indexes.query({"budget": (1e6, 5e7), "runtime": (None, 90)}, terms={"genres": ["Horror"]},
+                        order_by="popularity", descending=True, limit=20)
+    [rows[i] for i in ids]
+
+Row ids are positions in the row list. IndexSet is also an ingest
+observer (add_row), so a corpus fills it during load and keeps it current
+as rows are appended. New values wait in a small buffer that is merged
+into the sorted arrays on the next query. Missing or non-numeric cells are
+not indexed, so they never match a range.
+
+Classes: RangeIndex, TermIndex, IndexSet
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+NUMERIC_COLUMNS = ("year", "vote_average", "vote_count", "revenue", "budget", "runtime", "popularity")
+TERM_COLUMNS = ("genres",)
+
+Range = Union[Tuple[Optional[float], Optional[float]], float]
+
+
+def _number(value: Any) -> float:
+    """Float value of a cell; NaN when it is missing or not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _value_getter(column: str) -> Callable[[Dict[str, Any]], float]:
+    """Row -> indexed value of a column ("year" comes from release_year/release_date)."""
+    if column == "year":
+        from movie_oop_core import _row_year
+
+        def year(row: Dict[str, Any]) -> float:
+            y = _row_year(row)
+            return np.nan if y is None else float(y)
+        return year
+    return lambda row: _number(row.get(column))
+
+
+def _frame_values(df: Any, column: str) -> np.ndarray:
+    """Float array of a DataFrame column (NaN where missing); "year" as _row_year derives it."""
+    import pandas as pd
+
+    if column != "year":
+        return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    year = np.full(len(df), np.nan)
+    if "release_date" in df.columns:
+        dates = df["release_date"].astype("string")
+        year = pd.to_numeric(dates.str.slice(0, 4).where(dates.str.match(r"^\d{4}")), errors="coerce")
+        year = year.to_numpy(dtype=float, na_value=np.nan)
+    if "release_year" in df.columns:
+        given = pd.to_numeric(df["release_year"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        year = np.where(np.isnan(given), year, given)
+    return year
+
+
+def _terms(value: Any) -> List[str]:
+    if not isinstance(value, str):
+        return []
+    return [t.strip().lower() for t in value.split(",") if t.strip()]
+
+
+class RangeIndex:
+    """
+    One numeric column as a sorted value array plus the row ids in the same
+    order. Queries are binary searches; equal values keep row-id order.
+    """
+
+    def __init__(self, column: str, values: Any = (), ids: Any = ()):
+        values = np.asarray(values, dtype=np.float64)
+        ids = np.asarray(ids, dtype=np.int64)
+        if values.shape != ids.shape:
+            raise ValueError("values and ids must have the same length")
+        keep = ~np.isnan(values)
+        order = np.argsort(values[keep], kind="stable")
+        self.column = column
+        self._values = values[keep][order]
+        self._ids = ids[keep][order]
+        self._pending_values: List[float] = []
+        self._pending_ids: List[int] = []
+
+    def add(self, row_id: int, value: Any) -> None:
+        """Index one more row (missing values are skipped)."""
+        value = _number(value)
+        if value == value:
+            self._pending_values.append(value)
+            self._pending_ids.append(row_id)
+
+    def _flush(self) -> None:
+        if not self._pending_ids:
+            return
+        values = np.concatenate((self._values, np.asarray(self._pending_values, dtype=np.float64)))
+        ids = np.concatenate((self._ids, np.asarray(self._pending_ids, dtype=np.int64)))
+        order = np.argsort(values, kind="stable")  # already-sorted prefix: mostly a merge
+        self._values, self._ids = values[order], ids[order]
+        self._pending_values, self._pending_ids = [], []
+
+    def _bounds(self, lo: Optional[float], hi: Optional[float], lo_inclusive: bool, hi_inclusive: bool) -> Tuple[int, int]:
+        self._flush()
+        start = 0 if lo is None else int(np.searchsorted(self._values, lo, side="left" if lo_inclusive else "right"))
+        stop = len(self._values) if hi is None else int(
+            np.searchsorted(self._values, hi, side="right" if hi_inclusive else "left"))
+        return start, max(start, stop)
+
+    def between(self, lo: Optional[float] = None, hi: Optional[float] = None,
+                lo_inclusive: bool = True, hi_inclusive: bool = True) -> np.ndarray:
+        """Row ids with lo <= value <= hi (None = open end), in ascending value order."""
+        start, stop = self._bounds(lo, hi, lo_inclusive, hi_inclusive)
+        return self._ids[start:stop]
+
+    def count(self, lo: Optional[float] = None, hi: Optional[float] = None,
+              lo_inclusive: bool = True, hi_inclusive: bool = True) -> int:
+        """How many rows fall in the range, without materializing them (two bisections)."""
+        start, stop = self._bounds(lo, hi, lo_inclusive, hi_inclusive)
+        return stop - start
+
+    def ordered(self, descending: bool = False) -> np.ndarray:
+        """Every indexed row id sorted by value."""
+        self._flush()
+        return self._ids[::-1] if descending else self._ids
+
+    def iter_ordered(self, descending: bool = False, lo: Optional[float] = None,
+                     hi: Optional[float] = None) -> Iterator[Tuple[float, int]]:
+        """(value, row id) pairs in value order, optionally within a range."""
+        start, stop = self._bounds(lo, hi, True, True)
+        values, ids = self._values[start:stop], self._ids[start:stop]
+        if descending:
+            values, ids = values[::-1], ids[::-1]
+        for v, i in zip(values.tolist(), ids.tolist()):
+            yield v, i
+
+    @property
+    def min(self) -> Optional[float]:
+        self._flush()
+        return float(self._values[0]) if len(self._values) else None
+
+    @property
+    def max(self) -> Optional[float]:
+        self._flush()
+        return float(self._values[-1]) if len(self._values) else None
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending_ids)
+
+    def __repr__(self) -> str:
+        return f"RangeIndex({self.column!r}, rows={len(self)})"
+
+
+class TermIndex:
+    """Row-id postings per lowercased term of a comma-list column (e.g. genres)."""
+
+    def __init__(self, column: str):
+        self.column = column
+        self._postings: Dict[str, List[int]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def add(self, row_id: int, value: Any) -> None:
+        for term in dict.fromkeys(_terms(value)):
+            self._postings.setdefault(term, []).append(row_id)
+            self._arrays.pop(term, None)
+
+    def ids(self, terms: Union[str, Sequence[str]]) -> np.ndarray:
+        """Sorted row ids having any of the terms (case-insensitive)."""
+        if isinstance(terms, str):
+            terms = [terms]
+        parts = []
+        for term in {t.strip().lower() for t in terms}:
+            array = self._arrays.get(term)
+            if array is None:
+                array = self._arrays[term] = np.asarray(self._postings.get(term, ()), dtype=np.int64)
+            parts.append(array)
+        parts = [p for p in parts if len(p)]
+        if len(parts) < 2:
+            return parts[0] if parts else np.empty(0, dtype=np.int64)
+        member = np.zeros(max(int(p.max()) for p in parts) + 1, dtype=bool)
+        for p in parts:
+            member[p] = True
+        return np.flatnonzero(member)
+
+    def count(self, terms: Union[str, Sequence[str]]) -> int:
+        if isinstance(terms, str):
+            return len(self._postings.get(terms.strip().lower(), ()))
+        return len(self.ids(terms))
+
+    @property
+    def terms(self) -> List[str]:
+        return sorted(self._postings)
+
+    def __repr__(self) -> str:
+        return f"TermIndex({self.column!r}, terms={len(self._postings)})"
+
+
+class IndexSet:
+    """
+    Range indexes for numeric columns and term indexes for list columns over
+    one row list (row id = position).
+
+    Args:
+        columns: numeric columns to index ("year" is derived from the release date).
+        term_columns: comma-list columns to index by term.
+    """
+
+    def __init__(self, columns: Sequence[str] = NUMERIC_COLUMNS, term_columns: Sequence[str] = TERM_COLUMNS):
+        self._ranges = {c: RangeIndex(c) for c in columns}
+        self._getters = {c: _value_getter(c) for c in columns}
+        self._terms = {c: TermIndex(c) for c in term_columns}
+        self._rows = 0
+
+    @classmethod
+    def build(cls, rows: Sequence[Dict[str, Any]], columns: Sequence[str] = NUMERIC_COLUMNS,
+              term_columns: Sequence[str] = TERM_COLUMNS) -> "IndexSet":
+        """Index a whole row list in one pass per column (sorting each column once)."""
+        indexes = cls((), term_columns)
+        n = len(rows)
+        ids = np.arange(n, dtype=np.int64)
+        for column in columns:
+            value = indexes._getters[column] = _value_getter(column)
+            values = np.fromiter((value(r) for r in rows), dtype=np.float64, count=n)
+            indexes._ranges[column] = RangeIndex(column, values, ids)
+        for i, row in enumerate(rows):
+            for column, index in indexes._terms.items():
+                index.add(i, row.get(column))
+        indexes._rows = n
+        return indexes
+
+    @classmethod
+    def from_frame(cls, df: Any, columns: Sequence[str] = NUMERIC_COLUMNS,
+                   term_columns: Sequence[str] = TERM_COLUMNS) -> "IndexSet":
+        """Index a DataFrame column-wise (row id = position); absent columns are skipped."""
+        import pandas as pd
+
+        columns = [c for c in columns if c in df.columns or c == "year"]
+        indexes = cls(columns, [c for c in term_columns if c in df.columns])
+        n = len(df)
+        ids = np.arange(n, dtype=np.int64)
+        for column in columns:
+            indexes._ranges[column] = RangeIndex(column, _frame_values(df, column), ids)
+        for column, index in indexes._terms.items():
+            codes, uniques = pd.factorize(df[column])
+            by_term: Dict[str, List[int]] = {}
+            for code, value in enumerate(uniques):
+                for term in dict.fromkeys(_terms(value)):
+                    by_term.setdefault(term, []).append(code)
+            for term, term_codes in by_term.items():
+                hit = np.zeros(len(uniques) + 1, dtype=bool)
+                hit[term_codes] = True
+                index._arrays[term] = np.flatnonzero(hit[codes])
+                index._postings[term] = index._arrays[term].tolist()
+        indexes._rows = n
+        return indexes
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._ranges)
+
+    @property
+    def term_columns(self) -> List[str]:
+        return list(self._terms)
+
+    @property
+    def rows_seen(self) -> int:
+        return self._rows
+
+    def reset(self) -> None:
+        """Forget every indexed row (the corpus is reloading); the columns stay."""
+        self._ranges = {c: RangeIndex(c) for c in self._ranges}
+        self._terms = {c: TermIndex(c) for c in self._terms}
+        self._rows = 0
+
+    def add_row(self, row: Dict[str, Any]) -> None:
+        """Index the next row (its id is the number of rows seen before it)."""
+        row_id = self._rows
+        self._rows += 1
+        for column, index in self._ranges.items():
+            index.add(row_id, self._getters[column](row))
+        for column, index in self._terms.items():
+            index.add(row_id, row.get(column))
+
+    def update(self, rows: Iterable[Dict[str, Any]]) -> "IndexSet":
+        for row in rows:
+            self.add_row(row)
+        return self
+
+    def range_index(self, column: str) -> RangeIndex:
+        index = self._ranges.get(column)
+        if index is None:
+            raise KeyError(f"column {column!r} is not range-indexed; have {self.columns}")
+        return index
+
+    def term_index(self, column: str) -> TermIndex:
+        index = self._terms.get(column)
+        if index is None:
+            raise KeyError(f"column {column!r} is not term-indexed; have {self.term_columns}")
+        return index
+
+    def query(self, ranges: Optional[Dict[str, Range]] = None, terms: Optional[Dict[str, Any]] = None,
+              order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Row ids matching every range ({column: (lo, hi)} with None for an
+        open end, or a single value for equality) and every term filter
+        ({column: term or terms}, any term matches). Without order_by the ids
+        come back in row order; with it, in that column's value order (rows
+        missing the value last).
+        """
+        sets = []
+        for column, spec in (ranges or {}).items():
+            lo, hi = spec if isinstance(spec, tuple) else (spec, spec)
+            sets.append(self.range_index(column).between(lo, hi))
+        for column, wanted in (terms or {}).items():
+            sets.append(self.term_index(column).ids(wanted))
+        sets.sort(key=len)
+        if sets:
+            # intersect smallest first; membership via a bitmap instead of sorting every set
+            ids = np.sort(sets[0])
+            for other in sets[1:]:
+                if not len(ids):
+                    break
+                member = np.zeros(self._rows, dtype=bool)
+                member[other] = True
+                ids = ids[member[ids]]
+        else:
+            ids = np.arange(self._rows, dtype=np.int64)
+        if order_by is not None:
+            ids = self.order(ids, order_by, descending)
+        return ids if limit is None else ids[:limit]
+
+    def order(self, ids: np.ndarray, column: str, descending: bool = False) -> np.ndarray:
+        """Reorder row ids by a range-indexed column (rows missing the value go last)."""
+        ordered = self.range_index(column).ordered(descending)
+        rank = np.full(self._rows, -1, dtype=np.int64)
+        rank[ordered] = np.arange(len(ordered))
+        ranks = rank[ids]
+        present = ranks >= 0
+        head = ids[present][np.argsort(ranks[present], kind="stable")]
+        return head if present.all() else np.concatenate((head, ids[~present]))
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __repr__(self) -> str:
+        return f"IndexSet(rows={self._rows}, columns={self.columns}, terms={self.term_columns})"
+
+
+__all__ = ["RangeIndex", "TermIndex", "IndexSet", "NUMERIC_COLUMNS", "TERM_COLUMNS"]
@@ -0,0 +1,142 @@
+"""
+Streaming review cleaning and de-duplication.
+
+Reviews are compared on a normalized key (Unicode NFKC, casefold, collapsed
+whitespace), so "Great  movie!" and "great movie!" count as one review.
+Only a fixed-size blake2b digest of each key is remembered, never the text;
+for unbounded streams a Bloom filter keeps memory constant at the cost of a
+configurable false-positive rate (a few unique reviews dropped).
+
+Functions: normalize_review, review_key, iter_clean_reviews
+Classes:   HashSeen, BloomFilter
+"""
+
+from __future__ import annotations
+import math
+import re
+import unicodedata
+from hashlib import blake2b
+from typing import Any, Iterable, Iterator, Optional, Set
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_review(text: str) -> str:
+    """NFKC-normalize, casefold and collapse whitespace."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def review_key(text: str, normalize: bool = True, digest_size: int = 8) -> bytes:
+    """Fixed-size digest used as the de-duplication key of a review."""
+    if normalize:
+        text = normalize_review(text)
+    return blake2b(text.encode("utf-8"), digest_size=digest_size).digest()
+
+
+class HashSeen:
+    """Exact(ish) seen-set of fixed-size digests; 8 bytes gives ~1e-19 pair collision odds."""
+
+    def __init__(self, digest_size: int = 8):
+        self.digest_size = digest_size
+        self._seen: Set[bytes] = set()
+
+    def add(self, key: bytes) -> bool:
+        """Remember key; returns False if it was already there."""
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class BloomFilter:
+    """
+    Bloom filter sized for `capacity` items at false-positive rate `fp_rate`.
+
+    Bit positions come from double hashing of one 16-byte digest, so add()
+    costs a single hash however many probes are used.
+    """
+
+    digest_size = 16
+
+    def __init__(self, capacity: int = 1_000_000, fp_rate: float = 0.001):
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity must be a positive int")
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: bytes) -> bool:
+        """Set the key's bits; returns False if all of them were already set (probably seen)."""
+        new = False
+        bits = self._bits
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def __repr__(self) -> str:
+        return f"BloomFilter(capacity={self.capacity}, fp_rate={self.fp_rate}, bits={self.num_bits}, hashes={self.num_hashes})"
+
+
+def iter_clean_reviews(
+    reviews: Iterable[Any],
+    normalize: bool = True,
+    bloom: bool = False,
+    capacity: int = 1_000_000,
+    fp_rate: float = 0.001,
+    seen: Optional[Any] = None,
+) -> Iterator[str]:
+    """
+    Lazily yield cleaned reviews from any iterable.
+
+    Missing entries (None, "", 0, empty list/dict) and non-strings are
+    dropped; the first occurrence of every review is kept.
+
+    Args:
+        reviews: any iterable/generator of raw reviews.
+        normalize: de-duplicate on normalize_review() instead of the exact text.
+        bloom: use a BloomFilter(capacity, fp_rate) instead of a digest set.
+        seen: share an existing HashSeen/BloomFilter across calls.
+    """
+    if seen is None:
+        seen = BloomFilter(capacity, fp_rate) if bloom else HashSeen()
+    digest_size = seen.digest_size
+    for rev in reviews:
+        if not isinstance(rev, str) or not rev:
+            continue
+        text = normalize_review(rev) if normalize else rev
+        if not text:
+            continue
+        if seen.add(blake2b(text.encode("utf-8"), digest_size=digest_size).digest()):
+            yield rev
+
+
+__all__ = ["normalize_review", "review_key", "HashSeen", "BloomFilter", "iter_clean_reviews"]
@@ -0,0 +1,295 @@
+"""
+High-throughput CSV export for review and movie rows.
+
+- write_rows: stream any iterable of rows (lists or dicts) to one CSV file,
+  formatting rows in large batches and writing each batch with one call.
+  gzip, bz2 and xz compression are picked from the suffix or given explicitly.
+- export_sharded: split the stream into shards by row count and/or by key
+  (e.g. genre or release year), write the shards in parallel worker
+  processes and record them in a manifest.json next to the shards.
+"""
+
+from __future__ import annotations
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from hashlib import blake2b
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from movie_ranking import _primary_genre, _release_year
+from pool_map import ordered_map
+
+REVIEW_HEADER = ("Author", "Content", "Rating")
+
+_EXTENSIONS = {None: "", "gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+_OPENERS: Dict[str, Callable[..., IO[str]]] = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+Key = Union[None, str, int, Callable[[Any], Any]]
+
+
+def infer_compression(filename: str) -> Optional[str]:
+    """Compression name from a file suffix (.gz/.bz2/.xz), else None."""
+    for name, ext in _EXTENSIONS.items():
+        if ext and filename.endswith(ext):
+            return name
+    return None
+
+
+def open_text(filename: str, mode: str = "wt", compression: Optional[str] = "infer") -> IO[str]:
+    """Open a text file, transparently (de)compressing gzip, bz2 or xz."""
+    if compression == "infer":
+        compression = infer_compression(filename)
+    if compression is None:
+        return open(filename, mode.replace("t", ""), encoding="utf-8", newline="")
+    if compression not in _OPENERS:
+        raise ValueError("compression must be None, 'gzip', 'bz2', 'xz' or 'infer'")
+    return _OPENERS[compression](filename, mode, encoding="utf-8", newline="")
+
+
+def _row_values(row: Any, columns: Optional[Sequence[str]]) -> Sequence[Any]:
+    if isinstance(row, dict):
+        if columns is None:
+            raise ValueError("dict rows need columns=")
+        return [row.get(c, "") for c in columns]
+    return row
+
+
+def _write_batches(f: IO[str], rows: Iterable[Any], columns: Optional[Sequence[str]], batch_size: int) -> int:
+    """Format rows into an in-memory buffer and flush every batch_size rows."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    n = pending = 0
+    for row in rows:
+        writer.writerow(_row_values(row, columns))
+        pending += 1
+        if pending >= batch_size:
+            f.write(buf.getvalue())
+            buf.seek(0)
+            buf.truncate()
+            n += pending
+            pending = 0
+    if pending:
+        f.write(buf.getvalue())
+        n += pending
+    return n
+
+
+def write_rows(
+    rows: Iterable[Any],
+    filename: str,
+    header: Optional[Sequence[str]] = REVIEW_HEADER,
+    columns: Optional[Sequence[str]] = None,
+    compression: Optional[str] = "infer",
+    batch_size: int = 10000,
+) -> int:
+    """
+    Write an iterable of rows to a (possibly compressed) CSV file.
+
+    Args:
+        rows: any iterable/generator of sequences, or of dicts when `columns`
+            names the fields to write.
+        filename: output path; ".gz", ".bz2" and ".xz" imply compression.
+        header: header row (None for no header). Defaults to columns for dict rows.
+        columns: field names to pull out of dict rows.
+        compression: None, "gzip", "bz2", "xz" or "infer".
+        batch_size: rows formatted per write call.
+
+    Returns:
+        int: number of data rows written.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("filename must be a string")
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("batch_size must be a positive int")
+    if header is REVIEW_HEADER and columns is not None:
+        header = columns
+
+    with open_text(filename, "wt", compression) as f:
+        if header:
+            csv.writer(f).writerow(header)
+        return _write_batches(f, rows, columns, batch_size)
+
+
+def _write_shard(path: str, header: Optional[Sequence[str]], rows: List[Sequence[Any]],
+                 compression: Optional[str], batch_size: int) -> Tuple[str, int]:
+    """Worker entry point (top level so it pickles)."""
+    n = write_rows(rows, path, header=header, compression=compression, batch_size=batch_size)
+    return path, n
+
+
+def _write_shard_job(job: Tuple[Dict[str, Any], str, List[Sequence[Any]]], header: Optional[Sequence[str]],
+                     compression: Optional[str], batch_size: int) -> Dict[str, Any]:
+    """Write one (manifest entry, path, rows) shard; returns the entry with its row count."""
+    entry, path, data = job
+    entry["rows"] = _write_shard(path, header, data, compression, batch_size)[1]
+    return entry
+
+
+def _key_function(key: Key, names: Optional[Sequence[str]]) -> Optional[Callable[[Any], Any]]:
+    """
+    Turn a key spec into a function of the row. List rows find named
+    columns through `names` (the columns or header); "genre" and "year"
+    give the same key (primary genre str, release year int) for list and
+    dict rows.
+    """
+    if key is None or callable(key):
+        return key
+    names = list(names or ())
+
+    def position(name: str) -> int:
+        try:
+            return names.index(name)
+        except ValueError:
+            raise ValueError(f"column {name!r} not found in header") from None
+
+    if key in ("genre", "year"):
+        fields = ("genres",) if key == "genre" else ("release_year", "release_date")
+        pick = _primary_genre if key == "genre" else _release_year
+        present = [(f, names.index(f)) for f in fields if f in names]
+
+        def by_field(row: Any) -> Any:
+            if isinstance(row, dict):
+                return pick(row)
+            if not present:
+                position(fields[-1])  # raises
+            return pick({f: row[i] for f, i in present})
+        return by_field
+    if isinstance(key, int):
+        return lambda row: row[key]
+    if isinstance(key, str):
+        pos = names.index(key) if key in names else None
+
+        def by_name(row: Any) -> Any:
+            if isinstance(row, dict):
+                return row.get(key)
+            return row[pos if pos is not None else position(key)]
+        return by_name
+    raise TypeError("key must be None, a column name/index, 'genre', 'year' or a callable")
+
+
+def _safe(value: Any) -> str:
+    text = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value)).strip("_")
+    return text or "none"
+
+
+def _shard_stem(k: Any, stems: Dict[Any, str], taken: Dict[str, Any]) -> str:
+    """File-name stem for key k, unique among the keys seen so far."""
+    stem = stems.get(k)
+    if stem is None:
+        stem = _safe(k)
+        # e.g. None/""/"_" or "a b"/"a_b" map to the same text; compare
+        # case-insensitively so the files stay distinct on any filesystem
+        if stem.lower() in taken:
+            stem = f"{stem}-{blake2b(repr(k).encode('utf-8'), digest_size=4).hexdigest()}"
+            if stem.lower() in taken:
+                raise ValueError(f"shard keys {taken[stem.lower()]!r} and {k!r} map to the same file name")
+        stems[k] = stem
+        taken[stem.lower()] = k
+    return stem
+
+
+def export_sharded(
+    rows: Iterable[Any],
+    out_dir: str,
+    shard_rows: int = 1_000_000,
+    key: Key = None,
+    compression: Optional[str] = "gzip",
+    workers: int = 1,
+    header: Optional[Sequence[str]] = REVIEW_HEADER,
+    columns: Optional[Sequence[str]] = None,
+    prefix: str = "part",
+    batch_size: int = 10000,
+    max_buffered_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Stream rows into CSV shards and write a manifest.json describing them.
+
+    Each shard holds at most `shard_rows` rows. With a `key` (column name or
+    index, "genre", "year", or a callable) rows are grouped per key value
+    first, so every shard contains a single key; keys whose names clash once
+    made file-safe get a short hash suffix. Rows waiting in the per-key
+    buffers never exceed `max_buffered_rows` in total (default: the larger
+    of shard_rows and batch_size); when they would, the largest buffer is
+    written early as a shorter shard. Shards are written by up to
+    `workers` processes, with at most 2*workers of them queued at a time.
+
+    Returns:
+        dict: the manifest (also saved as out_dir/manifest.json).
+    """
+    if not isinstance(shard_rows, int) or shard_rows <= 0:
+        raise ValueError("shard_rows must be a positive int")
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("workers must be a positive int")
+    if max_buffered_rows is None:
+        max_buffered_rows = max(shard_rows, batch_size)
+    elif not isinstance(max_buffered_rows, int) or max_buffered_rows <= 0:
+        raise ValueError("max_buffered_rows must be a positive int")
+    if compression not in _EXTENSIONS:
+        raise ValueError("compression must be None, 'gzip', 'bz2' or 'xz'")
+    if header is REVIEW_HEADER and columns is not None:
+        header = columns
+    os.makedirs(out_dir, exist_ok=True)
+
+    key_fn = _key_function(key, columns if columns is not None else header)
+    ext = ".csv" + _EXTENSIONS[compression]
+    buffers: Dict[Any, List[Sequence[Any]]] = {}
+    parts: Dict[Any, int] = {}
+    stems: Dict[Any, str] = {}
+    taken: Dict[str, Any] = {}
+
+    def shard(k: Any) -> Tuple[Dict[str, Any], str, List[Sequence[Any]]]:
+        part = parts.get(k, 0)
+        parts[k] = part + 1
+        if key_fn:
+            name = f"{prefix}-{_shard_stem(k, stems, taken)}-{part:05d}{ext}"
+        else:
+            name = f"{prefix}-{part:05d}{ext}"
+        return {"file": name, "key": k, "part": part}, os.path.join(out_dir, name), buffers.pop(k)
+
+    def jobs() -> Iterator[Tuple[Dict[str, Any], str, List[Sequence[Any]]]]:
+        buffered = 0
+        for row in rows:
+            k = key_fn(row) if key_fn else None
+            buf = buffers.setdefault(k, [])
+            buf.append(_row_values(row, columns))
+            buffered += 1
+            if len(buf) >= shard_rows:
+                buffered -= len(buf)
+                yield shard(k)
+            elif buffered >= max_buffered_rows:  # many keys at once: spill the biggest buffer
+                big = max(buffers, key=lambda b: len(buffers[b]))
+                buffered -= len(buffers[big])
+                yield shard(big)
+        for k in list(buffers):
+            yield shard(k)
+
+    write = partial(_write_shard_job, header=header, compression=compression, batch_size=batch_size)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(ordered_map(pool, workers, write, jobs()))
+    else:
+        shards = list(map(write, jobs()))
+
+    shards.sort(key=lambda e: (str(e["key"]), e["part"]))
+    manifest = {
+        "format": "csv",
+        "compression": compression,
+        "header": list(header) if header else None,
+        "key": key if isinstance(key, (str, int)) or key is None else getattr(key, "__name__", "custom"),
+        "shard_rows": shard_rows,
+        "total_rows": sum(e["rows"] for e in shards),
+        "shards": shards,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return manifest
+
+
+__all__ = ["REVIEW_HEADER", "infer_compression", "open_text", "write_rows", "export_sharded"]
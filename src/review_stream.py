@@ -0,0 +1,373 @@
+"""
+Composable streaming pipeline for reviews.
+
+A StreamPipeline is a source iterable followed by stages. A Stage wraps a
+generator function (items in -> items out); an AsyncStage wraps an async
+generator function. Three ways to run the same pipeline:
+
+    for row in pipe:              # lazy generator chain, one item in flight
+    for row in pipe.iter_threaded(queue_size=64):
+                                  # one thread per stage, bounded queues
+    async for row in pipe.aiter(queue_size=64):
+                                  # asyncio tasks, bounded asyncio.Queues
+
+Bounded queues give backpressure: a fast stage blocks once its output
+queue is full, so memory stays flat while stages overlap.
+
+Stage factories: dedupe_stage, spoiler_filter_stage, sentiment_stage,
+                 normalize_stage, csv_export_stage, filter_stage, map_stage
+Sources:         corpus_reviews
+"""
+
+from __future__ import annotations
+import asyncio
+import csv
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from movie_oop_core import BaseMovieCorpus, normalize_tmdb_reviews
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception from a worker to the consumer."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class _Stopped(Exception):
+    """Raised inside worker threads once the consumer has gone away."""
+
+
+class Stage:
+    """A synchronous pipeline stage: fn(iterable) -> iterable."""
+
+    def __init__(self, name: str, fn: Callable[[Iterable[Any]], Iterable[Any]]):
+        if not callable(fn):
+            raise TypeError("fn must be callable")
+        self.name = name
+        self.fn = fn
+
+    def __call__(self, items: Iterable[Any]) -> Iterator[Any]:
+        return iter(self.fn(items))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class AsyncStage(Stage):
+    """An asyncio pipeline stage: fn(async iterable) -> async iterable."""
+
+
+class StreamPipeline:
+    """
+    Source + ordered stages, runnable lazily, threaded or under asyncio.
+
+    Example:
+        pipe = StreamPipeline(corpus_reviews(corpus, "Dune"),
+                              [normalize_stage(), csv_export_stage("dune.csv")])
+        written = pipe.run()
+    """
+
+    def __init__(self, source: Iterable[Any], stages: Sequence[Stage] = (), queue_size: int = 64):
+        if not isinstance(queue_size, int) or queue_size <= 0:
+            raise ValueError("queue_size must be a positive int")
+        for st in stages:
+            if not isinstance(st, Stage):
+                raise TypeError("stages must be Stage instances")
+        self._source = source
+        self._stages: List[Stage] = list(stages)
+        self._queue_size = queue_size
+
+    @property
+    def stages(self) -> List[Stage]:
+        return list(self._stages)
+
+    def then(self, stage: Stage) -> "StreamPipeline":
+        """Return a new pipeline with `stage` appended."""
+        return StreamPipeline(self._source, self._stages + [stage], self._queue_size)
+
+    # Synchronous runtimes
+
+    def __iter__(self) -> Iterator[Any]:
+        if any(isinstance(st, AsyncStage) for st in self._stages):
+            raise TypeError("pipeline has async stages; use aiter()")
+        items: Iterable[Any] = self._source
+        for st in self._stages:
+            items = st(items)
+        return iter(items)
+
+    def run(self, threaded: bool = False) -> int:
+        """Drain the pipeline (e.g. when the last stage is an export). Returns items out."""
+        it = self.iter_threaded() if threaded else iter(self)
+        n = 0
+        for _ in it:
+            n += 1
+        return n
+
+    def iter_threaded(self, queue_size: Optional[int] = None) -> Iterator[Any]:
+        """Run every stage in its own thread, connected by bounded queues."""
+        if any(isinstance(st, AsyncStage) for st in self._stages):
+            raise TypeError("pipeline has async stages; use aiter()")
+        size = queue_size or self._queue_size
+        stop = threading.Event()
+
+        def put(q: "queue.Queue[Any]", item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def drain(q: "queue.Queue[Any]") -> Iterator[Any]:
+            while True:
+                try:
+                    item = q.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+                if item is _DONE:
+                    return
+                if isinstance(item, _StageError):
+                    raise item.exc
+                yield item
+
+        def worker(items: Iterable[Any], out: "queue.Queue[Any]") -> None:
+            try:
+                for item in items:
+                    if not put(out, item):
+                        return
+            except Exception as exc:  # forwarded to the consumer
+                put(out, _StageError(exc))
+                return
+            put(out, _DONE)
+
+        q: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+        threads = [threading.Thread(target=worker, args=(self._source, q), daemon=True)]
+        for st in self._stages:
+            nxt: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+            threads.append(threading.Thread(target=worker, args=(st(drain(q)), nxt), daemon=True))
+            q = nxt
+        for t in threads:
+            t.start()
+        try:
+            yield from drain(q)
+        finally:
+            stop.set()
+
+    # Asyncio runtime
+
+    async def aiter(self, queue_size: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Run the pipeline under asyncio. AsyncStages run as tasks on the loop;
+        plain Stages run in worker threads that talk to the loop through the
+        same bounded queues, so CPU-bound stages do not stall the loop. The
+        pipeline owns its thread pool (one thread per sync pump), so it never
+        waits on the loop's shared default executor.
+        """
+        size = queue_size or self._queue_size
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+
+        def call(make_coro: Callable[[], Any]) -> Any:
+            # Poll with a timeout so worker threads notice when the consumer stops.
+            while not stop.is_set():
+                try:
+                    return asyncio.run_coroutine_threadsafe(
+                        asyncio.wait_for(make_coro(), 0.1), loop).result()
+                except asyncio.TimeoutError:
+                    continue
+            raise _Stopped()
+
+        async def pump_async(items: AsyncIterator[Any], out: "asyncio.Queue[Any]") -> None:
+            try:
+                async for item in items:
+                    await out.put(item)
+            except Exception as exc:
+                await out.put(_StageError(exc))
+                return
+            await out.put(_DONE)
+
+        def pump_sync(items: Iterable[Any], out: "asyncio.Queue[Any]") -> None:
+            def send(item: Any) -> None:
+                call(lambda: out.put(item))
+            try:
+                for item in items:
+                    send(item)
+                send(_DONE)
+            except _Stopped:
+                return
+            except Exception as exc:
+                try:
+                    send(_StageError(exc))
+                except _Stopped:
+                    return
+
+        async def adrain(q: "asyncio.Queue[Any]") -> AsyncIterator[Any]:
+            while True:
+                item = await q.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _StageError):
+                    raise item.exc
+                yield item
+
+        def sdrain(q: "asyncio.Queue[Any]") -> Iterator[Any]:
+            while True:
+                item = call(q.get)
+                if item is _DONE:
+                    return
+                if isinstance(item, _StageError):
+                    raise item.exc
+                yield item
+
+        is_async_source = hasattr(self._source, "__aiter__")
+        n_sync = sum(not isinstance(st, AsyncStage) for st in self._stages) + (not is_async_source)
+        pool = ThreadPoolExecutor(max_workers=max(1, n_sync), thread_name_prefix="stream-stage")
+        q: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=size)
+        pending = []
+        if is_async_source:
+            pending.append(asyncio.ensure_future(pump_async(self._source.__aiter__(), q)))
+        else:
+            pending.append(loop.run_in_executor(pool, pump_sync, self._source, q))
+        for st in self._stages:
+            nxt: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=size)
+            if isinstance(st, AsyncStage):
+                pending.append(asyncio.ensure_future(pump_async(st.fn(adrain(q)), nxt)))
+            else:
+                pending.append(loop.run_in_executor(pool, pump_sync, st(sdrain(q)), nxt))
+            q = nxt
+        try:
+            async for item in adrain(q):
+                yield item
+        finally:
+            stop.set()
+            for fut in pending:
+                if not fut.done():
+                    fut.cancel()
+            # Workers see stop within one poll interval; don't block the loop on them.
+            pool.shutdown(wait=False)
+
+    async def arun(self, queue_size: Optional[int] = None) -> int:
+        """Async counterpart of run()."""
+        n = 0
+        async for _ in self.aiter(queue_size):
+            n += 1
+        return n
+
+    def __str__(self) -> str:
+        names = " -> ".join(st.name for st in self._stages) or "(no stages)"
+        return f"StreamPipeline(source -> {names})"
+
+
+# Sources
+
+def corpus_reviews(corpus: BaseMovieCorpus, title: str) -> Iterator[Any]:
+    """Source: pseudo-reviews for `title` from any BaseMovieCorpus."""
+    if not isinstance(corpus, BaseMovieCorpus):
+        raise TypeError("corpus must be a BaseMovieCorpus")
+    yield from corpus.find_reviews_by_title(title)
+
+
+# Stage factories
+
+def _texts(item: Any) -> List[str]:
+    """Text fields of a review dict or row."""
+    if isinstance(item, dict):
+        content = item.get("content")
+        return [content] if isinstance(content, str) else []
+    if isinstance(item, (list, tuple)):
+        return [f for f in item if isinstance(f, str)]
+    return [item] if isinstance(item, str) else []
+
+
+def dedupe_stage(key: Optional[Callable[[Any], Any]] = None) -> Stage:
+    """Drop repeated items; remembers 8-byte digests, not the items."""
+    def run(items: Iterable[Any]) -> Iterator[Any]:
+        seen = set()
+        for item in items:
+            k = item if key is None else key(item)
+            digest = blake2b(repr(k).encode("utf-8"), digest_size=8).digest()
+            if digest not in seen:
+                seen.add(digest)
+                yield item
+    return Stage("dedupe", run)
+
+
+def spoiler_filter_stage(word: str = "spoiler") -> Stage:
+    """Drop reviews whose text mentions spoilers."""
+    word = word.lower()
+
+    def run(items: Iterable[Any]) -> Iterator[Any]:
+        for item in items:
+            if not any(word in t.lower() for t in _texts(item)):
+                yield item
+    return Stage("spoiler_filter", run)
+
+
+def sentiment_stage() -> Stage:
+    """Tag each review as positive: dicts get a 'positive' key, rows get a trailing bool."""
+    from Data_Clean import PositiveReviewDetector
+    detector = PositiveReviewDetector()
+
+    def run(items: Iterable[Any]) -> Iterator[Any]:
+        for item in items:
+            positive = any(detector.is_positive(t) for t in _texts(item))
+            if isinstance(item, dict):
+                item = dict(item, positive=positive)
+            else:
+                item = list(item) + [positive]
+            yield item
+    return Stage("sentiment", run)
+
+
+def normalize_stage() -> Stage:
+    """Review dicts -> [author, content, rating]; rows pass through, junk is dropped."""
+    def run(items: Iterable[Any]) -> Iterator[Any]:
+        for item in items:
+            if isinstance(item, dict):
+                yield normalize_tmdb_reviews([item])[0]
+            elif isinstance(item, (list, tuple)) and len(item) >= 3:
+                yield list(item)
+    return Stage("normalize", run)
+
+
+def csv_export_stage(filename: str, header: Optional[Sequence[str]] = ("Author", "Content", "Rating")) -> Stage:
+    """Write rows to CSV as they stream past; rows are passed on unchanged."""
+    if not isinstance(filename, str):
+        raise TypeError("filename must be a string")
+
+    def run(items: Iterable[Any]) -> Iterator[Any]:
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if header:
+                writer.writerow(header)
+            for row in items:
+                writer.writerow(row)
+                yield row
+    return Stage("export_csv", run)
+
+
+def filter_stage(predicate: Callable[[Any], bool], name: str = "filter") -> Stage:
+    """Keep items for which predicate(item) is true."""
+    return Stage(name, lambda items: (x for x in items if predicate(x)))
+
+
+def map_stage(fn: Callable[[Any], Any], name: str = "map") -> Stage:
+    """Apply fn to every item."""
+    return Stage(name, lambda items: (fn(x) for x in items))
+
+
+__all__ = [
+    "Stage", "AsyncStage", "StreamPipeline", "corpus_reviews",
+    "dedupe_stage", "spoiler_filter_stage", "sentiment_stage", "normalize_stage",
+    "csv_export_stage", "filter_stage", "map_stage",
+]
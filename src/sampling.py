@@ -0,0 +1,259 @@
+"""
+Reservoir and stratified sampling for approximate analytics.
+
+Exploratory charts do not need every row of a 1M-movie dump. These helpers
+draw a fixed-size sample in one pass over any row stream (the streaming CSV
+loader, a corpus, a DataFrame's records) and estimate population means and
+counts from it, with standard errors:
+
+    sample = sample_db("tmdb_1m.csv", 20_000, by="genre", seed=7)
+    sample.mean("vote_average")        # Estimate(value=6.41, stderr=0.012, n=20000)
+    sample.count(lambda r: r["vote_count"] and int(r["vote_count"]) > 1000)
+    MovieVisualizer(Dataset(sample.to_frame())).plot_rating_distribution()
+
+Reservoir sampling uses Algorithm L (Li 1994): after the reservoir fills,
+the gap to the next replaced row is drawn directly, so the per-row cost is
+a counter increment. Stratified sampling keeps one reservoir per stratum
+(primary genre, release year, or any key function), so small genres are
+not drowned out by Drama. Every stratum remembers how many rows it saw;
+estimates weight each stratum by that size and use the finite-population
+correction. The same seed always gives the same sample.
+
+Classes:   Estimate, Sample
+Functions: reservoir_sample, stratified_sample, sample_db, sample_frame, stratum_key
+"""
+
+from __future__ import annotations
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+StratumBy = Union[None, str, Callable[[Dict[str, Any]], Hashable]]
+
+WEIGHT_COLUMN = "sample_weight"
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """A sample estimate with its standard error (stderr 0 when the sample is the population)."""
+
+    value: float
+    stderr: float
+    n: int
+
+    @property
+    def ci95(self) -> Tuple[float, float]:
+        """Normal-approximation 95% confidence interval."""
+        return (self.value - 1.96 * self.stderr, self.value + 1.96 * self.stderr)
+
+
+class _Reservoir:
+    """Uniform fixed-size sample of a stream (Algorithm L)."""
+
+    __slots__ = ("k", "rng", "items", "seen", "_w", "_next")
+
+    def __init__(self, k: int, rng: random.Random):
+        self.k = k
+        self.rng = rng
+        self.items: List[Any] = []
+        self.seen = 0
+        self._w = 1.0
+        self._next = 0
+
+    def _skip(self) -> None:
+        self._w *= math.exp(math.log(1.0 - self.rng.random()) / self.k)
+        gap = math.floor(math.log(1.0 - self.rng.random()) / math.log(1.0 - self._w)) if self._w < 1.0 else 0
+        self._next = self.seen + gap + 1
+
+    def add(self, item: Any) -> None:
+        self.seen += 1
+        if self.seen <= self.k:
+            self.items.append(item)
+            if self.seen == self.k:
+                self._skip()
+        elif self.seen == self._next:
+            self.items[self.rng.randrange(self.k)] = item
+            self._skip()
+
+
+def stratum_key(by: StratumBy) -> Callable[[Dict[str, Any]], Hashable]:
+    """
+    Key function for a stratification: "genre" (a movie's first listed
+    genre), "year" (release year), any other column name, or a callable.
+    Rows with no value go to the None stratum.
+    """
+    if callable(by):
+        return by
+    if by == "genre":
+        def key(row: Dict[str, Any]) -> Hashable:
+            genres = row.get("genres")
+            if not isinstance(genres, str) or not genres.strip():
+                return None
+            return genres.split(",", 1)[0].strip()
+        return key
+    if by == "year":
+        from movie_oop_core import _row_year
+        return _row_year
+    if isinstance(by, str):
+        return lambda row: row.get(by) if row.get(by) not in ("", None) else None
+    raise TypeError("by must be 'genre', 'year', a column name or a callable")
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None
+
+
+class Sample:
+    """
+    Rows drawn per stratum, with the population size each stratum had.
+    A plain reservoir sample is a single stratum.
+    """
+
+    def __init__(self, strata: Dict[Hashable, Tuple[List[Dict[str, Any]], int]], by: StratumBy = None,
+                 seed: Optional[int] = None):
+        self._strata = strata
+        self.by = by
+        self.seed = seed
+
+    @property
+    def population(self) -> int:
+        """Rows seen in the stream."""
+        return sum(seen for _, seen in self._strata.values())
+
+    @property
+    def strata(self) -> Dict[Hashable, Tuple[int, int]]:
+        """stratum -> (rows sampled, rows seen)."""
+        return {key: (len(rows), seen) for key, (rows, seen) in self._strata.items()}
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        return [row for rows, _ in self._strata.values() for row in rows]
+
+    @property
+    def weights(self) -> List[float]:
+        """Rows each sampled row stands for, aligned with rows."""
+        return [seen / len(rows) for rows, seen in self._strata.values() for _ in rows]
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows, _ in self._strata.values())
+
+    def mean(self, column: str) -> Estimate:
+        """
+        Stratified estimate of the population mean of a numeric column.
+        Non-numeric/missing values are skipped; each stratum is weighted by
+        its population size.
+        """
+        value = variance = 0.0
+        used = weight_sum = 0
+        for rows, seen in self._strata.values():
+            values = [v for v in (_as_number(r.get(column)) for r in rows) if v is not None]
+            n = len(values)
+            if not n:
+                continue
+            m = sum(values) / n
+            value += seen * m
+            weight_sum += seen
+            used += n
+            if n > 1:
+                s2 = sum((v - m) ** 2 for v in values) / (n - 1)
+                variance += seen * seen * (1 - len(rows) / seen) * s2 / n
+        if not weight_sum:
+            raise ValueError(f"no numeric values for column {column!r}")
+        # strata without any value are left out of both numerator and weights
+        return Estimate(value / weight_sum, math.sqrt(max(variance, 0.0)) / weight_sum, used)
+
+    def count(self, where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Estimate:
+        """Estimated number of population rows matching `where` (all rows if None)."""
+        value = variance = 0.0
+        for rows, seen in self._strata.values():
+            n = len(rows)
+            if not n:
+                continue
+            p = sum(1 for r in rows if where is None or where(r)) / n
+            value += seen * p
+            if n > 1:
+                variance += seen * seen * (1 - n / seen) * p * (1 - p) / (n - 1)
+        return Estimate(value, math.sqrt(max(variance, 0.0)), len(self))
+
+    def count_by(self, by: StratumBy) -> Dict[Hashable, Estimate]:
+        """Estimated population count per value of a key (e.g. "year")."""
+        key = stratum_key(by)
+        values = {key(r) for rows, _ in self._strata.values() for r in rows}
+        return {v: self.count(lambda r, v=v: key(r) == v) for v in values}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Sampled rows as a DataFrame with a sample_weight column (rows each one represents)."""
+        df = pd.DataFrame.from_records(self.rows)
+        df[WEIGHT_COLUMN] = self.weights
+        return df
+
+    def __repr__(self) -> str:
+        return f"Sample(rows={len(self)}, population={self.population}, strata={len(self._strata)})"
+
+
+def _check_size(k: int, name: str = "k") -> None:
+    if not isinstance(k, int) or isinstance(k, bool) or k <= 0:
+        raise ValueError(f"{name} must be a positive int")
+
+
+def reservoir_sample(rows: Iterable[Dict[str, Any]], k: int, seed: Optional[int] = None) -> Sample:
+    """Uniform sample of k rows from a stream of any length, in one pass."""
+    _check_size(k)
+    reservoir = _Reservoir(k, random.Random(seed))
+    for row in rows:
+        reservoir.add(row)
+    return Sample({"all": (reservoir.items, reservoir.seen)}, None, seed)
+
+
+def stratified_sample(rows: Iterable[Dict[str, Any]], k_per_stratum: int, by: StratumBy = "genre",
+                      seed: Optional[int] = None) -> Sample:
+    """Up to k_per_stratum uniformly chosen rows from every stratum, in one pass."""
+    _check_size(k_per_stratum, "k_per_stratum")
+    key = stratum_key(by)
+    rng = random.Random(seed)
+    reservoirs: Dict[Hashable, _Reservoir] = {}
+    for row in rows:
+        stratum = key(row)
+        reservoir = reservoirs.get(stratum)
+        if reservoir is None:
+            reservoir = reservoirs[stratum] = _Reservoir(k_per_stratum, rng)
+        reservoir.add(row)
+    return Sample({s: (r.items, r.seen) for s, r in reservoirs.items()}, by, seed)
+
+
+def sample_db(path: str, k: int, by: StratumBy = None, seed: Optional[int] = None, **filters: Any) -> Sample:
+    """
+    Sample the streaming TMDB loader (iter_db; filters such as year_min,
+    year_max, min_votes pass through). With `by`, k rows per stratum.
+    """
+    from movie_oop_core import iter_db
+    rows = iter_db(path, **filters)
+    if by is None:
+        return reservoir_sample(rows, k, seed)
+    return stratified_sample(rows, k, by, seed)
+
+
+def sample_frame(path: str, k: int, by: StratumBy = None, seed: Optional[int] = None, **filters: Any) -> pd.DataFrame:
+    """sample_db(...).to_frame() with numeric columns typed, ready for Dataset/MovieVisualizer."""
+    df = sample_db(path, k, by, seed, **filters).to_frame()
+    for column in ("vote_average", "vote_count", "runtime", "revenue", "budget", "popularity"):
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+__all__ = [
+    "Estimate", "Sample", "reservoir_sample", "stratified_sample", "sample_db", "sample_frame",
+    "stratum_key", "WEIGHT_COLUMN",
+]
@@ -0,0 +1,209 @@
+"""
+Corpus over many CSV shards.
+
+The full Kaggle TMDB dump arrives as several CSV files. ShardedCorpus takes
+a glob ("data/tmdb_*.csv"), an explicit list of paths, or a manifest file
+and behaves like one TMDBCSVCorpus over all of them:
+
+    corpus = ShardedCorpus("data/tmdb_part_*.csv", workers=4)
+    corpus.find_reviews_by_title("Dune")
+    corpus.filter_rows(genre="Drama", year_min=2020, min_votes=500)
+
+Shards are parsed in parallel worker processes and merged in shard order
+(so results are deterministic for any number of workers). While a shard is
+read, its row count and min/max release year and vote_count are recorded;
+filters skip every shard whose ranges cannot match and scan only the rest.
+
+A manifest is either a text file with one shard path per line or a JSON
+file holding a list of paths (or {"shards": [...]}, entries being paths or
+{"path": ...} objects). Relative paths are resolved against the manifest's
+directory.
+
+Classes: ShardStats, ShardedCorpus
+"""
+
+from __future__ import annotations
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from movie_oop_core import (
+    BaseMovieCorpus, _as_float, _row_filter, _row_year, _title_key, fetch_tmdb_movie_reviews, load_db,
+)
+
+
+@dataclass
+class ShardStats:
+    """Row count and min/max of release year and vote_count in one shard (None when no values)."""
+
+    path: str
+    rows: int = 0
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    votes_min: Optional[float] = None
+    votes_max: Optional[float] = None
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows += 1
+        year = _row_year(row)
+        if year is not None:
+            self.year_min = year if self.year_min is None else min(self.year_min, year)
+            self.year_max = year if self.year_max is None else max(self.year_max, year)
+        votes = _as_float(row.get("vote_count"))
+        if votes == votes:  # not NaN
+            self.votes_min = votes if self.votes_min is None else min(self.votes_min, votes)
+            self.votes_max = votes if self.votes_max is None else max(self.votes_max, votes)
+
+    def may_match(self, year_min: Optional[int] = None, year_max: Optional[int] = None,
+                  min_votes: Optional[float] = None) -> bool:
+        """False only when no row in the shard can satisfy the bounds."""
+        if not self.rows:
+            return False
+        if year_min is not None or year_max is not None:
+            if self.year_min is None:
+                return False  # no row has a year, and the filter needs one
+            if year_min is not None and self.year_max < year_min:
+                return False
+            if year_max is not None and self.year_min > year_max:
+                return False
+        if min_votes is not None and (self.votes_max is None or self.votes_max < min_votes):
+            return False
+        return True
+
+
+def _load_shard(path: str) -> Tuple[List[Dict[str, Any]], ShardStats]:
+    """Worker: parse one shard and collect its statistics."""
+    stats = ShardStats(path)
+    rows = load_db(path, on_row=stats.add)
+    return rows, stats
+
+
+def read_manifest(path: str) -> List[str]:
+    """Shard paths listed in a text or JSON manifest."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    base = os.path.dirname(os.path.abspath(path))
+    if path.lower().endswith(".json"):
+        data = json.loads(text)
+        entries = data.get("shards", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ValueError("manifest must list shards")
+        paths = [e["path"] if isinstance(e, dict) else e for e in entries]
+    else:
+        paths = [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    return [p if os.path.isabs(p) else os.path.join(base, p) for p in paths]
+
+
+class ShardedCorpus(BaseMovieCorpus):
+    """
+    One corpus over many TMDB CSV shards. Specializes BaseMovieCorpus.
+
+    Args:
+        shards: glob pattern, list of shard paths, or a manifest path (.json/.txt/.manifest).
+        workers: parser processes (1 = in this process, None = CPU count).
+    """
+
+    def __init__(self, shards: Union[str, Sequence[str]], workers: Optional[int] = 1):
+        super().__init__()
+        if workers is not None and (not isinstance(workers, int) or workers <= 0):
+            raise ValueError("workers must be a positive int or None")
+        self._paths = self._resolve(shards)
+        self._workers = workers
+        self._stats: List[ShardStats] = []
+        self._bounds: List[Tuple[int, int]] = []  # shard -> [start, end) in self._rows
+
+    @staticmethod
+    def _resolve(shards: Union[str, Sequence[str]]) -> List[str]:
+        if isinstance(shards, str):
+            if not shards.strip():
+                raise ValueError("shards must be a non-empty string or list")
+            if os.path.isfile(shards) and shards.lower().endswith((".json", ".txt", ".manifest")):
+                paths = read_manifest(shards)
+            else:
+                paths = sorted(glob.glob(shards))
+        elif isinstance(shards, (list, tuple)) and all(isinstance(p, str) for p in shards):
+            paths = list(shards)
+        else:
+            raise TypeError("shards must be a glob, manifest path or list of paths")
+        if not paths:
+            raise ValueError("no shards matched")
+        return paths
+
+    @property
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    @property
+    def shard_stats(self) -> List[ShardStats]:
+        """Per-shard statistics (available once loaded)."""
+        self.ensure_loaded()
+        return list(self._stats)
+
+    def load(self) -> List[Dict[str, Any]]:
+        self._reset_observers()
+        if self._workers == 1 or len(self._paths) == 1:
+            results = [_load_shard(p) for p in self._paths]
+        else:
+            workers = min(self._workers or os.cpu_count() or 1, len(self._paths))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_load_shard, self._paths))
+
+        rows: List[Dict[str, Any]] = []
+        self._stats, self._bounds = [], []
+        for shard_rows, stats in results:
+            self._bounds.append((len(rows), len(rows) + len(shard_rows)))
+            self._stats.append(stats)
+            rows.extend(shard_rows)
+            if self._observers:
+                for row in shard_rows:
+                    self._notify(row)
+        self._rows = rows
+        self._loaded = True
+        self._rows_changed()
+        return self.rows
+
+    def _shard_rows(self, i: int) -> List[Dict[str, Any]]:
+        start, end = self._bounds[i]
+        return self._rows[start:end]
+
+    def _tail_rows(self) -> List[Dict[str, Any]]:
+        """Rows added with add_rows() after loading (not covered by any shard's stats)."""
+        end = self._bounds[-1][1] if self._bounds else 0
+        return self._rows[end:]
+
+    def _candidate_rows(self, year_min: Optional[int] = None, year_max: Optional[int] = None,
+                        min_votes: Optional[float] = None) -> Any:
+        """Rows of every shard that may match, chained in shard order."""
+        parts = [self._shard_rows(i) for i, s in enumerate(self._stats) if s.may_match(year_min, year_max, min_votes)]
+        parts.append(self._tail_rows())
+        return chain.from_iterable(parts)
+
+    def find_reviews_by_title(self, title: str) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        return self._cached(("reviews", _title_key(title)), lambda: fetch_tmdb_movie_reviews(title, self._rows))
+
+    def filter_rows(
+        self,
+        genre: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        min_votes: Optional[float] = None,
+        min_rating: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Same as BaseMovieCorpus.filter_rows, but shards that cannot match are never scanned."""
+        def compute() -> List[Dict[str, Any]]:
+            keep = _row_filter(genre, year_min, year_max, min_votes, min_rating)
+            return [dict(r) for r in self._candidate_rows(year_min, year_max, min_votes) if keep(r)]
+
+        self.ensure_loaded()
+        return self._cached(("filter", genre, year_min, year_max, min_votes, min_rating), compute)
+
+    def __str__(self) -> str:
+        return f"ShardedCorpus(shards={len(self._paths)}, rows={len(self)})"
+
+
+__all__ = ["ShardedCorpus", "ShardStats", "read_manifest"]
@@ -9,6 +9,10 @@ from your_module import (
     BaseMovieCorpus, MemoryCorpus, TMDBCSVCorpus,
     ReviewTable, ReviewPipeline
 )
+from movie_ranking import WeightedRanker, top_k_indices
+from review_loader import iter_movie_reviews, iter_review_chunks
+from review_stream import StreamPipeline, dedupe_stage, spoiler_filter_stage, sentiment_stage
+from rating_stats import RatingStats, KLLSketch
 
 
 def mock_load_movie_reviews(filepath):
@@ -141,5 +145,1027 @@ class TestReviewCorpusAndPipeline(unittest.TestCase):
             self.fail(f"export_csv failed with {e}")
 
 
+class TestWeightedRanking(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"title": "One Vote Wonder", "vote_average": "10.0", "vote_count": "1", "genres": "Drama"},
+            {"title": "Crowd Favorite", "vote_average": "8.4", "vote_count": "30000", "genres": "Action"},
+            {"title": "Solid Hit", "vote_average": "7.9", "vote_count": "12000", "genres": "Drama"},
+            {"title": "Unknown", "vote_average": "", "vote_count": "0", "genres": "Comedy"},
+        ]
+
+    def test_few_votes_do_not_win(self):
+        ranked = WeightedRanker(min_votes=1000).rank_rows(self.rows, k=1)
+        self.assertEqual(ranked[0]["title"], "Crowd Favorite")
+        self.assertLess(ranked[0]["weighted_score"], 8.4)
+
+    def test_missing_rating_sorts_last(self):
+        ranked = WeightedRanker(prior="genre", min_group_size=1).rank_rows(self.rows)
+        self.assertEqual(ranked[-1]["title"], "Unknown")
+        self.assertIsNone(ranked[-1]["weighted_score"])
+
+    def test_value_group_keys_match_row_keys(self):
+        from datetime import date
+        ranker = WeightedRanker(prior="genre")
+        self.assertEqual(ranker.value_group_keys([r["genres"] for r in self.rows]), ranker.group_keys(self.rows))
+        years = WeightedRanker(prior="year").value_group_keys([2011, "2012-05-01", date(2013, 1, 1), "", None])
+        self.assertEqual(years, [2011, 2012, 2013, None, None])
+        self.assertIsNone(WeightedRanker().value_group_keys(["Drama"]))
+
+    def test_top_k_partial_selection(self):
+        self.assertEqual(list(top_k_indices([3.0, 9.0, 1.0, 7.0], 2)), [1, 3])
+
+    def test_critic_weighted_uses_group_prior(self):
+        import os, tempfile
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write("A,9,Drama\nA,9,Drama\nB,8,Drama\nC,7,Horror\nC,7,Horror\nD,7,Horror\n")
+        self.addCleanup(os.remove, path)
+        scores = {}
+        for prior in ("global", "genre"):
+            critic = CriticMovieReviewSystem(path, ranker=WeightedRanker(min_votes=2, prior=prior, min_group_size=1),
+                                             group_field=2)
+            critic.load_reviews()
+            critic.clean_reviews()
+            scores[prior] = {t: s for t, s, _ in critic.recommend_movies(rank_by="weighted")}
+        # Horror's prior (7.0) is lower than the global one, so a 1-review Horror title drops
+        self.assertLess(scores["genre"]["D"], scores["global"]["D"])
+        self.assertAlmostEqual(scores["genre"]["D"], 7.0)
+
+
+class TestStreamingReviewLoader(unittest.TestCase):
+
+    def setUp(self):
+        import gzip, os, tempfile
+        fd, self.path = tempfile.mkstemp(suffix=".csv.gz")
+        os.close(fd)
+        with gzip.open(self.path, "wt", encoding="utf-8", newline="") as f:
+            f.write('title,rating,review\n"Movie A",8.5,"Great, truly great\nmovie"\nMovie B,bad,Not bad.\n\n')
+        self.addCleanup(os.remove, self.path)
+
+    def test_quoting_and_typed_ratings(self):
+        rows = list(iter_movie_reviews(self.path, header=True))
+        self.assertEqual(rows[0], ["Movie A", 8.5, "Great, truly great\nmovie"])
+        self.assertIsNone(rows[1][1])
+        from review_loader import _parse_rating
+        self.assertEqual([_parse_rating(v) for v in ("nan", "inf", "-Infinity", "7")], [None, None, None, 7.0])
+
+    def test_column_mapping_and_chunks(self):
+        chunks = list(iter_review_chunks(self.path, 1, header=True,
+                                         columns=("review", "rating"), rating_field=1))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[1][0], ["Not bad.", None])
+
+    def test_eager_and_streaming_cleaning_agree(self):
+        import os, tempfile
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write("Great,8,fine\nGreat,8,fine\nSpoiler ahead,7,x\nOk,6,no spoilers here\n")
+        self.addCleanup(os.remove, path)
+        system = MovieReviewSystem(path)
+        self.assertEqual(len(system.load_reviews()), 4)
+        eager = system.clean_reviews()
+        chunked = [r for chunk in system.iter_cleaned_chunks(chunk_size=1) for r in chunk]
+        self.assertEqual(eager, chunked)
+        self.assertEqual(eager, list(system.as_pipeline()))
+        self.assertEqual([r[0] for r in eager], ["Great", "Ok"])
+
+
+class TestStreamPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [["Great movie!", 8.0], ["Spoiler: he dies", 6.0], ["Great movie!", 8.0], ["Meh", 4.0]]
+        self.stages = [dedupe_stage(), spoiler_filter_stage(), sentiment_stage()]
+
+    def test_lazy_and_threaded_agree(self):
+        pipe = StreamPipeline(iter(self.rows), self.stages, queue_size=1)
+        expected = [["Great movie!", 8.0, True], ["Meh", 4.0, False]]
+        self.assertEqual(list(pipe), expected)
+        pipe = StreamPipeline(iter(self.rows), self.stages, queue_size=1)
+        self.assertEqual(list(pipe.iter_threaded()), expected)
+
+    def test_async_runs_more_stages_than_default_executor_threads(self):
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        from review_stream import map_stage
+
+        async def run():
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+            pipe = StreamPipeline(range(1000), [map_stage(lambda x: x + 1)] * 8, queue_size=4)
+            return await asyncio.wait_for(pipe.arun(), 30)
+
+        self.assertEqual(asyncio.run(run()), 1000)
+
+    def test_review_pipeline_as_stream(self):
+        corpus = MemoryCorpus([{"title": "Movie X", "vote_average": 8.0, "overview": "Great fun"}])
+        rows = list(ReviewPipeline(corpus).stream("movie x"))
+        self.assertEqual(rows, [["TMDB users", "Great fun", 8.0]])
+
+
+class TestAsyncBuildReviews(unittest.TestCase):
+
+    def test_concurrent_requests_coalesce(self):
+        import asyncio
+        corpus = MemoryCorpus([{"title": "Movie X", "vote_average": 8.0, "overview": "Great fun"}])
+        pipeline = ReviewPipeline(corpus)
+        calls = []
+        original = pipeline._fetch_normalized
+        pipeline._fetch_normalized = lambda title: calls.append(title) or original(title)
+
+        async def run():
+            return await asyncio.gather(*[pipeline.abuild_reviews("Movie X") for _ in range(5)])
+
+        tables = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertIsNot(tables[0], tables[1])
+        self.assertEqual(tables[0].rows, [["TMDB users", "Great fun", 8.0]])
+        self.assertEqual(len(pipeline.table), 0)
+
+    def test_process_pool_executor(self):
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+        corpus = MemoryCorpus([{"title": "Movie X", "vote_average": 8.0, "overview": "Great fun"}])
+        pipeline = ReviewPipeline(corpus)
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            table = asyncio.run(pipeline.abuild_reviews("movie x", executor=pool))
+        self.assertEqual(table.rows, [["TMDB users", "Great fun", 8.0]])
+
+    def test_process_pool_sees_lazy_and_added_rows(self):
+        import asyncio
+        import csv
+        import os
+        import tempfile
+        from concurrent.futures import ProcessPoolExecutor
+        from columnar_io import ColumnarCorpus
+        from movie_oop_core import TMDBCSVCorpus
+        row = {"title": "Dune", "vote_average": "8.0", "overview": "Sand", "vote_count": "10"}
+        with tempfile.TemporaryDirectory() as tmp:
+            MemoryCorpus([row]).to_columnar(os.path.join(tmp, "c"), format="npcol")
+            columnar = ColumnarCorpus(os.path.join(tmp, "c"))
+            path = os.path.join(tmp, "movies.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+                writer.writerow(row)
+            csv_corpus = TMDBCSVCorpus(path)
+            csv_corpus.add_rows([dict(row, title="Arrival")])
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                dune = asyncio.run(ReviewPipeline(columnar).abuild_reviews("Dune", executor=pool))
+                arrival = asyncio.run(ReviewPipeline(csv_corpus).abuild_reviews("Arrival", executor=pool))
+        self.assertEqual(len(dune.rows), 1)
+        self.assertEqual(len(arrival.rows), 1)
+
+
+class TestIncrementalReviewTable(unittest.TestCase):
+
+    def test_normalizes_only_new_items(self):
+        review = {"author": "A", "content": " ok ", "author_details": {"rating": 7}}
+        table = ReviewTable([review])
+        self.assertEqual(table.normalize(), [["A", "ok", 7]])
+        table.add_reviews([dict(review, author="B")])
+        self.assertIsNone(table.rows)
+        table.normalize()
+        self.assertEqual([r[0] for r in table.rows], ["A", "B"])
+        self.assertEqual(table._watermark, 2)
+
+    def test_extend_accepts_iterables(self):
+        table = ReviewTable()
+        added = table.extend({"content": str(i), "author_details": {}} for i in range(3))
+        self.assertEqual(added, 3)
+        self.assertEqual(len(table), 3)
+        self.assertIsNone(table.rows[0][2])
+        self.assertEqual(ReviewTable().extend(["junk", {"content": "ok"}]), 1)
+
+    def test_ratings_keep_their_type(self):
+        import math
+        import movieclass_table_dataset
+        self.assertIs(movieclass_table_dataset.ReviewTable, ReviewTable)
+        table = ReviewTable([["A", "x", 7], ["B", "y", float("nan")], ["C", "z", 7.5], ["D", "w", "n/a"]])
+        rows = table.normalize()
+        self.assertEqual([type(r[2]) for r in rows], [int, float, float, str])
+        self.assertTrue(math.isnan(rows[1][2]))
+        with self.assertWarns(DeprecationWarning):
+            table.raw
+
+
+class TestReviewExport(unittest.TestCase):
+
+    def setUp(self):
+        import shutil, tempfile
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.table = ReviewTable()
+        self.table.extend({"author": a, "content": "x, y", "author_details": {"rating": 5.0}}
+                          for a in ["A", "B", "A", "A"])
+
+    def test_compressed_single_file(self):
+        import csv, gzip, os
+        path = os.path.join(self.dir, "out.csv.gz")
+        self.table.export_csv(path)
+        with gzip.open(path, "rt", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["Author", "Content", "Rating"])
+        self.assertEqual(rows[1], ["A", "x, y", "5.0"])
+
+    def test_sharded_by_key_with_manifest(self):
+        import json, os
+        manifest = self.table.export_csv(self.dir, shard_rows=2, shard_key=0, workers=2)
+        self.assertEqual(manifest["total_rows"], 4)
+        self.assertEqual([(s["key"], s["rows"]) for s in manifest["shards"]], [("A", 2), ("A", 1), ("B", 1)])
+        with open(os.path.join(self.dir, "manifest.json")) as f:
+            self.assertEqual(json.load(f)["total_rows"], 4)
+
+    def test_named_keys_for_list_and_dict_rows(self):
+        import os
+        from review_export import export_sharded
+        manifest = self.table.export_csv(os.path.join(self.dir, "by_author"), shard_key="Author")
+        self.assertEqual(sorted(s["key"] for s in manifest["shards"]), ["A", "B"])
+        cols = ["title", "genres", "release_date"]
+        dicts = [{"title": "X", "genres": "Drama, Crime", "release_date": "2011-05-01"}]
+        lists = [[d[c] for c in cols] for d in dicts]
+        for key, expected in (("year", 2011), ("genre", "Drama")):
+            keys = [export_sharded(rows, os.path.join(self.dir, f"{key}{i}"), key=key, columns=cols,
+                                   compression=None)["shards"][0]["key"]
+                    for i, rows in enumerate((dicts, lists))]
+            self.assertEqual(keys, [expected, expected])
+        with self.assertRaises(ValueError):
+            self.table.export_csv(os.path.join(self.dir, "bad"), shard_key="genre")
+
+    def test_clashing_keys_get_distinct_files_and_buffers_are_capped(self):
+        import os
+        from review_export import export_sharded
+        rows = [[k, i] for i, k in enumerate([None, "", "_", "a b", "a_b", "c", "c", "c"])]
+        manifest = export_sharded(rows, os.path.join(self.dir, "clash"), key=0, header=("k", "i"),
+                                  compression=None, shard_rows=3, max_buffered_rows=4)
+        files = [s["file"].lower() for s in manifest["shards"]]
+        self.assertEqual(len(files), len(set(files)))
+        self.assertEqual(manifest["total_rows"], 8)
+        for entry in manifest["shards"]:
+            with open(os.path.join(self.dir, "clash", entry["file"])) as f:
+                self.assertEqual(len(f.read().splitlines()) - 1, entry["rows"])
+
+    def test_export_reviews_accepts_generators(self):
+        import os
+        from movie_oop_core import export_reviews_to_csv
+        path = os.path.join(self.dir, "gen.csv")
+        export_reviews_to_csv((["A", "ok", 7] for _ in range(2)), path)
+        with open(path) as f:
+            self.assertEqual(f.read().splitlines(), ["Author,Content,Rating", "A,ok,7", "A,ok,7"])
+        with self.assertRaises(ValueError):
+            export_reviews_to_csv(iter([]), path)
+
+
+class TestColumnarIO(unittest.TestCase):
+
+    def setUp(self):
+        import shutil, tempfile
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_corpus_round_trip_keeps_types(self):
+        import os
+        from columnar_io import ColumnarCorpus
+        corpus = MemoryCorpus([
+            {"title": "Movie X", "vote_average": "8.0", "vote_count": "12", "overview": "Fun", "homepage": ""},
+            {"title": "Movie Y", "vote_average": "", "vote_count": "3", "overview": "Dull", "homepage": "x"},
+        ])
+        path = os.path.join(self.dir, "corpus")
+        corpus.to_columnar(path, format="npcol")
+        loaded = ColumnarCorpus(path)
+        loaded.load()
+        self.assertEqual(loaded.table.values("vote_count"), [12, 3])
+        self.assertEqual(loaded.table.values("homepage"), ["", "x"])
+        self.assertEqual(loaded.find_reviews_by_title("movie"), corpus.find_reviews_by_title("movie"))
+
+    def test_projection_and_review_table(self):
+        import os
+        from columnar_io import read_columnar
+        table = ReviewTable([{"author": "A", "content": "ok", "author_details": {"rating": None}}])
+        path = os.path.join(self.dir, "reviews")
+        table.to_columnar(path, format="npcol")
+        self.assertEqual(read_columnar(path, ["author"]).column_names, ["author"])
+        self.assertEqual(ReviewTable.from_columnar(path).rows, [["A", "ok", None]])
+
+    def test_review_table_odd_ratings_keep_numeric_column(self):
+        import os
+        from columnar_io import ColumnarCorpus, read_columnar
+        table = ReviewTable([["A", "x", 8.0], ["B", "y", 7], ["C", "z", "n/a"]])
+        path = os.path.join(self.dir, "odd")
+        table.to_columnar(path, format="npcol")
+        self.assertEqual(read_columnar(path).schema["rating"], "float64")
+        rows = ReviewTable.from_columnar(path).rows
+        self.assertEqual(rows, [["A", "x", 8.0], ["B", "y", 7], ["C", "z", "n/a"]])
+        self.assertIs(type(rows[1][2]), int)
+        MemoryCorpus([{"title": "Movie X", "vote_average": "8.0"}]).to_columnar(path + "_c", format="npcol")
+        corpus = ColumnarCorpus(path + "_c")
+        self.assertEqual(corpus.find_reviews_by_title("movie x")[0]["author_details"], {"rating": 8.0})
+        self.assertEqual(corpus._rows, [])
+        self.assertEqual([r["title"] for r in corpus.load()], ["Movie X"])
+        corpus.add_rows([{"title": "Movie Y", "vote_average": 6.0, "overview": "Added"}])
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus.find_reviews_by_title("movie y")[0]["content"], "Added")
+
+
+class TestRatingStats(unittest.TestCase):
+
+    def test_merge_matches_single_pass(self):
+        values = [float(i % 10) for i in range(1000)]
+        whole = RatingStats().update(values)
+        left = RatingStats().update(values[:300])
+        right = RatingStats().update_array(values[300:])
+        merged = left.merge(right)
+        self.assertEqual(merged.count, 1000)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance)
+        self.assertEqual((merged.min, merged.max), (0.0, 9.0))
+
+    def test_quantiles_and_serialization(self):
+        stats = RatingStats().update(range(10001))
+        self.assertAlmostEqual(stats.quantile(0.5), 5000, delta=200)
+        restored = RatingStats.from_dict(stats.to_dict())
+        self.assertEqual(restored.quantile(0.9), stats.quantile(0.9))
+
+    def test_data_clean_uses_stats(self):
+        cleaner = DataClean({"ratings": [4.5, 3.0, 5.0, None, "bad", 4.0]})
+        self.assertAlmostEqual(cleaner.average_rating(), 4.125)
+        self.assertEqual(cleaner.rating_stats()["count"], 4)
+
+
+class TestGroupedQuantiles(unittest.TestCase):
+
+    def setUp(self):
+        from group_quantiles import GroupedQuantiles
+        self.rows = [
+            {"title": f"M{i}", "genres": "Drama, Comedy" if i % 2 else "Drama", "release_date": f"{2010 + i % 3}-01-01",
+             "vote_average": str(i % 10), "runtime": str(80 + i), "revenue": "0", "popularity": "1.5"}
+            for i in range(100)
+        ]
+        self.sketches = GroupedQuantiles()
+        corpus = MemoryCorpus(self.rows)
+        corpus.add_observer(self.sketches)
+
+    def test_filled_during_ingest_and_grouped(self):
+        self.assertEqual(self.sketches.rows_seen, 100)
+        self.assertEqual(self.sketches.count("runtime", "Drama"), 100)
+        self.assertEqual(self.sketches.count("runtime", "Comedy"), 50)
+        self.assertEqual(self.sketches.count("revenue", "Drama"), 0)  # 0 = unknown
+        self.assertEqual(self.sketches.groups("year"), [2010, 2011, 2012])
+        self.assertAlmostEqual(self.sketches.table("runtime")["Drama"]["p50"], 130, delta=2)
+
+    def test_merge_and_serialize(self):
+        from group_quantiles import GroupedQuantiles
+        restored = GroupedQuantiles.from_dict(self.sketches.to_dict())
+        restored.merge(self.sketches)
+        self.assertEqual(restored.count("vote_average", 2011, by="year"), 66)
+
+    def test_reload_resets_observers(self):
+        import csv, os, tempfile
+        from group_quantiles import GroupedQuantiles
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.rows[0]) + ["vote_count"])
+            writer.writeheader()
+            writer.writerows(dict(r, vote_count="5") for r in self.rows)
+        self.addCleanup(os.remove, path)
+        corpus = TMDBCSVCorpus(path)
+        sketches = GroupedQuantiles()
+        corpus.add_observer(sketches)
+        rollups = corpus.release_rollups()
+        distinct = corpus.track_distinct(["title"], by=["all"])
+        indexes = corpus.index_set()
+        for _ in range(2):
+            corpus.load()
+        self.assertEqual(sketches.rows_seen, 100)
+        self.assertEqual(sketches.count("runtime", "Drama"), 100)
+        self.assertEqual(rollups.series("year"), ([2010, 2011, 2012], [34, 33, 33]))
+        self.assertEqual(distinct.rows_seen, 100)
+        self.assertIs(corpus.index_set(), indexes)
+        self.assertEqual(len(corpus.range_filter(runtime=(None, 89))), 10)
+
+
+class TestBatchClean(unittest.TestCase):
+
+    def test_grouped_batch_matches_across_workers(self):
+        from batch_clean import group_reviews, clean_movies_batch
+        records = [(1, "Great film", 8), (1, "Great film", 9), (1, None, None),
+                   (2, "Awful", 2), (3, "Amazing and good", 10)]
+        serial = clean_movies_batch(group_reviews(records), workers=1, chunk_size=2)
+        parallel = clean_movies_batch(group_reviews(records), workers=2, chunk_size=1)
+        self.assertEqual(serial.columns, parallel.columns)
+        self.assertEqual(serial.column("movie_id"), [1, 2, 3])
+        first = serial.rows()[0]
+        self.assertEqual((first["n_reviews"], first["n_clean"], first["n_positive"]), (3, 1, 1))
+        self.assertAlmostEqual(first["avg_rating"], 8.5)
+
+    def test_group_reviews_carries_plot(self):
+        from batch_clean import group_reviews, clean_movies_batch
+        plot = "A thief steals dreams. He is offered one last job. It goes wrong."
+        records = [(1, "Great", 8, plot), (1, "Fine", 7, plot), (2, "Bad", 3, "")]
+        groups = list(group_reviews(records, plot_field=3))
+        self.assertEqual(groups[0][1]["plot"], plot)
+        self.assertNotIn("plot", groups[1][1])
+        summaries = clean_movies_batch(iter(groups), workers=None).column("summary")
+        self.assertTrue(summaries[0])
+        self.assertEqual(summaries[1], "")
+
+    def test_numeric_string_ratings_count(self):
+        from batch_clean import group_reviews, clean_movies_batch
+        records = [(1, "Great", "8"), (1, "Fine", 7), (2, "Bad", "3"), (2, "Meh", "n/a")]
+        table = clean_movies_batch(group_reviews(records), workers=2, chunk_size=1)
+        self.assertEqual(table.column("avg_rating"), [7.5, 3.0])
+
+
+class TestStreamingReviewCleaner(unittest.TestCase):
+
+    def test_normalized_lazy_dedupe(self):
+        cleaner = ReviewCleaner()
+        stream = iter(["Great  Movie!", "great movie!", None, "\uff27reat movie!", "", "So-so."])
+        self.assertEqual(list(cleaner.iter_clean(stream)), ["Great  Movie!", "So-so."])
+
+    def test_bloom_mode_and_list_semantics(self):
+        cleaner = ReviewCleaner(bloom=True, capacity=1000, fp_rate=0.01)
+        kept = list(cleaner.iter_clean(f"review {i % 300}" for i in range(3000)))
+        self.assertGreaterEqual(len(kept), 295)
+        self.assertLessEqual(len(kept), 300)
+        self.assertEqual(cleaner.clean_review(["a", "A", "a"]), ["a", "A"])
+        with self.assertRaises(TypeError):
+            cleaner.clean_review("not a list")
+
+
+class TestBatchPlotSummarizer(unittest.TestCase):
+
+    def test_word_and_sentence_boundaries(self):
+        from plot_summary import truncate_words, truncate_sentences
+        self.assertEqual(truncate_words("A hero rises to challenge the status quo", 20), "A hero rises to...")
+        self.assertEqual(truncate_sentences("One. Two two. Three three three.", 15), "One. Two two.")
+        from plot_summary import truncate_chars
+        for n in (1, 2, 3, 4):
+            self.assertLessEqual(len(truncate_words("Unbelievable heroics", n)), n)
+            self.assertLessEqual(len(truncate_chars("Unbelievable heroics", n)), n)
+
+    def test_empty_vocabulary_counts_as_fitted(self):
+        summarizer = PlotSummarizer()
+        summarizer.summarize_batch(["!!!", "..."], max_length=2, mode="extractive")
+        batch = summarizer._batch[(2, "extractive")]
+        self.assertTrue(batch.fitted)
+        summarizer.summarize_batch(["!!!"], max_length=2, mode="extractive")
+        self.assertEqual(batch.hits, 1)
+
+    def test_batch_memoized_and_extractive(self):
+        plots = ["A heist crew robs dreams. They eat lunch.", "Dreams collapse during a heist. Rain falls.",
+                 "A heist crew robs dreams. They eat lunch.", None]
+        out = PlotSummarizer().summarize_batch(plots, max_length=30, mode="extractive")
+        self.assertEqual(out[0], "A heist crew robs dreams.")
+        self.assertIsNone(out[3])
+        from plot_summary import BatchPlotSummarizer
+        summarizer = BatchPlotSummarizer(30)
+        summarizer.summarize_many(plots)
+        self.assertEqual((summarizer.misses, summarizer.hits), (2, 1))
+
+    def test_cache_rejects_other_corpus_weights(self):
+        import os, tempfile
+        from plot_summary import BatchPlotSummarizer
+        plots = ["A heist crew robs dreams. They eat lunch.", "Dreams collapse during a heist. Rain falls."]
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        saved = BatchPlotSummarizer(30, mode="extractive").fit(plots)
+        saved.summarize_many(plots)
+        saved.save_cache(path)
+        self.assertEqual(BatchPlotSummarizer(30, mode="extractive").fit(plots).load_cache(path), 2)
+        self.assertEqual(BatchPlotSummarizer(30, mode="extractive").fit(["Lunch lunch."]).load_cache(path), 0)
+        self.assertEqual(BatchPlotSummarizer(30, mode="word").load_cache(path), 0)
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_core_modules_skip_heavy_imports(self):
+        import subprocess, sys, os
+        code = ("import sys, movie_library, movie_oop_core, Data_Clean, Dataset, Movie_Review_System;"
+                "print(sorted(m for m in ('numpy', 'pandas', 'matplotlib', 'seaborn', 'asyncio') if m in sys.modules))")
+        here = os.path.dirname(os.path.abspath(__file__))
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=here,
+                             env=dict(os.environ, PYTHONPATH=here))
+        self.assertEqual(out.stdout.strip(), "[]", out.stderr)
+
+    def test_lazy_module_loads_on_first_use(self):
+        from lazy_imports import LazyModule
+        mod = LazyModule("json")
+        self.assertFalse(mod.loaded)
+        self.assertEqual(mod.dumps([1]), "[1]")
+        self.assertTrue(mod.loaded)
+
+
+class TestQueryServer(unittest.TestCase):
+
+    def _write(self, path, rows):
+        import csv
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["title", "vote_average", "vote_count", "genres", "release_date", "overview"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def test_queries_and_hot_reload(self):
+        import os, tempfile, threading
+        from query_server import CorpusService, CorpusClient, make_server
+        rows = [{"title": f"Movie {i}", "vote_average": str(5 + i % 5), "vote_count": str(10 * (i + 1)),
+                 "genres": "Drama, Comedy" if i % 2 else "Action", "release_date": f"{2010 + i}-05-01",
+                 "overview": f"Plot {i}"} for i in range(10)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tmdb.csv")
+            self._write(path, rows)
+            service = CorpusService(path, poll_interval=0)
+            server = make_server(service, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                client = CorpusClient(f"http://127.0.0.1:{server.server_address[1]}")
+                self.assertEqual(client.health()["rows"], 10)
+                self.assertEqual([r["title"] for r in client.titles("movie 3")], ["Movie 3"])
+                self.assertEqual(client.reviews("Movie 3")[0][2], 8.0)
+                self.assertEqual(len(client.filter(genre="drama", year_min=2015)), 3)
+                self.assertEqual(client.top(k=1, by="vote_count", fields="title")[0]["title"], "Movie 9")
+                self.assertEqual(client.aggregate("vote_average", by="genre")["action"]["count"], 5)
+                with self.assertRaises(ValueError):
+                    client.top(by="no_such_column")
+
+                self._write(path, rows + [dict(rows[0], title="Movie 10")])
+                self.assertTrue(service.check_for_changes())
+                self.assertEqual(client.health()["rows"], 11)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    def test_handler_errors_and_nan_cells(self):
+        import http.client, json, os, tempfile, threading
+        from query_server import CorpusService, CorpusClient, make_server
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tmdb.csv")
+            self._write(path, [{"title": "A", "vote_average": "7", "vote_count": "5", "release_date": "2015-01-01"}])
+            service = CorpusService(path, poll_interval=0)
+            service.titles = lambda params: {"rows": [{"title": "A", "vote_average": float("nan")}]}
+            service.filter = lambda params: {}["no_such_column"]
+            server = make_server(service, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                port = server.server_address[1]
+                client = CorpusClient(f"http://127.0.0.1:{port}")
+                self.assertEqual(client.titles("a"), [{"title": "A", "vote_average": None}])
+                conn = http.client.HTTPConnection("127.0.0.1", port)
+                conn.request("GET", "/titles?q=a")
+                json.loads(conn.getresponse().read(), parse_constant=lambda c: self.fail(c))
+                conn.close()
+                with self.assertRaises(RuntimeError):
+                    client.filter()
+                with self.assertRaises(KeyError):
+                    client.get("nope")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    def test_failed_reload_keeps_snapshot_and_watcher(self):
+        import os, tempfile, time
+        from query_server import CorpusService
+        broken = [False]
+
+        def factory(path):
+            if broken[0]:
+                raise KeyError("vote_count")
+            return TMDBCSVCorpus(path)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tmdb.csv")
+            self._write(path, [{"title": "A", "vote_average": "7", "vote_count": "5", "release_date": "2015-01-01"}])
+            service = CorpusService(path, poll_interval=0.01, corpus_factory=factory)
+            before = service.snapshot
+            broken[0] = True
+            with self.assertLogs("query_server", level="WARNING"):
+                self.assertFalse(service.reload())
+            self.assertIs(service.snapshot, before)
+            self.assertIn("KeyError", service.last_error)
+            service.check_for_changes = lambda: 1 / 0  # watcher must survive any error
+            with self.assertLogs("query_server", level="ERROR"):
+                service.start()
+                try:
+                    time.sleep(0.05)
+                    self.assertTrue(service._watcher.is_alive())
+                finally:
+                    service.stop()
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        from query_cache import QueryCache
+        self.now = [0.0]
+        self.cache = QueryCache(max_entries=2, ttl=10, clock=lambda: self.now[0])
+
+    def test_lru_ttl_and_stats(self):
+        self.cache.put("a", [1])
+        self.cache.put("b", [2])
+        self.assertEqual(self.cache.get("a"), [1])
+        self.cache.put("c", [3])  # evicts b, the least recently used
+        self.assertNotIn("b", self.cache)
+        self.now[0] = 11
+        self.assertIsNone(self.cache.get("a"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]), (1, 1, 1, 1))
+
+    def test_corpus_lookups_cached_until_rows_change(self):
+        corpus = MemoryCorpus([{"title": "Dune", "overview": "Sand.", "vote_average": "8", "genres": "Drama",
+                                "release_date": "2021-10-22", "vote_count": "10"}])
+        corpus.set_cache(self.cache)
+        first = corpus.find_reviews_by_title("dune")
+        first[0]["content"] = "mutated"
+        self.assertEqual(corpus.find_reviews_by_title(" DUNE ")[0]["content"], "Sand.")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        corpus.add_rows([{"title": "Dune: Part Two", "overview": "More sand.", "vote_average": "8.5"}])
+        self.assertEqual(len(corpus.find_reviews_by_title("dune")), 2)
+        self.assertEqual(len(corpus.filter_rows(genre="drama", year_min=2020)), 1)
+
+    def test_shared_cache_never_mixes_corpora(self):
+        import gc
+        tokens = set()
+        for title in ("Dune", "Heat", "Alien"):
+            corpus = MemoryCorpus([{"title": title, "overview": title + " plot", "vote_average": "7"}])
+            corpus.set_cache(self.cache)
+            self.assertEqual([r["content"] for r in corpus.find_reviews_by_title("")], [title + " plot"])
+            self.assertNotIn(corpus.cache_token, tokens)
+            tokens.add(corpus.cache_token)
+            del corpus
+            gc.collect()  # a new corpus may now get the same id(), never the same token
+
+
+class TestSyntheticTMDB(unittest.TestCase):
+
+    def test_generator_is_deterministic_and_loadable(self):
+        import os, sys, tempfile
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "benchmarks"))
+        from synth_tmdb import COLUMNS, write_synthetic_csv
+        from movie_oop_core import load_db
+        with tempfile.TemporaryDirectory() as tmp:
+            a, b = os.path.join(tmp, "a.csv"), os.path.join(tmp, "b.csv")
+            write_synthetic_csv(a, 300, seed=7)
+            write_synthetic_csv(b, 300, seed=7)
+            with open(a, "rb") as fa, open(b, "rb") as fb:
+                self.assertEqual(fa.read(), fb.read())
+            rows = load_db(a)
+            self.assertGreater(len(rows), 200)
+            self.assertEqual(len(COLUMNS), 24)
+            self.assertTrue(set(COLUMNS) <= set(rows[0]))
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_pipeline_stages_and_exports(self):
+        import json
+        from metrics import MetricsRegistry
+        from query_cache import QueryCache
+        registry = MetricsRegistry(trace_memory=True)
+        corpus = MemoryCorpus([{"title": "Dune", "overview": "Sand.", "vote_average": "8"}])
+        pipe = ReviewPipeline(corpus, cache=QueryCache(), metrics=registry)
+        pipe.build_reviews("Dune")
+        pipe.build_reviews("dune")
+        normalize = registry.stage_stats("pipeline.normalize")
+        self.assertEqual((normalize["calls"], normalize["rows_in"], normalize["rows_out"]), (2, 2, 2))
+        self.assertIn("peak_bytes", normalize)
+        self.assertEqual(registry.counter("cache_hits", stage="pipeline.find_reviews"), 1)
+        text = registry.to_prometheus()
+        self.assertIn('tmdb_stage_rows_out_total{stage="pipeline.find_reviews"} 2.0', text)
+        self.assertIn("# TYPE tmdb_cache_hits_total counter", text)
+        self.assertEqual(len(json.loads(registry.to_json())["stages"]), 2)
+
+    def test_label_escaping_and_reserved_stage_label(self):
+        from metrics import MetricsRegistry
+        registry = MetricsRegistry()
+        registry.count("rows", 1, source='a "b"\\c\nd')
+        self.assertIn('tmdb_rows_total{source="a \\"b\\"\\\\c\\nd"} 1', registry.to_prometheus())
+        with self.assertRaises(ValueError):
+            registry.stage("load", stage="x")
+
+    def test_memory_tracing_stops_after_outermost_stage(self):
+        import tracemalloc
+        from metrics import MetricsRegistry
+        registry = MetricsRegistry(trace_memory=True)
+        with registry.stage("outer"):
+            big = bytearray(1_000_000)
+            with registry.stage("inner"):
+                pass
+            self.assertTrue(tracemalloc.is_tracing())
+            del big
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreaterEqual(registry.stage_stats("outer")["peak_bytes"], 1_000_000)
+
+    def test_disabled_registry_records_nothing(self):
+        from metrics import MetricsRegistry
+        registry = MetricsRegistry(enabled=False)
+        with registry.stage("x") as st:
+            st.rows_in = 5
+        registry.count("bytes_read", 10)
+        self.assertEqual(registry.to_dict(), {"stages": [], "counters": []})
+
+
+class TestShardedCorpus(unittest.TestCase):
+
+    def test_fan_out_and_shard_pruning(self):
+        import csv, os, tempfile
+        from sharded_corpus import ShardedCorpus
+        shards = [
+            [("Old Dune", "2011-01-01", "50", "Drama"), ("Old Hit", "2012-05-01", "900", "Action")],
+            [("New Dune", "2023-03-01", "700", "Drama, Science Fiction")],
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, rows in enumerate(shards):
+                with open(os.path.join(tmp, f"part_{i}.csv"), "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["title", "release_date", "vote_count", "genres", "vote_average", "overview"])
+                    writer.writerows(row + ("7.5", "Sand.") for row in rows)
+            with open(os.path.join(tmp, "shards.txt"), "w", encoding="utf-8") as f:
+                f.write("part_0.csv\npart_1.csv\n")
+            corpus = ShardedCorpus(os.path.join(tmp, "shards.txt"))
+            self.assertEqual(len(corpus.find_reviews_by_title("dune")), 2)
+            self.assertEqual([s.year_max for s in corpus.shard_stats], [2012, 2023])
+            self.assertFalse(corpus.shard_stats[0].may_match(year_min=2020))
+            self.assertEqual([r["title"] for r in corpus.filter_rows(genre="drama", year_min=2020)], ["New Dune"])
+            self.assertEqual(len(ShardedCorpus(os.path.join(tmp, "part_*.csv")).filter_rows(min_votes=500)), 2)
+
+
+class TestYearPartitions(unittest.TestCase):
+
+    def test_partitioned_loads_read_only_matching_years(self):
+        import csv, os, tempfile
+        from movie_oop_core import load_db
+        from movieclass_table_dataset import MovieDataset
+        from year_partitions import repartition_by_year, select_partitions
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "movies.csv")
+            with open(src, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["title", "release_date", "vote_count", "vote_average"])
+                writer.writerows([["A", "2011-02-03", "5", "7"], ["B", "2021-01-01", "80", "6"],
+                                  ["C", "", "9", "5"], ["D", "2021-07-07", "3", "8"]])
+            out = os.path.join(tmp, "by_year")
+            catalog = repartition_by_year(src, out)
+            self.assertEqual([(p["year"], p["rows"]) for p in catalog["partitions"]], [(2011, 1), (2021, 2), (None, 1)])
+            self.assertEqual([p["year"] for p in select_partitions(catalog, 2015, 2025)], [2021])
+            self.assertEqual(sorted(r["title"] for r in load_db(out)), ["A", "B", "D"])
+            self.assertEqual([r["title"] for r in MovieDataset(out, 2020, 2025, min_votes=10).load()], ["B"])
+
+    def test_partitioned_dataset_matches_csv_and_ignores_extra_fields(self):
+        import os, tempfile
+        from movieclass_table_dataset import MovieDataset
+        from year_partitions import repartition_by_year
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "movies.csv")
+            with open(src, "w", newline="", encoding="utf-8") as f:
+                f.write("title,release_date,vote_count\nA,2021-01-01,0\nB,2021-02-02,4\nC,2021-03-03,5,extra\n")
+            out = os.path.join(tmp, "by_year")
+            repartition_by_year(src, out)
+            from_csv = [r["title"] for r in MovieDataset(src, min_votes=0).load()]
+            self.assertEqual(from_csv, ["B", "C"])
+            self.assertEqual([r["title"] for r in MovieDataset(out, min_votes=0).load()], from_csv)
+
+
+class TestSampling(unittest.TestCase):
+
+    def setUp(self):
+        genres = ["Drama"] * 90 + ["Western"] * 10
+        self.rows = [{"title": f"M{i}", "genres": g, "vote_average": i % 10} for i, g in enumerate(genres)]
+
+    def test_reservoir_is_seeded_and_estimates_mean(self):
+        from sampling import reservoir_sample
+        a = reservoir_sample(iter(self.rows), 40, seed=3)
+        self.assertEqual([r["title"] for r in a.rows], [r["title"] for r in reservoir_sample(self.rows, 40, seed=3).rows])
+        self.assertEqual(a.population, 100)
+        est = a.mean("vote_average")
+        low, high = est.ci95
+        self.assertLess(low, 4.5)
+        self.assertGreater(high, 4.5)
+        self.assertEqual(reservoir_sample(self.rows, 200).mean("vote_average").stderr, 0.0)
+
+    def test_stratified_keeps_small_strata_and_counts(self):
+        from sampling import stratified_sample
+        sample = stratified_sample(self.rows, 5, by="genre", seed=1)
+        self.assertEqual(sample.strata, {"Drama": (5, 90), "Western": (5, 10)})
+        self.assertAlmostEqual(sample.count(lambda r: r["genres"] == "Western").value, 10)
+        self.assertAlmostEqual(sum(sample.weights), 100)
+
+    def test_dataset_sample_with_estimates(self):
+        import pandas as pd
+        from Dataset import Dataset
+        data = Dataset(pd.DataFrame([dict(r, release_date="2020-01-01") for r in self.rows]))
+        sample = data.draw_sample(5, by="genre", seed=1)
+        self.assertEqual(sample.strata, {"Drama": (5, 90), "Western": (5, 10)})
+        self.assertAlmostEqual(sample.count().value, 100)
+        self.assertGreater(sample.mean("vote_average").stderr, 0)
+        frame = data.sample(5, by="genre", seed=1).get_data()
+        self.assertEqual(sorted(frame["title"]), sorted(r["title"] for r in sample.rows))
+
+
+class TestHyperLogLog(unittest.TestCase):
+
+    def test_estimate_merge_and_round_trip(self):
+        from hll import HyperLogLog
+        a = HyperLogLog().update(range(20000))
+        b = HyperLogLog().update(range(10000, 30000))
+        self.assertLess(abs(a.estimate() - 20000) / 20000, 0.05)
+        merged = a.copy().merge(b)
+        self.assertLess(abs(merged.estimate() - 30000) / 30000, 0.05)
+        self.assertEqual(HyperLogLog.from_dict(merged.to_dict()).estimate(), merged.estimate())
+        with self.assertRaises(ValueError):
+            a.merge(HyperLogLog(p=10))
+
+    def test_corpus_approx_distinct(self):
+        corpus = MemoryCorpus([
+            {"title": "A", "keywords": "space, robot", "release_date": "2020-01-01", "genres": "Drama"},
+            {"title": "B", "keywords": "robot, heist", "release_date": "2021-01-01", "genres": "Drama"},
+        ])
+        self.assertEqual(corpus.approx_distinct("keywords"), 3)
+        self.assertEqual(corpus.approx_distinct("keywords", group_by="year"), {2020: 2, 2021: 2})
+        corpus.add_rows([{"title": "C", "keywords": "zombie", "release_date": "2021-05-05"}])
+        self.assertEqual(corpus.approx_distinct("keywords"), 4)
+
+
+class TestKeywordGraph(unittest.TestCase):
+
+    def setUp(self):
+        from keyword_graph import KeywordGraph
+        self.rows = [
+            {"title": "Alien", "keywords": "space, monster, robot"},
+            {"title": "Aliens", "keywords": "Space, monster, marine"},
+            {"title": "Heat", "keywords": "heist, robbery"},
+            {"title": "Wall-E", "keywords": "space, robot"},
+        ]
+        self.graph = KeywordGraph.build(self.rows, chunk_size=2)
+
+    def test_cooccurrence_and_related(self):
+        self.assertEqual(self.graph.cooccurrence("space", "monster"), 2)
+        self.assertEqual(self.graph.cooccurrence("heist", "space"), 0)
+        related = self.graph.related_keywords("space", top_k=2, by="count")
+        self.assertEqual([(k, n) for k, _, n in related], [("monster", 2), ("robot", 2)])
+
+    def test_similar_movies_and_persistence(self):
+        import tempfile
+        from keyword_graph import KeywordGraph
+        self.assertEqual(self.graph.similar_movies("alien", top_k=2), [("Aliens", 2.0), ("Wall-E", 2.0)])
+        with tempfile.TemporaryDirectory() as tmp:
+            self.graph.save(tmp)
+            loaded = KeywordGraph.load(tmp)
+        self.assertEqual(loaded.movie_keywords("Heat"), ["heist", "robbery"])
+        self.assertEqual(loaded.cooccurrence("robot", "space"), 2)
+
+
+class TestRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"title": "A", "release_date": "2020-01-15", "genres": "Drama, Comedy"},
+            {"title": "B", "release_date": "2020-03-02", "genres": "Drama"},
+            {"title": "C", "release_date": "2020-05", "genres": "Horror"},
+            {"title": "D", "release_date": "not a date", "genres": "Drama"},
+        ]
+
+    def test_series_rolling_and_frame_agree(self):
+        import pandas as pd
+        from rollups import ReleaseRollups
+        rollups = ReleaseRollups().update(self.rows)
+        self.assertEqual(rollups.undated, 1)
+        self.assertEqual(rollups.series("month"), (["2020-01", "2020-02", "2020-03", "2020-04", "2020-05"],
+                                                   [1, 0, 1, 0, 1]))
+        self.assertEqual(rollups.series("quarter", genre="Drama"), (["2020Q1"], [2]))
+        self.assertEqual(rollups.rolling("month", 2)[1], [1, 1, 1, 1, 1])
+        frame = ReleaseRollups.from_frame(pd.DataFrame(self.rows))
+        self.assertEqual(sorted(frame.to_dict()["counts"]["day"]), sorted(rollups.to_dict()["counts"]["day"]))
+        self.assertEqual(frame.frame("year", ["Drama"]).values.tolist(), [[2020, "Drama", 2]])
+
+    def test_incremental_and_merge(self):
+        from rollups import ReleaseRollups
+        corpus = MemoryCorpus(self.rows[:2])
+        rollups = corpus.release_rollups()
+        corpus.add_rows(self.rows[2:])
+        other = ReleaseRollups().update(self.rows[:1])
+        self.assertEqual(rollups.series("year"), ([2020], [3]))
+        self.assertEqual(ReleaseRollups.from_dict(rollups.to_dict()).merge(other).series("year"), ([2020], [4]))
+
+    def test_from_frame_parsed_dates_missing_genres_and_spaces(self):
+        import io
+        import pandas as pd
+        from rollups import ReleaseRollups
+        text = "title,release_date,genres\nA,2020-01-15,Drama\nB,,Drama\nC,2021-06-30,\n"
+        parsed = ReleaseRollups.from_frame(pd.read_csv(io.StringIO(text), parse_dates=["release_date"]))
+        self.assertEqual((parsed.series("year"), parsed.undated), (([2020, 2021], [1, 1]), 1))
+        self.assertEqual(parsed.series("day", genre="Drama", fill=False), (["2020-01-15"], [1]))
+        no_genres = pd.DataFrame({"release_date": ["2020-01-15", "2021-02-01"], "genres": [None, None]})
+        self.assertEqual(ReleaseRollups.from_frame(no_genres).genres(), [])
+        rows = [{"release_date": " 2020-02-01", "genres": "Drama"}]
+        self.assertEqual(ReleaseRollups.from_frame(pd.DataFrame(rows)).series("month"),
+                         ReleaseRollups().update(rows).series("month"))
+
+
+class TestRangeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"title": "A", "budget": "1000", "runtime": "85", "popularity": "5.5", "genres": "Horror",
+             "release_date": "2015-01-01", "vote_count": "10"},
+            {"title": "B", "budget": "5000", "runtime": "120", "popularity": "9.0", "genres": "Drama, Horror",
+             "release_date": "2016-01-01", "vote_count": "20"},
+            {"title": "C", "budget": "", "runtime": "88", "popularity": "1.0", "genres": "Comedy",
+             "release_date": "2016-06-01", "vote_count": "x"},
+            {"title": "D", "budget": "3000", "runtime": "95", "popularity": "7.2", "genres": "Horror",
+             "release_date": "2017-01-01", "vote_count": "5"},
+        ]
+
+    def test_ranges_terms_and_order(self):
+        from range_index import IndexSet
+        indexes = IndexSet.build(self.rows)
+        budget = indexes.range_index("budget")
+        self.assertEqual(budget.between(2000, None).tolist(), [3, 1])
+        self.assertEqual(budget.count(hi=3000, hi_inclusive=False), 1)
+        self.assertEqual([v for v, _ in budget.iter_ordered(descending=True)], [5000.0, 3000.0, 1000.0])
+        self.assertEqual(indexes.query({"runtime": (None, 100)}, {"genres": "horror"}).tolist(), [0, 3])
+        self.assertEqual(indexes.query({"year": 2016}).tolist(), [1, 2])
+        self.assertEqual(indexes.query(order_by="budget", descending=True).tolist(), [1, 3, 0, 2])
+        incremental = IndexSet().update(self.rows)
+        self.assertEqual(incremental.query({"popularity": (5, 8)}).tolist(), [0, 3])
+
+    def test_dataset_and_corpus_filters(self):
+        import csv
+        import os
+        import tempfile
+        from movieclass_table_dataset import MovieDataset
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "movies.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=list(self.rows[0]))
+                writer.writeheader()
+                writer.writerows(r for r in self.rows if r["vote_count"].isdigit())
+            ds = MovieDataset(path, min_votes=6)
+            self.assertEqual([r["title"] for r in ds.filter(genre="Horror", budget=(None, 6000))], ["A", "B"])
+        corpus = MemoryCorpus(self.rows[:2])
+        self.assertEqual([r["title"] for r in corpus.range_filter(runtime=(80, 130), order_by="popularity",
+                                                                  descending=True)], ["B", "A"])
+        corpus.add_rows(self.rows[2:])
+        self.assertEqual([r["title"] for r in corpus.range_filter(runtime=(None, 90))], ["A", "C"])
+
+
+class TestFilterExpr(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"title": "Alien", "genres": "Horror, Science Fiction", "vote_count": "900", "runtime": "117",
+             "release_date": "1979-05-25", "original_language": "en"},
+            {"title": "Amelie", "genres": "Comedy, Romance", "vote_count": "500", "runtime": "122",
+             "release_date": "2001-04-25", "original_language": "fr"},
+            {"title": "Heat", "genres": "Crime, Drama, Thriller", "vote_count": "700", "runtime": "170",
+             "release_date": "1995-12-15", "original_language": "en"},
+            {"title": "Tiny", "genres": "Drama", "vote_count": "", "runtime": "80",
+             "release_date": "2020-01-01", "original_language": "en"},
+        ]
+
+    def test_parse_and_strategies_agree(self):
+        import pandas as pd
+        from filter_expr import compile_filter
+        from range_index import IndexSet
+        indexes = IndexSet.build(self.rows)
+        frame = pd.DataFrame(self.rows)
+        cases = {
+            "genre in ('Drama', 'Thriller') and vote_count >= 100 and runtime < 180": [2],
+            "not (genre == 'drama') or year between 2019 and 2020": [0, 1, 3],
+            "vote_count != 500 and original_language = 'EN'": [0, 2],
+            "title contains 'a' and runtime <= 122": [0, 1],
+        }
+        for text, expected in cases.items():
+            expr = compile_filter(text)
+            self.assertEqual(expr.select(self.rows, plan="scan"), expected, text)
+            self.assertEqual(expr.select(self.rows, indexes, plan="index"), expected, text)
+            self.assertEqual(expr.filter_frame(frame).index.tolist(), expected, text)
+        self.assertIs(compile_filter("runtime < 90"), compile_filter("runtime < 90"))
+        for bad in ("runtime <", "genre > 'x'", "title < 'a'", "(runtime < 9"):
+            with self.assertRaises(ValueError):
+                compile_filter(bad)
+
+    def test_plan_choice_and_entry_points(self):
+        import pandas as pd
+        from Dataset import Dataset
+        from filter_expr import compile_filter
+        from range_index import IndexSet
+        rows = [{"title": str(i), "genres": "Drama", "runtime": str(i), "release_date": "2015-01-01",
+                 "vote_average": "6"} for i in range(1000)]
+        expr = compile_filter("runtime < 5")
+        self.assertEqual(expr.plan(len(rows)).strategy, "scan")
+        self.assertEqual(expr.plan(len(rows), IndexSet.build(rows)).strategy, "index")
+        self.assertIn("plan: index", expr.explain(len(rows), IndexSet.build(rows)))
+        corpus = MemoryCorpus(rows)
+        corpus.index_set()
+        self.assertEqual([r["title"] for r in corpus.where("runtime < 3")], ["0", "1", "2"])
+        self.assertIn("index lookup", corpus.explain("runtime < 3"))
+        ds = Dataset(pd.DataFrame(rows).astype({"runtime": int}))
+        self.assertEqual(len(ds.query("runtime between 10 and 19 and genre = 'drama'")), 10)
+        ds.create_index()
+        self.assertIn("plan: index", ds.explain("runtime < 3"))
+        self.assertEqual(ds.query("runtime < 3")["title"].tolist(), ["0", "1", "2"])
+
+
 if __name__ == "__main__":
     unittest.main()
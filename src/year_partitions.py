@@ -0,0 +1,176 @@
+"""
+Year-partitioned on-disk layout for the TMDB CSV.
+
+Nearly every query is bounded by release year (load_db keeps 2010-2025,
+MovieDataset has year_min/year_max), yet each one used to read the whole
+CSV. repartition_by_year() rewrites the corpus once into one CSV per release
+year plus a small catalog.json:
+
+    tmdb_by_year/
+        catalog.json          {"columns": [...], "partitions": [{"year": 2021, "path": "year=2021.csv",
+                                                                "rows": 812, "votes_max": 24511, ...}, ...]}
+        year=2021.csv
+        year=2022.csv
+        year=unknown.csv      rows without a parsable release year
+
+Loaders then open only the partitions inside the requested year range (and
+skip partitions whose largest vote_count is below min_votes), so a narrow
+range costs time proportional to the rows in it. Partition files keep the
+source's columns, so rows read back exactly as from the original file,
+only grouped by year instead of in source order.
+
+    repartition_by_year("TMDB_movie_dataset_v13.csv", "tmdb_by_year")
+    rows = load_year_range("tmdb_by_year", 2020, 2022, min_votes=10)
+
+load_db/iter_db (movie_oop_core) and MovieDataset accept a partition
+directory anywhere they accept a CSV path.
+
+Usage:
+    python src/year_partitions.py TMDB_movie_dataset_v13.csv tmdb_by_year
+
+Functions: repartition_by_year, read_catalog, is_partitioned, select_partitions,
+           iter_year_range, load_year_range
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from movie_oop_core import _as_float, _row_year
+
+CATALOG = "catalog.json"
+UNKNOWN = "unknown"
+
+
+def _partition_file(year: Optional[int]) -> str:
+    return f"year={UNKNOWN if year is None else year}.csv"
+
+
+def repartition_by_year(src: str, out_dir: str) -> Dict[str, Any]:
+    """
+    Split a TMDB CSV into per-year partition files under out_dir and write
+    the catalog. One streaming pass; returns the catalog dict.
+    """
+    if not isinstance(src, str) or not isinstance(out_dir, str):
+        raise TypeError("src and out_dir must be strings")
+    os.makedirs(out_dir, exist_ok=True)
+
+    files: Dict[Optional[int], Any] = {}
+    writers: Dict[Optional[int], Any] = {}
+    parts: Dict[Optional[int], Dict[str, Any]] = {}
+    try:
+        with open(src, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            columns = list(reader.fieldnames or [])
+            for row in reader:
+                year = _row_year(row)
+                writer = writers.get(year)
+                if writer is None:
+                    path = _partition_file(year)
+                    # written as .tmp and renamed with the catalog, so readers never see a half-built layout
+                    files[year] = open(os.path.join(out_dir, path + ".tmp"), "w", encoding="utf-8", newline="")
+                    writer = writers[year] = csv.DictWriter(files[year], columns, quoting=csv.QUOTE_MINIMAL,
+                                                             extrasaction="ignore")
+                    writer.writeheader()
+                    parts[year] = {"year": year, "path": path, "rows": 0, "votes_max": None}
+                writer.writerow(row)
+                part = parts[year]
+                part["rows"] += 1
+                votes = _as_float(row.get("vote_count"))
+                if votes == votes and (part["votes_max"] is None or votes > part["votes_max"]):
+                    part["votes_max"] = votes
+    finally:
+        for fh in files.values():
+            fh.close()
+
+    for year, part in parts.items():
+        tmp = os.path.join(out_dir, part["path"] + ".tmp")
+        os.replace(tmp, os.path.join(out_dir, part["path"]))
+        part["bytes"] = os.path.getsize(os.path.join(out_dir, part["path"]))
+
+    catalog = {
+        "version": 1,
+        "source": os.path.basename(src),
+        "columns": columns,
+        "rows": sum(p["rows"] for p in parts.values()),
+        "partitions": sorted(parts.values(), key=lambda p: (p["year"] is None, p["year"] or 0)),
+    }
+    tmp = os.path.join(out_dir, CATALOG + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, CATALOG))
+    return catalog
+
+
+def is_partitioned(path: str) -> bool:
+    """True if path is a directory written by repartition_by_year."""
+    return isinstance(path, str) and os.path.isfile(os.path.join(path, CATALOG))
+
+
+def read_catalog(path: str) -> Dict[str, Any]:
+    if not is_partitioned(path):
+        raise ValueError(f"no {CATALOG} in {path!r}")
+    with open(os.path.join(path, CATALOG), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def select_partitions(catalog: Dict[str, Any], year_min: Optional[int] = None, year_max: Optional[int] = None,
+                      min_votes: Optional[float] = None, include_unknown: bool = False) -> List[Dict[str, Any]]:
+    """Catalog entries that can hold rows inside the bounds (partition pruning)."""
+    out = []
+    for part in catalog["partitions"]:
+        year = part["year"]
+        if year is None:
+            if not include_unknown:
+                continue
+        elif year_min is not None and year < year_min or year_max is not None and year > year_max:
+            continue
+        if min_votes is not None and (part.get("votes_max") is None or part["votes_max"] < min_votes):
+            continue
+        out.append(part)
+    return out
+
+
+def iter_year_range(path: str, year_min: Optional[int] = None, year_max: Optional[int] = None,
+                    min_votes: Optional[float] = None, include_unknown: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw row dicts from only the partitions inside [year_min, year_max].
+    Rows are yielded as stored; min_votes prunes partitions but rows are not
+    filtered by it here.
+    """
+    for part in select_partitions(read_catalog(path), year_min, year_max, min_votes, include_unknown):
+        with open(os.path.join(path, part["path"]), "r", encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+def load_year_range(path: str, year_min: Optional[int] = None, year_max: Optional[int] = None,
+                    min_votes: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Rows with year_min <= release year <= year_max and vote_count >= min_votes."""
+    out = []
+    for row in iter_year_range(path, year_min, year_max, min_votes):
+        if min_votes is not None and not _as_float(row.get("vote_count")) >= min_votes:
+            continue
+        out.append(row)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Repartition a TMDB CSV into per-year files.")
+    parser.add_argument("src")
+    parser.add_argument("out_dir")
+    args = parser.parse_args(argv)
+    catalog = repartition_by_year(args.src, args.out_dir)
+    print(f"wrote {catalog['rows']} rows into {len(catalog['partitions'])} partitions under {args.out_dir}")
+
+
+__all__ = [
+    "repartition_by_year", "read_catalog", "is_partitioned", "select_partitions",
+    "iter_year_range", "load_year_range",
+]
+
+
+if __name__ == "__main__":
+    main()